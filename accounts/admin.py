@@ -22,6 +22,7 @@ class UserAdmin(DjangoUserAdmin):
             {
                 "fields": (
                     "role",
+                    "loyverse_employee_id",
                     "is_staff",
                     "is_active",
                     "is_superuser",
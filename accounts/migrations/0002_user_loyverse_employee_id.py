@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="loyverse_employee_id",
+            field=models.CharField(
+                blank=True,
+                help_text="Sert au rapprochement automatique des reçus.",
+                max_length=120,
+                verbose_name="Identifiant employé Loyverse",
+            ),
+        ),
+    ]
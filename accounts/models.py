@@ -17,6 +17,12 @@ class User(AbstractUser):
         verbose_name="Rôle",
         help_text="Définit le niveau d'accès de l'utilisateur.",
     )
+    loyverse_employee_id = models.CharField(
+        max_length=120,
+        blank=True,
+        verbose_name="Identifiant employé Loyverse",
+        help_text="Sert au rapprochement automatique des reçus.",
+    )
 
     class Meta:
         verbose_name = "Utilisateur"
@@ -0,0 +1,101 @@
+"""Corrigés de quiz compilés et mis en cache, partagés par le LMS et la formation."""
+
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+
+CHOICE = "choice"
+TEXT = "text"
+MANUAL = "manual"
+OPEN = "open"
+
+
+def normalize_text(value: str, case_sensitive: bool) -> str:
+    value = (value or "").strip()
+    return value if case_sensitive else value.lower()
+
+
+@dataclass(frozen=True)
+class QuestionKey:
+    """Corrigé d'une question : ``kind`` indique comment la noter.
+
+    Les identifiants de choix sont indexés par leur forme texte, pour accepter
+    indifféremment une valeur de formulaire ou un identifiant de la base.
+    """
+
+    id: object
+    points: int
+    kind: str
+    choices: dict = field(default_factory=dict)
+    correct_choices: frozenset = frozenset()
+    expected_text: str = ""
+    case_sensitive: bool = False
+
+    def choice_id(self, value):
+        """Identifiant du choix ``value`` s'il appartient à la question, sinon ``None``."""
+        if value in (None, ""):
+            return None
+        return self.choices.get(str(value))
+
+    def is_correct_choice(self, value) -> bool:
+        return value is not None and str(value) in self.correct_choices
+
+    def matches_text(self, value: str) -> bool:
+        return bool(self.expected_text) and (
+            normalize_text(value, self.case_sensitive) == self.expected_text
+        )
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    questions: tuple
+
+    @property
+    def total_points(self) -> int:
+        return sum(question.points for question in self.questions)
+
+
+def _version_key(quiz_label: str, quiz_id) -> str:
+    return f"answer_key:version:{quiz_label}:{quiz_id}"
+
+
+def _version(quiz_label: str, quiz_id) -> int:
+    key = _version_key(quiz_label, quiz_id)
+    version = cache.get(key)
+    if version is None:
+        # Un horodatage évite de réutiliser une ancienne version si la clé a été évincée.
+        version = int(time.time() * 1000)
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def invalidate_answer_key(quiz_label: str, quiz_id) -> None:
+    if quiz_id is None:
+        return
+    key = _version_key(quiz_label, quiz_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def cached_answer_key(quiz, compile_key) -> AnswerKey:
+    """Corrigé du quiz, compilé par ``compile_key`` au premier appel de chaque version.
+
+    La version est incrémentée par les signaux d'enregistrement des questions et
+    des choix : une modification n'est jamais servie périmée, même si un rendu
+    concurrent écrit l'ancien corrigé après coup. Cette garantie suppose un cache
+    partagé ; avec le cache mémoire local, les autres processus ne voient la
+    correction qu'à l'expiration de ``QUIZ_ANSWER_KEY_TIMEOUT``, d'où sa valeur
+    courte.
+    """
+    label = quiz._meta.label_lower
+    key = f"answer_key:{label}:{quiz.pk}:{_version(label, quiz.pk)}"
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = compile_key(quiz)
+        cache.set(key, answer_key, timeout=settings.QUIZ_ANSWER_KEY_TIMEOUT)
+    return answer_key
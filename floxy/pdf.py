@@ -0,0 +1,42 @@
+"""Outils de dessin reportlab partagés par les étiquettes et les certificats."""
+
+from functools import lru_cache
+
+import qrcode
+from reportlab.lib.utils import ImageReader
+
+
+@lru_cache(maxsize=4)
+def load_image(path: str):
+    """Décode une image une seule fois par processus (``None`` si illisible)."""
+    try:
+        reader = ImageReader(path)
+        reader.getSize()
+    except Exception:
+        return None
+    return reader
+
+
+def draw_qr_code(pdf, data: str, x: float, y: float, size: float) -> None:
+    """Dessine le QR code en un seul tracé vectoriel, sans passer par une image.
+
+    Les modules noirs contigus d'une même ligne sont fusionnés en un rectangle.
+    """
+    qr = qrcode.QRCode(border=1)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    module = size / len(matrix)
+
+    path = pdf.beginPath()
+    for row_index, row in enumerate(matrix):
+        top = y + size - (row_index + 1) * module
+        start = None
+        for column, dark in enumerate([*row, False]):
+            if dark and start is None:
+                start = column
+            elif not dark and start is not None:
+                path.rect(x + start * module, top, (column - start) * module, module)
+                start = None
+    pdf.setFillGray(0)
+    pdf.drawPath(path, stroke=0, fill=1)
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "training.apps.TrainingConfig",
     "reporting.apps.ReportingConfig",
     "lms.apps.LmsConfig",
+    "jobs.apps.JobsConfig",
 ]
 
 MIDDLEWARE = [
@@ -80,6 +81,25 @@ DATABASES = {
     }
 }
 
+DJANGO_CACHE_DIR = env("DJANGO_CACHE_DIR", default="")
+
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": DJANGO_CACHE_DIR,
+        }
+        if DJANGO_CACHE_DIR
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "floxy-default",
+        }
+    )
+}
+
+DASHBOARD_CACHE_TIMEOUT = env.int("DASHBOARD_CACHE_TIMEOUT", default=300)
+QUIZ_ANSWER_KEY_TIMEOUT = env.int("QUIZ_ANSWER_KEY_TIMEOUT", default=300)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -130,6 +150,27 @@ LOGOUT_REDIRECT_URL = "/login/"
 
 FLOXY_LOGO_PATH = str(BASE_DIR / "logo_floxymade_small.png")
 
+LOYVERSE_API_URL = env("LOYVERSE_API_URL", default="https://api.loyverse.com/v1.0")
+LOYVERSE_TIMEOUT = env.float("LOYVERSE_TIMEOUT", default=30.0)
+LOYVERSE_MAX_RETRIES = env.int("LOYVERSE_MAX_RETRIES", default=5)
+LOYVERSE_BACKOFF_BASE = env.float("LOYVERSE_BACKOFF_BASE", default=0.5)
+LOYVERSE_BACKOFF_MAX = env.float("LOYVERSE_BACKOFF_MAX", default=30.0)
+
+WIG_CODE_BLOCK_SIZE = env.int("WIG_CODE_BLOCK_SIZE", default=1)
+
+STOCK_FORECAST_LEAD_DAYS = env.int("STOCK_FORECAST_LEAD_DAYS", default=7)
+STOCK_FORECAST_COVER_DAYS = env.int("STOCK_FORECAST_COVER_DAYS", default=30)
+
+PAYMENT_MATCH_AMOUNT_TOLERANCE = env("PAYMENT_MATCH_AMOUNT_TOLERANCE", default="0")
+PAYMENT_MATCH_WINDOW_MINUTES = env.int("PAYMENT_MATCH_WINDOW_MINUTES", default=90)
+PAYMENT_MATCH_AUTO_CONFIDENCE = env.float("PAYMENT_MATCH_AUTO_CONFIDENCE", default=0.85)
+
+JOB_QUEUE_ENABLED = env.bool("JOB_QUEUE_ENABLED", default=False)
+JOB_WORKER_THREADS = env.int("JOB_WORKER_THREADS", default=2)
+JOB_MAX_ATTEMPTS = env.int("JOB_MAX_ATTEMPTS", default=3)
+JOB_RETRY_DELAY = env.int("JOB_RETRY_DELAY", default=30)
+JOB_LOCK_TIMEOUT = env.int("JOB_LOCK_TIMEOUT", default=600)
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -56,6 +56,7 @@ urlpatterns = [
     path("api/content/", include("content.urls")),
     path("api/integrations/", include("integrations.urls")),
     path("api/lms/", include("lms.urls")),
+    path("api/jobs/", include("jobs.urls")),
     path("api/schema/", get_schema_view(title="Floxy Made API"), name="api-schema"),
     path("reporting/", include("reporting.urls")),
     path("formation/", include("training.urls")),
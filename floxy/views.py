@@ -4,22 +4,11 @@ from decimal import Decimal
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 
-from django.db import models
-from django.db.models import (
-    Avg,
-    Count,
-    DecimalField,
-    ExpressionWrapper,
-    F,
-    FloatField,
-    Sum,
-    Value,
-)
-from django.db.models.functions import Cast
+from django.db.models import F, Sum
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
-from content.models import ContentItem, ContentMetric
+from content.models import ContentItem
 from floxy.forms import (
     ActivityForm,
     ActivityStatusForm,
@@ -35,8 +24,11 @@ from floxy.prestations import (
     get_service_ids_for_category,
 )
 from crm.models import Client
-from operations.models import Activity, ActivityLine, Service
-from inventory.models import StockLevel
+from operations.models import Activity, ActivityLine, Service, ServiceCategory
+from inventory.models import StockForecast, StockLevel
+from reporting.cache import cached_dashboard
+from reporting.rollups import get_overview_kpis
+from reporting.snapshots import build_today_snapshot
 from tasks.models import Task
 from wigs.models import CareWig
 
@@ -110,126 +102,65 @@ def dashboard_overview(request):
             period_days = 30
             custom_range = False
 
-    activities_period = Activity.objects.filter(
-        start_at__date__gte=start_date, start_at__date__lte=end_date
-    )
-    activities_paid = activities_period.filter(status=Activity.Status.PAID)
-    service_queryset = Service.objects.filter(is_active=True)
+    service_ids = None
+    category_id = None
     if service_filter:
-        service_queryset = service_queryset.filter(id=service_filter)
+        service_ids = list(
+            Service.objects.filter(is_active=True, id=service_filter).values_list(
+                "id", flat=True
+            )
+        )
     elif sector_filter:
-        service_ids = get_service_ids_for_category(sector_filter)
-        service_queryset = service_queryset.filter(id__in=service_ids)
-
-    if service_filter or sector_filter:
-        service_ids = list(service_queryset.values_list("id", flat=True))
-        if service_ids:
-            activities_period = activities_period.filter(
-                lines__service_id__in=service_ids
-            ).distinct()
-            activities_paid = activities_paid.filter(
-                lines__service_id__in=service_ids
-            ).distinct()
-        else:
-            activities_period = activities_period.none()
-            activities_paid = activities_paid.none()
-    activities_total = activities_period.count()
-    revenue_expected = (
-        activities_period.aggregate(total=Sum("expected_amount"))["total"] or 0
-    )
-    revenue_final = (
-        activities_paid.aggregate(total=Sum("final_amount"))["total"] or 0
-    )
+        category = ServiceCategory.objects.filter(name=sector_filter).first()
+        service_ids = list(
+            Service.objects.filter(
+                is_active=True, id__in=get_service_ids_for_category(sector_filter)
+            ).values_list("id", flat=True)
+        )
+        category_id = category.id if category else None
 
-    tasks_period = Task.objects.filter(
-        created_at__date__gte=start_date, created_at__date__lte=end_date
+    def _compute_kpis():
+        kpis = get_overview_kpis(
+            start_date, end_date, service_ids=service_ids, category_id=category_id
+        )
+        kpis["tasks_overdue"] = Task.objects.filter(
+            due_date__lt=today, status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
+        ).count()
+        return kpis
+
+    kpis = cached_dashboard(
+        "overview",
+        {
+            "today": today,
+            "start": start_date,
+            "end": end_date,
+            "service_ids": service_ids,
+            "category_id": category_id,
+        },
+        ("activities", "tasks", "content"),
+        _compute_kpis,
     )
-    tasks_done = Task.objects.filter(
-        status=Task.Status.DONE,
-        updated_at__date__gte=start_date,
-        updated_at__date__lte=end_date,
-    ).count()
-    tasks_total = tasks_period.count()
+
+    tasks_done = kpis["tasks_done"]
+    tasks_total = kpis["tasks_total"]
     tasks_completion_rate = (
         round((tasks_done / tasks_total) * 100, 2) if tasks_total else 0
     )
-    tasks_overdue = Task.objects.filter(
-        due_date__lt=today, status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
-    ).count()
+    tasks_overdue = kpis["tasks_overdue"]
 
-    content_period = ContentItem.objects.filter(
-        created_at__date__gte=start_date, created_at__date__lte=end_date
-    )
-    platform_counts = content_period.values("platform").annotate(count=Count("id"))
     platform_breakdown = [
-        {
-            "label": ContentItem.Platform(item["platform"]).label,
-            "count": item["count"],
-        }
-        for item in platform_counts
+        {"label": ContentItem.Platform(platform).label, "count": count}
+        for platform, count in kpis["platform_counts"].items()
     ]
-    content_approved = content_period.filter(status=ContentItem.Status.APPROVED).count()
-    content_published = content_period.filter(
-        status__in=[ContentItem.Status.PUBLISHED, ContentItem.Status.METRICS_RECORDED]
-    ).count()
-
-    interactions = F("likes") + F("comments") + F("shares") + F("saves")
-    score_expr = models.Case(
-        models.When(
-            reach__gt=0,
-            then=Cast(interactions, FloatField())
-            * Value(100.0)
-            / Cast(F("reach"), FloatField()),
-        ),
-        default=Cast(interactions, FloatField()),
-        output_field=FloatField(),
-    )
-    average_score = ContentMetric.objects.filter(
-        content_item__status__in=[
-            ContentItem.Status.PUBLISHED,
-            ContentItem.Status.METRICS_RECORDED,
-        ],
-        created_at__date__gte=start_date,
-        created_at__date__lte=end_date,
-    ).annotate(score=score_expr).aggregate(avg=Avg("score"))["avg"] or 0.0
-
-    line_total_expr = ExpressionWrapper(
-        F("quantity") * F("unit_price"),
-        output_field=DecimalField(max_digits=12, decimal_places=2),
-    )
-    service_summary_queryset = ActivityLine.objects.filter(
-        activity__start_at__date__gte=start_date,
-        activity__start_at__date__lte=end_date,
-        activity__status=Activity.Status.PAID,
-        service__isnull=False,
-    )
-    if service_filter or sector_filter:
-        service_ids = list(service_queryset.values_list("id", flat=True))
-        if service_ids:
-            service_summary_queryset = service_summary_queryset.filter(
-                service_id__in=service_ids
-            )
-        else:
-            service_summary_queryset = service_summary_queryset.none()
-
-    service_summary = (
-        service_summary_queryset
-        .values("service__name")
-        .annotate(
-            total_lines=Count("id"),
-            total_qty=Sum("quantity"),
-            revenue=Sum(line_total_expr),
-        )
-        .order_by("-revenue")
-    )
+
     prestations_breakdown = []
-    for item in service_summary:
+    for item in kpis["prestations"]:
         revenue = item["revenue"] or 0
         total_lines = item["total_lines"] or 0
         avg_ticket = round(float(revenue / total_lines), 2) if total_lines else 0
         prestations_breakdown.append(
             {
-                "name": item["service__name"],
+                "name": item["name"],
                 "total_lines": total_lines,
                 "total_qty": item["total_qty"] or 0,
                 "revenue": revenue,
@@ -253,18 +184,18 @@ def dashboard_overview(request):
         "selected_sector": sector_filter or "",
         "prestation_services": prestation_filters["services"],
         "prestation_categories": prestation_filters["categories"],
-        "activities_total": activities_total,
-        "activities_paid": activities_paid.count(),
-        "revenue_expected": revenue_expected,
-        "revenue_final": revenue_final,
+        "activities_total": kpis["activities_total"],
+        "activities_paid": kpis["activities_paid"],
+        "revenue_expected": kpis["revenue_expected"],
+        "revenue_final": kpis["revenue_final"],
         "tasks_done": tasks_done,
         "tasks_total": tasks_total,
         "tasks_overdue": tasks_overdue,
         "tasks_completion_rate": tasks_completion_rate,
-        "content_total": content_period.count(),
-        "content_approved": content_approved,
-        "content_published": content_published,
-        "content_score_avg": round(float(average_score), 2),
+        "content_total": kpis["content_total"],
+        "content_approved": kpis["content_approved"],
+        "content_published": kpis["content_published"],
+        "content_score_avg": round(float(kpis["content_score_avg"]), 2),
         "platform_breakdown": platform_breakdown,
         "prestations_breakdown": prestations_breakdown,
     }
@@ -274,120 +205,29 @@ def dashboard_overview(request):
 @login_required
 def dashboard_today(request):
     today = timezone.localdate()
-    activities_today_qs = Activity.objects.filter(start_at__date=today)
-    tasks_due_qs = Task.objects.filter(due_date=today)
-    tasks_overdue_qs = Task.objects.filter(
-        due_date__lt=today, status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
-    )
-    content_today_qs = ContentItem.objects.filter(scheduled_at__date=today)
-    activities_to_collect = Activity.objects.filter(status=Activity.Status.TO_COLLECT)
-    expected_revenue = (
-        activities_today_qs.aggregate(total=Sum("expected_amount"))["total"] or 0
-    )
-    line_total_expr = ExpressionWrapper(
-        F("quantity") * F("unit_price"),
-        output_field=DecimalField(max_digits=12, decimal_places=2),
-    )
-    today_lines = (
-        ActivityLine.objects.filter(
-            activity__start_at__date=today,
-            service__isnull=False,
-        )
-        .select_related(
-            "activity", "service", "service__category", "activity__assigned_staff"
-        )
-        .order_by("activity__start_at")
-    )
-    today_prestations_summary = (
-        today_lines.values("service__name")
-        .annotate(
-            total_lines=Count("id"),
-            total_qty=Sum("quantity"),
-            revenue=Sum(line_total_expr),
-        )
-        .order_by("-total_lines")
+    snapshot = cached_dashboard(
+        "today",
+        {"day": today},
+        ("activities", "tasks", "content", "care_wigs", "stock"),
+        lambda: build_today_snapshot(today),
     )
-    prestations_today = []
-    for item in today_prestations_summary:
-        revenue = item["revenue"] or 0
-        total_lines = item["total_lines"] or 0
-        avg_ticket = round(float(revenue / total_lines), 2) if total_lines else 0
-        prestations_today.append(
-            {
-                "name": item["service__name"],
-                "total_lines": total_lines,
-                "total_qty": item["total_qty"] or 0,
-                "revenue": revenue,
-                "avg_ticket": avg_ticket,
-            }
-        )
-    prestations_schedule = list(today_lines[:10])
-    for line in prestations_schedule:
-        line.total_amount = (line.quantity or 0) * (line.unit_price or 0)
-    category_summary = (
-        today_lines.values("service__category__name")
-        .annotate(
-            total_lines=Count("id"),
-            total_qty=Sum("quantity"),
-            revenue=Sum(line_total_expr),
-        )
-        .order_by("-total_lines")
-    )
-    prestations_categories = []
-    for item in category_summary:
-        category_name = item["service__category__name"] or "Autres"
-        total_lines = item["total_lines"] or 0
-        revenue = item["revenue"] or 0
-        avg_ticket = round(float(revenue / total_lines), 2) if total_lines else 0
-        prestations_categories.append(
-            {
-                "name": category_name,
-                "total_lines": total_lines,
-                "total_qty": item["total_qty"] or 0,
-                "revenue": revenue,
-                "avg_ticket": avg_ticket,
-            }
-        )
     context = {
         "titre": "Aujourd'hui",
         "auth_required": not request.user.is_authenticated,
         "page_theme": "dashboard",
-        "activities_today": activities_today_qs.count(),
-        "tasks_due": tasks_due_qs.count(),
-        "content_scheduled": content_today_qs.count(),
-        "expected_revenue": expected_revenue,
-        "activities_summary": {
-            "in_progress": Activity.objects.filter(
-                status=Activity.Status.IN_PROGRESS
-            ).count(),
-            "to_collect": activities_to_collect.count(),
-            "paid": Activity.objects.filter(status=Activity.Status.PAID).count(),
-            "done": Activity.objects.filter(status=Activity.Status.DONE).count(),
-        },
-        "tasks_summary": {
-            "overdue": tasks_overdue_qs.count(),
-            "done": Task.objects.filter(status=Task.Status.DONE).count(),
-        },
-        "content_summary": {
-            "to_validate": ContentItem.objects.filter(
-                status=ContentItem.Status.TO_VALIDATE
-            ).count(),
-            "scheduled": ContentItem.objects.filter(
-                status=ContentItem.Status.SCHEDULED
-            ).count(),
-        },
-        "care_wigs_summary": {
-            "in_progress": CareWig.objects.filter(
-                status=CareWig.Status.IN_PROGRESS
-            ).count(),
-            "ready": CareWig.objects.filter(status=CareWig.Status.READY).count(),
-            "delivered": CareWig.objects.filter(
-                status=CareWig.Status.DELIVERED
-            ).count(),
-        },
-        "stock_alerts": StockLevel.objects.filter(alert=True).count(),
+        "activities_today": snapshot.activities_today,
+        "tasks_due": snapshot.tasks_due,
+        "content_scheduled": snapshot.content_scheduled,
+        "expected_revenue": snapshot.expected_revenue,
+        "activities_summary": snapshot.activities_summary,
+        "tasks_summary": snapshot.tasks_summary,
+        "content_summary": snapshot.content_summary,
+        "care_wigs_summary": snapshot.care_wigs_summary,
+        "stock_alerts": snapshot.stock_alerts,
         "activities_recent": Activity.objects.order_by("-start_at")[:5],
-        "tasks_overdue_list": tasks_overdue_qs.order_by("due_date")[:5],
+        "tasks_overdue_list": Task.objects.filter(
+            due_date__lt=today, status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS]
+        ).order_by("due_date")[:5],
         "content_queue": ContentItem.objects.filter(
             status=ContentItem.Status.TO_VALIDATE
         ).order_by("-created_at")[:5],
@@ -397,9 +237,12 @@ def dashboard_today(request):
         "stock_alerts_list": StockLevel.objects.filter(alert=True)
         .select_related("item")
         .order_by("-updated_at")[:5],
-        "prestations_today": prestations_today,
-        "prestations_categories": prestations_categories,
-        "prestations_schedule": prestations_schedule,
+        "stock_reorder_list": StockForecast.objects.filter(suggested_qty__gt=0)
+        .select_related("item")
+        .order_by(F("days_until_stockout").asc(nulls_last=True))[:5],
+        "prestations_today": snapshot.prestations_today,
+        "prestations_categories": snapshot.prestations_categories,
+        "prestations_schedule": snapshot.prestations_schedule,
     }
     return render(request, "dashboard.html", context)
 
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from integrations.models import LoyverseReceipt, LoyverseStore
+from integrations.models import LoyverseReceipt, LoyverseReceiptLine, LoyverseStore
 
 
 @admin.register(LoyverseStore)
@@ -10,8 +10,25 @@ class LoyverseStoreAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
 
 
+class LoyverseReceiptLineInline(admin.TabularInline):
+    model = LoyverseReceiptLine
+    extra = 0
+    fields = ("position", "item_name", "sku", "quantity", "price", "total_money")
+    readonly_fields = fields
+    can_delete = False
+
+
 @admin.register(LoyverseReceipt)
 class LoyverseReceiptAdmin(admin.ModelAdmin):
-    list_display = ("receipt_id", "created_at")
-    search_fields = ("receipt_id",)
+    list_display = (
+        "receipt_id",
+        "receipt_type",
+        "receipt_date",
+        "total_money",
+        "payment_type",
+        "created_at",
+    )
+    list_filter = ("receipt_type", "payment_type")
+    search_fields = ("receipt_id", "store_ref")
     ordering = ("-created_at",)
+    inlines = [LoyverseReceiptLineInline]
@@ -1,12 +1,17 @@
-import json
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from typing import Iterator, List, Optional
 
 from django.utils import timezone
 
 from integrations.models import LoyverseStore
+from integrations.transport import LoyverseTransport
+
+
+@dataclass
+class ReceiptPage:
+    receipts: List[dict]
+    cursor: Optional[str]
 
 
 def _get_token() -> Optional[str]:
@@ -14,42 +19,53 @@ def _get_token() -> Optional[str]:
     return store.token if store else None
 
 
-def _build_url(base_url: str, path: str, params: dict) -> str:
-    query = urlencode({k: v for k, v in params.items() if v is not None})
-    return f"{base_url}{path}?{query}" if query else f"{base_url}{path}"
-
-
-def fetch_receipts(since_datetime: Optional[datetime] = None) -> List[dict]:
+def build_transport(base_url: Optional[str] = None) -> LoyverseTransport:
     token = _get_token()
     if not token:
         raise RuntimeError("Jeton Loyverse manquant.")
+    return LoyverseTransport(token=token, base_url=base_url)
 
-    base_url = "https://api.loyverse.com/v1.0"
-    path = "/receipts"
-    receipts: List[dict] = []
-    cursor = None
+
+def iter_receipt_pages(
+    since_datetime: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    base_url: Optional[str] = None,
+    transport: Optional[LoyverseTransport] = None,
+) -> Iterator[ReceiptPage]:
+    """Produit les pages de reçus au fur et à mesure de leur réception.
+
+    ``cursor`` permet de reprendre une pagination interrompue ; chaque page
+    porte le curseur de la page suivante (``None`` sur la dernière).
+    """
+    owns_transport = transport is None
+    if owns_transport:
+        transport = build_transport(base_url)
     limit = 250
 
     if since_datetime is not None and timezone.is_naive(since_datetime):
         since_datetime = timezone.make_aware(since_datetime)
 
-    while True:
-        params = {
-            "limit": limit,
-            "since": since_datetime.isoformat() if since_datetime else None,
-            "cursor": cursor,
-        }
-        url = _build_url(base_url, path, params)
-        request = Request(url)
-        request.add_header("Authorization", f"Bearer {token}")
-        request.add_header("Content-Type", "application/json")
-
-        with urlopen(request) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-
-        receipts.extend(payload.get("receipts", []))
-        cursor = payload.get("cursor") or payload.get("next_cursor")
-        if not cursor:
-            break
+    try:
+        while True:
+            payload = transport.get_json(
+                "/receipts",
+                {
+                    "limit": limit,
+                    "since": since_datetime.isoformat() if since_datetime else None,
+                    "cursor": cursor,
+                },
+            )
+            cursor = payload.get("cursor") or payload.get("next_cursor")
+            yield ReceiptPage(receipts=payload.get("receipts", []), cursor=cursor)
+            if not cursor:
+                break
+    finally:
+        if owns_transport:
+            transport.close()
+
 
+def fetch_receipts(since_datetime: Optional[datetime] = None) -> List[dict]:
+    receipts: List[dict] = []
+    for page in iter_receipt_pages(since_datetime=since_datetime):
+        receipts.extend(page.receipts)
     return receipts
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from integrations.models import LoyverseReceipt
+from integrations.normalization import normalize_receipts
+from integrations.sync import iter_batches
+
+
+class Command(BaseCommand):
+    help = "Extrait les en-têtes et lignes des reçus Loyverse déjà importés."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Renormalise aussi les reçus déjà traités.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=500,
+            help="Nombre de reçus traités par transaction.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = LoyverseReceipt.objects.order_by("pk")
+        if not options.get("all"):
+            queryset = queryset.filter(normalized_at__isnull=True)
+        # Les identifiants sont lus d'abord pour ne pas écrire pendant
+        # qu'un curseur de lecture est ouvert.
+        receipt_ids = list(queryset.values_list("pk", flat=True))
+        chunk_size = max(options.get("chunk_size") or 500, 1)
+
+        receipts_done = 0
+        lines_done = 0
+        for chunk in iter_batches(receipt_ids, chunk_size):
+            receipts = list(
+                LoyverseReceipt.objects.filter(pk__in=chunk).only("pk", "raw_json")
+            )
+            lines_done += normalize_receipts(receipts)
+            receipts_done += len(receipts)
+            self.stdout.write(f"{receipts_done}/{len(receipt_ids)} reçus normalisés")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reçus normalisés : {receipts_done} | Lignes créées : {lines_done}"
+            )
+        )
@@ -1,19 +1,15 @@
-import hashlib
-import json
-
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
-from integrations.loyverse_client import fetch_receipts
-from integrations.models import LoyverseReceipt, LoyverseStore
-
-
-def _get_receipt_identifier(data: dict) -> str:
-    receipt_id = data.get("id") or data.get("receipt_id") or data.get("receipt_number")
-    if receipt_id:
-        return str(receipt_id)
-    payload = json.dumps(data, sort_keys=True).encode("utf-8")
-    return hashlib.sha256(payload).hexdigest()
+from integrations import loyverse_client
+from integrations.models import LoyverseStore
+from integrations.sync import (
+    DEFAULT_BATCH_SIZE,
+    ingest_receipts_batch,
+    iter_batches,
+    save_checkpoint,
+)
+from integrations.transport import LoyverseAPIError
 
 
 class Command(BaseCommand):
@@ -25,6 +21,18 @@ class Command(BaseCommand):
             dest="since",
             help="Date ISO pour limiter la synchronisation (ex: 2024-01-01T00:00:00).",
         )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Nombre de reçus insérés par transaction.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Reprend depuis le dernier point de reprise enregistré.",
+        )
 
     def handle(self, *args, **options):
         store = LoyverseStore.objects.order_by("-created_at").first()
@@ -46,24 +54,55 @@ class Command(BaseCommand):
                     self.style.ERROR("Format de date invalide pour --since.")
                 )
                 return
+            if timezone.is_naive(since_datetime):
+                since_datetime = timezone.make_aware(since_datetime)
+
+        cursor = None
+        if options.get("resume"):
+            if store.sync_cursor:
+                cursor = store.sync_cursor
+                since_datetime = store.sync_since
+            elif since_datetime is None:
+                since_datetime = store.last_receipt_at
+            if cursor:
+                self.stdout.write("Reprise de la pagination interrompue.")
+
+        created = 0
+        skipped = 0
+        batch_size = max(options.get("batch_size") or DEFAULT_BATCH_SIZE, 1)
+        batch_number = 0
 
         try:
-            receipts = fetch_receipts(since_datetime=since_datetime)
+            transport = loyverse_client.build_transport()
         except RuntimeError:
             self.stdout.write(
                 self.style.WARNING("Jeton Loyverse manquant. Synchronisation ignorée.")
             )
             return
-        created = 0
-        skipped = 0
 
-        for receipt in receipts:
-            receipt_id = _get_receipt_identifier(receipt)
-            if LoyverseReceipt.objects.filter(receipt_id=receipt_id).exists():
-                skipped += 1
-                continue
-            LoyverseReceipt.objects.create(receipt_id=receipt_id, raw_json=receipt)
-            created += 1
+        try:
+            pages = loyverse_client.iter_receipt_pages(
+                since_datetime=since_datetime, cursor=cursor, transport=transport
+            )
+            for page in pages:
+                for batch in iter_batches(page.receipts, batch_size):
+                    batch_number += 1
+                    batch_created, batch_skipped = ingest_receipts_batch(batch)
+                    created += batch_created
+                    skipped += batch_skipped
+                    self.stdout.write(
+                        f"Lot {batch_number} : {batch_created} importés, "
+                        f"{batch_skipped} ignorés"
+                    )
+                save_checkpoint(store, page.cursor, since_datetime, page.receipts)
+        except LoyverseAPIError as exc:
+            raise CommandError(
+                f"Synchronisation interrompue : {exc} "
+                "Relancez avec --resume pour reprendre."
+            ) from exc
+        finally:
+            transport.close()
+            self.stdout.write(transport.metrics.summary())
 
         self.stdout.write(
             self.style.SUCCESS(
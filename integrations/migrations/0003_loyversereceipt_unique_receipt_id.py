@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:12
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_receipts(apps, schema_editor):
+    LoyverseReceipt = apps.get_model("integrations", "LoyverseReceipt")
+    PaymentLink = apps.get_model("operations", "PaymentLink")
+
+    duplicates = (
+        LoyverseReceipt.objects.exclude(receipt_id="")
+        .values("receipt_id")
+        .annotate(count=Count("id"), kept_id=Min("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        extra_ids = list(
+            LoyverseReceipt.objects.filter(receipt_id=duplicate["receipt_id"])
+            .exclude(pk=duplicate["kept_id"])
+            .values_list("id", flat=True)
+        )
+        PaymentLink.objects.filter(loyverse_receipt_id__in=extra_ids).update(
+            loyverse_receipt_id=duplicate["kept_id"]
+        )
+        LoyverseReceipt.objects.filter(pk__in=extra_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0002_loyversereceipt_receipt_id"),
+        ("operations", "0007_merge_20260120_0522"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_receipts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="loyversereceipt",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("receipt_id", ""), _negated=True),
+                fields=("receipt_id",),
+                name="unique_loyverse_receipt_id",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0003_loyversereceipt_unique_receipt_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="loyversestore",
+            name="last_receipt_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Dernier reçu synchronisé"
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversestore",
+            name="sync_cursor",
+            field=models.CharField(
+                blank=True,
+                default="",
+                max_length=255,
+                verbose_name="Curseur de reprise",
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversestore",
+            name="sync_since",
+            field=models.DateTimeField(
+                blank=True,
+                null=True,
+                verbose_name="Début de la synchronisation en cours",
+            ),
+        ),
+    ]
@@ -0,0 +1,168 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0004_loyversestore_sync_checkpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoyverseReceiptLine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "position",
+                    models.PositiveIntegerField(default=0, verbose_name="Position"),
+                ),
+                (
+                    "item_ref",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        max_length=120,
+                        verbose_name="Article Loyverse",
+                    ),
+                ),
+                (
+                    "variant_ref",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        max_length=120,
+                        verbose_name="Variante Loyverse",
+                    ),
+                ),
+                (
+                    "item_name",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="Article"
+                    ),
+                ),
+                (
+                    "sku",
+                    models.CharField(blank=True, max_length=60, verbose_name="SKU"),
+                ),
+                (
+                    "quantity",
+                    models.DecimalField(
+                        decimal_places=3,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Quantité",
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Prix unitaire",
+                    ),
+                ),
+                (
+                    "total_money",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=12, verbose_name="Total"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ligne de reçu Loyverse",
+                "verbose_name_plural": "Lignes de reçus Loyverse",
+                "ordering": ["receipt", "position"],
+            },
+        ),
+        migrations.AddField(
+            model_name="loyversereceipt",
+            name="normalized_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Normalisé le"
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversereceipt",
+            name="payment_type",
+            field=models.CharField(
+                blank=True, default="", max_length=60, verbose_name="Type de paiement"
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversereceipt",
+            name="receipt_date",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Date du reçu"
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversereceipt",
+            name="receipt_type",
+            field=models.CharField(
+                blank=True, default="", max_length=20, verbose_name="Type de reçu"
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversereceipt",
+            name="store_ref",
+            field=models.CharField(
+                blank=True, default="", max_length=120, verbose_name="Boutique"
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversereceipt",
+            name="total_money",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                max_digits=12,
+                null=True,
+                verbose_name="Total",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loyversereceipt",
+            index=models.Index(
+                fields=["receipt_date"], name="integration_receipt_2e6d65_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loyversereceipt",
+            index=models.Index(
+                fields=["store_ref", "receipt_date"],
+                name="integration_store_r_39edeb_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="loyversereceiptline",
+            name="receipt",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lines",
+                to="integrations.loyversereceipt",
+                verbose_name="Reçu",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loyversereceiptline",
+            index=models.Index(
+                fields=["item_ref"], name="integration_item_re_ea5c0e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loyversereceiptline",
+            index=models.Index(fields=["sku"], name="integration_sku_e19454_idx"),
+        ),
+    ]
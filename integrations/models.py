@@ -1,8 +1,18 @@
 from django.db import models
+from django.db.models import Q
 
 
 class LoyverseStore(models.Model):
     token = models.CharField(max_length=255, verbose_name="Jeton API")
+    sync_cursor = models.CharField(
+        max_length=255, blank=True, default="", verbose_name="Curseur de reprise"
+    )
+    sync_since = models.DateTimeField(
+        null=True, blank=True, verbose_name="Début de la synchronisation en cours"
+    )
+    last_receipt_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Dernier reçu synchronisé"
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Mis à jour le")
 
@@ -23,11 +33,83 @@ class LoyverseReceipt(models.Model):
         verbose_name="Identifiant",
     )
     raw_json = models.JSONField(verbose_name="Données brutes")
+    receipt_type = models.CharField(
+        max_length=20, blank=True, default="", verbose_name="Type de reçu"
+    )
+    receipt_date = models.DateTimeField(
+        null=True, blank=True, verbose_name="Date du reçu"
+    )
+    store_ref = models.CharField(
+        max_length=120, blank=True, default="", verbose_name="Boutique"
+    )
+    total_money = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Total",
+    )
+    payment_type = models.CharField(
+        max_length=60, blank=True, default="", verbose_name="Type de paiement"
+    )
+    normalized_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Normalisé le"
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
 
     class Meta:
         verbose_name = "Reçu Loyverse"
         verbose_name_plural = "Reçus Loyverse"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["receipt_id"],
+                condition=~Q(receipt_id=""),
+                name="unique_loyverse_receipt_id",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["receipt_date"]),
+            models.Index(fields=["store_ref", "receipt_date"]),
+        ]
 
     def __str__(self) -> str:
         return f"Reçu {self.receipt_id}"
+
+
+class LoyverseReceiptLine(models.Model):
+    receipt = models.ForeignKey(
+        LoyverseReceipt,
+        on_delete=models.CASCADE,
+        related_name="lines",
+        verbose_name="Reçu",
+    )
+    position = models.PositiveIntegerField(default=0, verbose_name="Position")
+    item_ref = models.CharField(
+        max_length=120, blank=True, default="", verbose_name="Article Loyverse"
+    )
+    variant_ref = models.CharField(
+        max_length=120, blank=True, default="", verbose_name="Variante Loyverse"
+    )
+    item_name = models.CharField(max_length=255, blank=True, verbose_name="Article")
+    sku = models.CharField(max_length=60, blank=True, verbose_name="SKU")
+    quantity = models.DecimalField(
+        max_digits=12, decimal_places=3, default=0, verbose_name="Quantité"
+    )
+    price = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Prix unitaire"
+    )
+    total_money = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Total"
+    )
+
+    class Meta:
+        verbose_name = "Ligne de reçu Loyverse"
+        verbose_name_plural = "Lignes de reçus Loyverse"
+        ordering = ["receipt", "position"]
+        indexes = [
+            models.Index(fields=["item_ref"]),
+            models.Index(fields=["sku"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.receipt_id} - {self.item_name or self.item_ref}"
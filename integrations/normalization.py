@@ -0,0 +1,103 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from integrations.models import LoyverseReceipt, LoyverseReceiptLine
+
+HEADER_FIELDS = [
+    "receipt_type",
+    "receipt_date",
+    "store_ref",
+    "total_money",
+    "payment_type",
+    "normalized_at",
+]
+
+
+def _to_decimal(value, default=None):
+    if value in (None, ""):
+        return default
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return default
+
+
+def get_receipt_datetime(data: dict):
+    value = data.get("receipt_date") or data.get("created_at")
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(str(value))
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _payment_type(data: dict) -> str:
+    payments = data.get("payments") or []
+    types = {
+        str(payment.get("type") or payment.get("name") or "")
+        for payment in payments
+        if isinstance(payment, dict)
+    } - {""}
+    if len(types) > 1:
+        return "MIXED"
+    return next(iter(types), "")
+
+
+def extract_receipt_header(data: dict) -> dict:
+    """Retourne les champs d'en-tête normalisés d'un reçu Loyverse brut."""
+    return {
+        "receipt_type": str(data.get("receipt_type") or "")[:20],
+        "receipt_date": get_receipt_datetime(data),
+        "store_ref": str(data.get("store_id") or "")[:120],
+        "total_money": _to_decimal(data.get("total_money")),
+        "payment_type": _payment_type(data)[:60],
+        "normalized_at": timezone.now(),
+    }
+
+
+def build_receipt_lines(receipt_pk: int, data: dict) -> list[LoyverseReceiptLine]:
+    lines = []
+    for position, item in enumerate(data.get("line_items") or []):
+        if not isinstance(item, dict):
+            continue
+        quantity = _to_decimal(item.get("quantity"), Decimal("0"))
+        price = _to_decimal(item.get("price"), Decimal("0"))
+        total = _to_decimal(item.get("total_money"), quantity * price)
+        lines.append(
+            LoyverseReceiptLine(
+                receipt_id=receipt_pk,
+                position=position,
+                item_ref=str(item.get("item_id") or "")[:120],
+                variant_ref=str(item.get("variant_id") or "")[:120],
+                item_name=str(item.get("item_name") or "")[:255],
+                sku=str(item.get("sku") or "")[:60],
+                quantity=quantity,
+                price=price,
+                total_money=total,
+            )
+        )
+    return lines
+
+
+def normalize_receipts(receipts: list[LoyverseReceipt]) -> int:
+    """Recalcule en-têtes et lignes d'un lot de reçus déjà enregistrés."""
+    lines = []
+    for receipt in receipts:
+        for field_name, value in extract_receipt_header(receipt.raw_json).items():
+            setattr(receipt, field_name, value)
+        lines.extend(build_receipt_lines(receipt.pk, receipt.raw_json))
+
+    with transaction.atomic():
+        LoyverseReceipt.objects.bulk_update(receipts, HEADER_FIELDS)
+        LoyverseReceiptLine.objects.filter(
+            receipt_id__in=[receipt.pk for receipt in receipts]
+        ).delete()
+        LoyverseReceiptLine.objects.bulk_create(lines, batch_size=500)
+    return len(lines)
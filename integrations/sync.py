@@ -0,0 +1,107 @@
+import hashlib
+import json
+from itertools import islice
+
+from django.db import transaction
+
+from integrations.models import LoyverseReceipt, LoyverseReceiptLine
+from integrations.normalization import (
+    build_receipt_lines,
+    extract_receipt_header,
+    get_receipt_datetime,
+)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_receipt_identifier(data: dict) -> str:
+    receipt_id = data.get("id") or data.get("receipt_id") or data.get("receipt_number")
+    if receipt_id:
+        return str(receipt_id)
+    payload = json.dumps(data, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def save_checkpoint(store, cursor, since_datetime, receipts: list[dict]) -> None:
+    """Enregistre le point de reprise après l'import complet d'une page."""
+    store.sync_cursor = cursor or ""
+    store.sync_since = since_datetime if cursor else None
+    receipt_dates = [
+        value for value in map(get_receipt_datetime, receipts) if value is not None
+    ]
+    if receipt_dates:
+        latest = max(receipt_dates)
+        if store.last_receipt_at is None or latest > store.last_receipt_at:
+            store.last_receipt_at = latest
+    store.save(
+        update_fields=["sync_cursor", "sync_since", "last_receipt_at", "updated_at"]
+    )
+
+
+def iter_batches(receipts, batch_size: int = DEFAULT_BATCH_SIZE):
+    iterator = iter(receipts)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def ingest_receipts_batch(receipts: list[dict]) -> tuple[int, int]:
+    """Insère un lot de reçus en une transaction et retourne (créés, ignorés)."""
+    by_identifier = {}
+    for receipt in receipts:
+        by_identifier.setdefault(get_receipt_identifier(receipt), receipt)
+
+    with transaction.atomic():
+        existing = set(
+            LoyverseReceipt.objects.filter(
+                receipt_id__in=list(by_identifier)
+            ).values_list("receipt_id", flat=True)
+        )
+        new_receipts = [
+            LoyverseReceipt(
+                receipt_id=receipt_id,
+                raw_json=receipt,
+                **extract_receipt_header(receipt),
+            )
+            for receipt_id, receipt in by_identifier.items()
+            if receipt_id not in existing
+        ]
+        if new_receipts:
+            LoyverseReceipt.objects.bulk_create(new_receipts, ignore_conflicts=True)
+            receipt_pks = _inserted_receipt_pks(new_receipts)
+        else:
+            receipt_pks = {}
+        LoyverseReceiptLine.objects.bulk_create(
+            [
+                line
+                for receipt in new_receipts
+                if receipt.receipt_id in receipt_pks
+                for line in build_receipt_lines(
+                    receipt_pks[receipt.receipt_id], receipt.raw_json
+                )
+            ],
+            batch_size=500,
+        )
+
+    created = len(receipt_pks)
+    return created, len(receipts) - created
+
+
+def _inserted_receipt_pks(new_receipts: list) -> dict:
+    """Clés primaires des reçus réellement insérés par ce lot, par identifiant.
+
+    ``ignore_conflicts`` ne renvoie pas les clés primaires et écarte sans bruit
+    un reçu inséré entre-temps par une synchronisation concurrente. ``created_at``,
+    horodaté à la microseconde par ``bulk_create`` sur chaque instance, distingue
+    les lignes de ce lot de celles de l'autre écriture.
+    """
+    stamps = {receipt.receipt_id: receipt.created_at for receipt in new_receipts}
+    return {
+        receipt_id: pk
+        for receipt_id, pk, created_at in LoyverseReceipt.objects.filter(
+            receipt_id__in=list(stamps)
+        ).values_list("receipt_id", "pk", "created_at")
+        if created_at == stamps[receipt_id]
+    }
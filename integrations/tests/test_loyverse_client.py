@@ -0,0 +1,146 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from integrations.loyverse_client import iter_receipt_pages
+from integrations.models import LoyverseReceipt, LoyverseStore
+from integrations.transport import LoyverseAPIError, LoyverseTransport
+
+PAGES = {
+    None: {
+        "receipts": [
+            {"id": "r1", "receipt_date": "2024-03-01T09:00:00Z"},
+            {"id": "r2", "receipt_date": "2024-03-01T10:00:00Z"},
+        ],
+        "cursor": "page-2",
+    },
+    "page-2": {
+        "receipts": [{"id": "r3", "receipt_date": "2024-03-02T11:00:00Z"}],
+        "cursor": None,
+    },
+}
+
+
+class StubLoyverseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = {}
+    requests = []
+    client_ports = set()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        cursor = query.get("cursor", [None])[0]
+        self.requests.append(cursor)
+        self.client_ports.add(self.client_address[1])
+        pending = self.failures.get(cursor) or []
+        if pending:
+            status = pending.pop(0)
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "2")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(PAGES[cursor]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LoyverseStreamingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubLoyverseHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.store = LoyverseStore.objects.create(token="test-token")
+        StubLoyverseHandler.failures = {}
+        StubLoyverseHandler.requests = []
+        StubLoyverseHandler.client_ports = set()
+
+    def test_pages_are_yielded_as_they_arrive(self):
+        pages = iter_receipt_pages(base_url=self.base_url)
+
+        first = next(pages)
+        self.assertEqual([receipt["id"] for receipt in first.receipts], ["r1", "r2"])
+        self.assertEqual(StubLoyverseHandler.requests, [None])
+
+        second = next(pages)
+        self.assertIsNone(second.cursor)
+        self.assertEqual(StubLoyverseHandler.requests, [None, "page-2"])
+
+    def test_transport_retries_throttled_requests_on_one_connection(self):
+        StubLoyverseHandler.failures = {None: [429, 503]}
+        delays = []
+        transport = LoyverseTransport(
+            token="test-token", base_url=self.base_url, sleep=delays.append
+        )
+
+        with transport:
+            pages = list(iter_receipt_pages(transport=transport))
+
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(delays[0], 2.0)
+        self.assertEqual(len(delays), 2)
+        self.assertEqual(transport.metrics.requests, 4)
+        self.assertEqual(transport.metrics.retries, 2)
+        self.assertGreater(transport.metrics.bytes_received, 0)
+        self.assertEqual(sum(transport.metrics.histogram().values()), 4)
+        self.assertEqual(len(StubLoyverseHandler.client_ports), 1)
+
+    def test_transport_gives_up_after_max_retries(self):
+        StubLoyverseHandler.failures = {None: [503, 503, 503]}
+        transport = LoyverseTransport(
+            token="test-token",
+            base_url=self.base_url,
+            max_retries=2,
+            sleep=lambda delay: None,
+        )
+
+        with self.assertRaises(LoyverseAPIError) as context:
+            transport.get_json("/receipts")
+
+        self.assertEqual(context.exception.status, 503)
+        self.assertEqual(transport.metrics.requests, 3)
+
+    @override_settings(LOYVERSE_MAX_RETRIES=0)
+    def test_resume_continues_from_checkpoint(self):
+        StubLoyverseHandler.failures = {"page-2": [503]}
+
+        with override_settings(LOYVERSE_API_URL=self.base_url):
+            with self.assertRaises(CommandError):
+                call_command("sync_loyverse_receipts", stdout=StringIO())
+
+            self.store.refresh_from_db()
+            self.assertEqual(self.store.sync_cursor, "page-2")
+            self.assertEqual(LoyverseReceipt.objects.count(), 2)
+
+            call_command("sync_loyverse_receipts", resume=True, stdout=StringIO())
+
+        self.store.refresh_from_db()
+        self.assertEqual(LoyverseReceipt.objects.count(), 3)
+        self.assertEqual(self.store.sync_cursor, "")
+        self.assertEqual(
+            self.store.last_receipt_at.isoformat(), "2024-03-02T11:00:00+00:00"
+        )
+        self.assertEqual(StubLoyverseHandler.requests, [None, "page-2", "page-2"])
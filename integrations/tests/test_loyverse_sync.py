@@ -1,20 +1,29 @@
+from io import StringIO
 from unittest.mock import patch
 
 from django.core.management import call_command
 from django.test import TestCase
 
-from integrations.models import LoyverseReceipt, LoyverseStore
+from integrations.loyverse_client import ReceiptPage
+from integrations.models import LoyverseReceipt, LoyverseReceiptLine, LoyverseStore
+from integrations.normalization import build_receipt_lines, extract_receipt_header
+from integrations.sync import ingest_receipts_batch
 
 
 class LoyverseSyncTests(TestCase):
     def setUp(self):
         LoyverseStore.objects.create(token="test-token")
 
-    @patch("integrations.loyverse_client.fetch_receipts")
+    @patch("integrations.loyverse_client.iter_receipt_pages")
     def test_sync_is_idempotent(self, mock_fetch):
-        mock_fetch.return_value = [
-            {"id": "r1", "total": 100},
-            {"id": "r2", "total": 200},
+        mock_fetch.side_effect = lambda **kwargs: [
+            ReceiptPage(
+                receipts=[
+                    {"id": "r1", "total": 100},
+                    {"id": "r2", "total": 200},
+                ],
+                cursor=None,
+            )
         ]
 
         call_command("sync_loyverse_receipts")
@@ -22,3 +31,58 @@ class LoyverseSyncTests(TestCase):
 
         call_command("sync_loyverse_receipts")
         self.assertEqual(LoyverseReceipt.objects.count(), 2)
+
+    @patch("integrations.loyverse_client.iter_receipt_pages")
+    def test_sync_ingests_in_batches(self, mock_fetch):
+        LoyverseReceipt.objects.create(receipt_id="r0002", raw_json={"id": "r0002"})
+        receipts = [{"id": f"r{index:04d}"} for index in range(1, 8)]
+        receipts.append({"id": "r0001"})
+        mock_fetch.return_value = [ReceiptPage(receipts=receipts, cursor=None)]
+        output = StringIO()
+
+        call_command("sync_loyverse_receipts", batch_size=3, stdout=output)
+
+        self.assertEqual(LoyverseReceipt.objects.count(), 7)
+        self.assertIn("Lot 3 : 1 importés, 1 ignorés", output.getvalue())
+        self.assertIn("Reçus importés : 6 | Reçus ignorés : 2", output.getvalue())
+
+    def test_ingest_batch_ignores_known_receipts(self):
+        LoyverseReceipt.objects.create(receipt_id="r1", raw_json={"id": "r1"})
+
+        with self.assertNumQueries(5):
+            created, skipped = ingest_receipts_batch([{"id": "r1"}, {"id": "r2"}])
+
+        self.assertEqual((created, skipped), (1, 1))
+        self.assertEqual(LoyverseReceipt.objects.filter(receipt_id="r2").count(), 1)
+
+    def test_ingest_batch_skips_receipts_inserted_concurrently(self):
+        line_items = [{"item_name": "Shampooing", "quantity": 1, "price": 5000}]
+        receipts = [
+            {"id": "r1", "line_items": line_items},
+            {"id": "r2", "line_items": line_items},
+        ]
+
+        def header_after_concurrent_insert(data):
+            # Une autre synchronisation importe r1 après la lecture des reçus connus.
+            if not LoyverseReceipt.objects.filter(receipt_id="r1").exists():
+                other = LoyverseReceipt.objects.create(
+                    receipt_id="r1", raw_json=receipts[0]
+                )
+                LoyverseReceiptLine.objects.bulk_create(
+                    build_receipt_lines(other.pk, receipts[0])
+                )
+            return extract_receipt_header(data)
+
+        with patch(
+            "integrations.sync.extract_receipt_header",
+            side_effect=header_after_concurrent_insert,
+        ):
+            created, skipped = ingest_receipts_batch(receipts)
+
+        self.assertEqual((created, skipped), (1, 1))
+        self.assertEqual(
+            LoyverseReceiptLine.objects.filter(receipt__receipt_id="r1").count(), 1
+        )
+        self.assertEqual(
+            LoyverseReceiptLine.objects.filter(receipt__receipt_id="r2").count(), 1
+        )
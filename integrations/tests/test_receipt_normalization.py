@@ -0,0 +1,65 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from integrations.models import LoyverseReceipt, LoyverseReceiptLine
+from integrations.sync import ingest_receipts_batch
+
+
+def make_receipt(receipt_id, payments=("CASH",)):
+    return {
+        "id": receipt_id,
+        "receipt_type": "SALE",
+        "receipt_date": "2024-03-05T10:15:00Z",
+        "store_id": "store-1",
+        "total_money": 45.5,
+        "payments": [{"type": payment_type} for payment_type in payments],
+        "line_items": [
+            {
+                "item_id": "item-1",
+                "variant_id": "var-1",
+                "item_name": "Perruque lisse",
+                "sku": "PL-01",
+                "quantity": 2,
+                "price": 15,
+                "total_money": 30,
+            },
+            {"item_name": "Shampoing", "quantity": 1, "price": 15.5},
+        ],
+    }
+
+
+class ReceiptNormalizationTests(TestCase):
+    def test_ingest_extracts_header_and_lines(self):
+        ingest_receipts_batch([make_receipt("r1", payments=("CASH", "CARD"))])
+
+        receipt = LoyverseReceipt.objects.get(receipt_id="r1")
+        self.assertEqual(receipt.receipt_type, "SALE")
+        self.assertEqual(receipt.store_ref, "store-1")
+        self.assertEqual(receipt.total_money, Decimal("45.5"))
+        self.assertEqual(receipt.payment_type, "MIXED")
+        self.assertEqual(receipt.receipt_date.day, 5)
+        self.assertIsNotNone(receipt.normalized_at)
+
+        lines = list(receipt.lines.order_by("position"))
+        self.assertEqual([line.sku for line in lines], ["PL-01", ""])
+        self.assertEqual(lines[0].quantity, Decimal("2"))
+        self.assertEqual(lines[1].total_money, Decimal("15.5"))
+
+    def test_backfill_command_normalizes_pending_receipts(self):
+        LoyverseReceipt.objects.create(receipt_id="r1", raw_json=make_receipt("r1"))
+        LoyverseReceipt.objects.create(receipt_id="r2", raw_json=make_receipt("r2"))
+        output = StringIO()
+
+        call_command("normalize_loyverse_receipts", chunk_size=1, stdout=output)
+
+        self.assertFalse(
+            LoyverseReceipt.objects.filter(normalized_at__isnull=True).exists()
+        )
+        self.assertEqual(LoyverseReceiptLine.objects.count(), 4)
+        self.assertIn("Lignes créées : 4", output.getvalue())
+
+        call_command("normalize_loyverse_receipts", all=True, stdout=StringIO())
+        self.assertEqual(LoyverseReceiptLine.objects.count(), 4)
@@ -0,0 +1,171 @@
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from typing import Callable, Optional
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.utils import timezone
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 120
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LoyverseAPIError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class TransportMetrics:
+    requests: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+    latencies: list = field(default_factory=list)
+
+    def observe(self, latency: float, size: int) -> None:
+        self.latencies.append(latency)
+        self.bytes_received += size
+
+    def histogram(self) -> dict:
+        buckets = {f"<={bound}s": 0 for bound in LATENCY_BUCKETS}
+        buckets[f">{LATENCY_BUCKETS[-1]}s"] = 0
+        for latency in self.latencies:
+            for bound in LATENCY_BUCKETS:
+                if latency <= bound:
+                    buckets[f"<={bound}s"] += 1
+                    break
+            else:
+                buckets[f">{LATENCY_BUCKETS[-1]}s"] += 1
+        return buckets
+
+    def summary(self) -> str:
+        latencies = sorted(self.latencies)
+        median = latencies[len(latencies) // 2] if latencies else 0.0
+        slowest = latencies[-1] if latencies else 0.0
+        histogram = " ".join(
+            f"{label}:{count}" for label, count in self.histogram().items() if count
+        )
+        return (
+            f"Requêtes : {self.requests} | Relances : {self.retries} | "
+            f"Octets : {self.bytes_received} | Latence médiane : {median:.3f} s | "
+            f"Latence max : {slowest:.3f} s | Histogramme : {histogram or '-'}"
+        )
+
+
+class LoyverseTransport:
+    """Client HTTP à connexion persistante avec relances et temporisation."""
+
+    def __init__(
+        self,
+        token: str,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        parts = urlsplit(base_url or settings.LOYVERSE_API_URL)
+        self.token = token
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout if timeout is not None else settings.LOYVERSE_TIMEOUT
+        self.max_retries = (
+            max_retries if max_retries is not None else settings.LOYVERSE_MAX_RETRIES
+        )
+        self.backoff_base = (
+            backoff_base if backoff_base is not None else settings.LOYVERSE_BACKOFF_BASE
+        )
+        self.backoff_max = (
+            backoff_max if backoff_max is not None else settings.LOYVERSE_BACKOFF_MAX
+        )
+        self.sleep = sleep
+        self.metrics = TransportMetrics()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _get_connection(self):
+        if self._connection is None:
+            connection_class = (
+                HTTPSConnection if self.scheme == "https" else HTTPConnection
+            )
+            self._connection = connection_class(
+                self.host, self.port, timeout=self.timeout
+            )
+        return self._connection
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _retry_after(self, response) -> Optional[float]:
+        value = response.getheader("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - timezone.now()).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+    def get_json(self, path: str, params: Optional[dict] = None) -> dict:
+        query = urlencode({k: v for k, v in (params or {}).items() if v is not None})
+        url = f"{self.base_path}{path}?{query}" if query else f"{self.base_path}{path}"
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        }
+
+        attempt = 0
+        while True:
+            self.metrics.requests += 1
+            started = time.monotonic()
+            try:
+                connection = self._get_connection()
+                connection.request("GET", url, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, HTTPException) as exc:
+                self.metrics.observe(time.monotonic() - started, 0)
+                self.close()
+                if attempt >= self.max_retries:
+                    raise LoyverseAPIError(f"Erreur réseau Loyverse : {exc}") from exc
+                delay = self._backoff(attempt)
+            else:
+                self.metrics.observe(time.monotonic() - started, len(body))
+                if response.will_close:
+                    self.close()
+                if 200 <= response.status < 300:
+                    return json.loads(body.decode("utf-8"))
+                if response.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise LoyverseAPIError(
+                        f"Réponse Loyverse inattendue ({response.status}).",
+                        status=response.status,
+                    )
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+            attempt += 1
+            self.metrics.retries += 1
+            self.sleep(delay)
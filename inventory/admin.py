@@ -1,6 +1,12 @@
 from django.contrib import admin
 
-from inventory.models import InventoryItem, StockLevel, StockMove
+from inventory.models import (
+    InventoryItem,
+    StockForecast,
+    StockLevel,
+    StockMove,
+    StockSnapshot,
+)
 
 
 @admin.register(InventoryItem)
@@ -28,3 +34,25 @@ class StockLevelAdmin(admin.ModelAdmin):
     list_display = ("item", "quantity", "alert", "updated_at")
     list_filter = ("alert",)
     search_fields = ("item__name",)
+
+
+@admin.register(StockSnapshot)
+class StockSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("item", "day", "quantity", "created_at")
+    list_filter = ("day",)
+    search_fields = ("item__name", "item__sku")
+    ordering = ("-day", "item__name")
+
+
+@admin.register(StockForecast)
+class StockForecastAdmin(admin.ModelAdmin):
+    list_display = (
+        "item",
+        "daily_rate",
+        "days_until_stockout",
+        "reorder_point",
+        "suggested_qty",
+        "computed_at",
+    )
+    search_fields = ("item__name", "item__sku")
+    ordering = ("days_until_stockout",)
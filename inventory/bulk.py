@@ -0,0 +1,120 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from inventory.models import InventoryItem, StockLevel, StockMove, signed_quantity
+from reporting.cache import bump_domain_version
+
+
+def resolve_items(lines: list[dict]) -> None:
+    """Renseigne ``item`` à partir du SKU, en une seule requête."""
+    skus = {line["sku"] for line in lines if not line.get("item") and line.get("sku")}
+    if not skus:
+        return
+    by_sku = dict(InventoryItem.objects.filter(sku__in=skus).values_list("sku", "pk"))
+    for line in lines:
+        if not line.get("item") and line.get("sku"):
+            line["item"] = by_sku.get(line["sku"])
+
+
+def _lock_levels(items: dict) -> dict:
+    levels = {
+        level.item_id: level
+        for level in StockLevel.objects.select_for_update().filter(item_id__in=items)
+    }
+    missing = [item_id for item_id in items if item_id not in levels]
+    if missing:
+        ledger = dict(
+            StockMove.objects.filter(item_id__in=missing)
+            .values("item_id")
+            .annotate(total=Sum(signed_quantity()))
+            .values_list("item_id", "total")
+        )
+        created = StockLevel.objects.bulk_create(
+            [
+                StockLevel(
+                    item_id=item_id,
+                    quantity=ledger.get(item_id) or 0,
+                    alert=(ledger.get(item_id) or 0) < items[item_id].min_stock,
+                )
+                for item_id in missing
+            ]
+        )
+        levels.update({level.item_id: level for level in created})
+    return levels
+
+
+def apply_stock_moves(lines: list[dict], user=None) -> list[StockMove]:
+    """Enregistre un lot de mouvements en une transaction.
+
+    Chaque ligne porte ``item``, ``type``, ``qty`` et ``reference`` ; une ligne
+    de comptage porte ``counted`` à la place de ``type``/``qty`` et devient un
+    ajustement de l'écart constaté. Le lot est refusé en entier si une ligne
+    est invalide ou rend un stock négatif.
+    """
+    errors = {}
+    item_ids = sorted({line["item"] for line in lines if line.get("item")})
+    moves = []
+    with transaction.atomic():
+        items = InventoryItem.objects.select_for_update().in_bulk(item_ids)
+        levels = _lock_levels(items)
+        balances = {item_id: level.quantity for item_id, level in levels.items()}
+
+        for index, line in enumerate(lines):
+            item_id = line.get("item")
+            if item_id not in items:
+                errors[index] = "Article introuvable."
+                continue
+            if line.get("counted") is not None:
+                difference = line["counted"] - balances[item_id]
+                if not difference:
+                    continue
+                move = StockMove(
+                    item_id=item_id, qty=difference, type=StockMove.Type.ADJUST
+                )
+            else:
+                move = StockMove(item_id=item_id, qty=line["qty"], type=line["type"])
+            move.reference = line.get("reference") or ""
+            move.created_by = user
+            try:
+                move.clean_fields(exclude=["item", "created_by"])
+                move.validate_quantity()
+            except ValidationError as exc:
+                errors[index] = " ".join(exc.messages)
+                continue
+            balances[item_id] += move.get_delta()
+            if balances[item_id] < 0:
+                errors[index] = "Stock insuffisant pour cette opération."
+                continue
+            moves.append(move)
+
+        if errors:
+            raise ValidationError(_format_errors(errors))
+
+        StockMove.objects.bulk_create(moves, batch_size=500)
+        now = timezone.now()
+        touched = []
+        for item_id in {move.item_id for move in moves}:
+            level = levels[item_id]
+            level.quantity = balances[item_id]
+            level.alert = level.quantity < items[item_id].min_stock
+            level.updated_at = now
+            touched.append(level)
+        StockLevel.objects.bulk_update(
+            touched, ["quantity", "alert", "updated_at"], batch_size=500
+        )
+
+    if moves:
+        # bulk_create et bulk_update ne déclenchent pas les signaux.
+        bump_domain_version("stock")
+    return moves
+
+
+def _format_errors(errors: dict) -> dict:
+    return {
+        "moves": [
+            f"Ligne {index + 1} : {message}"
+            for index, message in sorted(errors.items())
+        ]
+    }
@@ -0,0 +1,133 @@
+import math
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from inventory.models import InventoryItem, StockForecast, StockLevel, StockMove
+from inventory.snapshots import end_of_day
+
+WINDOWS = (7, 30, 90, 365)
+HISTORY_DAYS = max(WINDOWS)
+# Pondération des fenêtres glissantes : la tendance récente compte davantage,
+# l'année lisse les articles à rotation lente.
+WINDOW_WEIGHTS = {
+    7: Decimal("0.3"),
+    30: Decimal("0.4"),
+    90: Decimal("0.2"),
+    365: Decimal("0.1"),
+}
+CONSUMPTION_TYPES = [StockMove.Type.OUT, StockMove.Type.LOSS]
+
+
+def _quantize(value: Decimal, places: str = "0.001") -> Decimal:
+    return value.quantize(Decimal(places), rounding=ROUND_HALF_UP)
+
+
+def daily_consumption(start: date, end: date) -> dict:
+    """Sorties et pertes par article et par jour, en une requête groupée."""
+    rows = (
+        StockMove.objects.filter(
+            type__in=CONSUMPTION_TYPES,
+            created_at__gte=end_of_day(start - timedelta(days=1)),
+            created_at__lt=end_of_day(end),
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("item_id", "day")
+        .annotate(quantity=Sum("qty"))
+        .values_list("item_id", "day", "quantity")
+    )
+    per_item = defaultdict(dict)
+    for item_id, day, quantity in rows:
+        per_item[item_id][day] = quantity
+    return per_item
+
+
+def rolling_rates(per_day: dict, end: date, windows=WINDOWS) -> dict:
+    """Consommation moyenne journalière sur chaque fenêtre se terminant à ``end``.
+
+    Chaque jour consommé n'est parcouru qu'une fois, toutes fenêtres confondues.
+    """
+    totals = dict.fromkeys(windows, 0)
+    for day, quantity in per_day.items():
+        age = (end - day).days
+        for window in windows:
+            if 0 <= age < window:
+                totals[window] += quantity
+    return {window: Decimal(totals[window]) / window for window in windows}
+
+
+def forecast_item(
+    rates: dict, quantity: int, min_stock: int, lead_days: int, cover_days: int
+) -> dict:
+    daily_rate = _quantize(
+        sum(rates[window] * weight for window, weight in WINDOW_WEIGHTS.items())
+    )
+    days_until_stockout = None
+    if daily_rate > 0:
+        days_until_stockout = _quantize(
+            Decimal(max(quantity, 0)) / daily_rate, "0.1"
+        ).min(Decimal("9999999.9"))
+    reorder_point = math.ceil(daily_rate * lead_days) + min_stock
+    suggested_qty = 0
+    if quantity <= reorder_point:
+        target = math.ceil(daily_rate * (lead_days + cover_days)) + min_stock
+        suggested_qty = max(target - quantity, 0)
+    return {
+        "daily_rate_7": _quantize(rates[7]),
+        "daily_rate_30": _quantize(rates[30]),
+        "daily_rate_90": _quantize(rates[90]),
+        "daily_rate": daily_rate,
+        "days_until_stockout": days_until_stockout,
+        "reorder_point": reorder_point,
+        "suggested_qty": suggested_qty,
+    }
+
+
+def compute_stock_forecasts(
+    end: Optional[date] = None,
+    lead_days: Optional[int] = None,
+    cover_days: Optional[int] = None,
+) -> int:
+    """Recalcule les prévisions de tous les articles en une passe groupée."""
+    end = end or timezone.localdate()
+    lead_days = (
+        lead_days if lead_days is not None else settings.STOCK_FORECAST_LEAD_DAYS
+    )
+    cover_days = (
+        cover_days if cover_days is not None else settings.STOCK_FORECAST_COVER_DAYS
+    )
+    consumption = daily_consumption(end - timedelta(days=HISTORY_DAYS - 1), end)
+    quantities = dict(StockLevel.objects.values_list("item_id", "quantity"))
+
+    now = timezone.now()
+    forecasts = []
+    for item_id, min_stock in InventoryItem.objects.values_list("pk", "min_stock"):
+        rates = rolling_rates(consumption.get(item_id, {}), end)
+        values = forecast_item(
+            rates, quantities.get(item_id, 0), min_stock, lead_days, cover_days
+        )
+        forecasts.append(StockForecast(item_id=item_id, computed_at=now, **values))
+
+    StockForecast.objects.bulk_create(
+        forecasts,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["item"],
+        update_fields=[
+            "daily_rate_7",
+            "daily_rate_30",
+            "daily_rate_90",
+            "daily_rate",
+            "days_until_stockout",
+            "reorder_point",
+            "suggested_qty",
+            "computed_at",
+        ],
+    )
+    return len(forecasts)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from inventory.forecasting import compute_stock_forecasts
+
+
+class Command(BaseCommand):
+    help = "Calcule la consommation, la date de rupture et les quantités à commander."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lead-days",
+            dest="lead_days",
+            type=int,
+            help="Délai de livraison fournisseur en jours.",
+        )
+        parser.add_argument(
+            "--cover-days",
+            dest="cover_days",
+            type=int,
+            help="Nombre de jours de consommation couverts par une commande.",
+        )
+
+    def handle(self, *args, **options):
+        count = compute_stock_forecasts(
+            lead_days=options.get("lead_days"), cover_days=options.get("cover_days")
+        )
+        self.stdout.write(self.style.SUCCESS(f"Prévisions calculées : {count}"))
@@ -0,0 +1,69 @@
+import csv
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.bulk import apply_stock_moves, resolve_items
+from inventory.serializers import StockMoveLineSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe des mouvements de stock depuis un CSV "
+        "(colonnes : item ou sku, type, qty ou counted, reference)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Chemin du fichier CSV.")
+        parser.add_argument(
+            "--reference",
+            dest="reference",
+            default="",
+            help="Référence appliquée aux lignes qui n'en ont pas.",
+        )
+        parser.add_argument(
+            "--delimiter",
+            dest="delimiter",
+            default=",",
+            help="Séparateur de colonnes (virgule par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as handle:
+                rows = list(csv.DictReader(handle, delimiter=options["delimiter"]))
+        except OSError as exc:
+            raise CommandError(f"Lecture impossible : {exc}") from exc
+
+        rows = [
+            {
+                key: value
+                for key, value in row.items()
+                if key and value not in ("", None)
+            }
+            for row in rows
+        ]
+        serializer = StockMoveLineSerializer(data=rows, many=True)
+        if not serializer.is_valid():
+            messages = [
+                f"Ligne {index + 1} : {errors}"
+                for index, errors in enumerate(serializer.errors)
+                if errors
+            ]
+            raise CommandError("\n".join(messages))
+
+        lines = [dict(line) for line in serializer.validated_data]
+        for line in lines:
+            line.setdefault("reference", options["reference"])
+        resolve_items(lines)
+        try:
+            moves = apply_stock_moves(lines)
+        except ValidationError as exc:
+            raise CommandError("\n".join(exc.messages)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Mouvements importés : {len(moves)} | "
+                f"Articles : {len({move.item_id for move in moves})}"
+            )
+        )
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+
+from inventory.models import InventoryItem, StockLevel, StockMove, signed_quantity
+
+
+class Command(BaseCommand):
+    help = "Vérifie les niveaux de stock contre le journal des mouvements."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Signale les écarts sans corriger les niveaux.",
+        )
+
+    def handle(self, *args, **options):
+        ledger = dict(
+            StockMove.objects.values("item_id")
+            .annotate(total=Sum(signed_quantity()))
+            .values_list("item_id", "total")
+        )
+        levels = {level.item_id: level for level in StockLevel.objects.all()}
+
+        mismatches = 0
+        for item in InventoryItem.objects.only("pk", "name", "min_stock"):
+            expected = ledger.get(item.pk) or 0
+            level = levels.get(item.pk)
+            alert = expected < item.min_stock
+            if level is not None and (level.quantity, level.alert) == (expected, alert):
+                continue
+            if level is None and not expected and not item.min_stock:
+                continue
+            mismatches += 1
+            current = "absent" if level is None else level.quantity
+            self.stdout.write(f"{item.name} : niveau {current}, journal {expected}")
+            if options.get("dry_run"):
+                continue
+            with transaction.atomic():
+                InventoryItem.objects.select_for_update().get(pk=item.pk)
+                item.refresh_stock_level()
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("Niveaux de stock cohérents."))
+        elif options.get("dry_run"):
+            self.stdout.write(self.style.WARNING(f"Écarts détectés : {mismatches}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Niveaux corrigés : {mismatches}"))
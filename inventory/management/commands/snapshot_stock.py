@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from inventory.snapshots import take_stock_snapshot
+
+
+class Command(BaseCommand):
+    help = "Enregistre le stock de fin de journée de chaque article."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            dest="date",
+            help="Jour photographié au format YYYY-MM-DD (hier par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        day = timezone.localdate() - timedelta(days=1)
+        if options.get("date"):
+            try:
+                day = date.fromisoformat(options["date"])
+            except ValueError as exc:
+                raise CommandError("Format de date invalide pour --date.") from exc
+        try:
+            count = take_stock_snapshot(day)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(
+            self.style.SUCCESS(f"Photo du {day:%d/%m/%Y} : {count} articles")
+        )
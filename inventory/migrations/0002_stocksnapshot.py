@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Jour")),
+                (
+                    "quantity",
+                    models.IntegerField(verbose_name="Quantité en fin de journée"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Créé le"),
+                ),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="inventory.inventoryitem",
+                        verbose_name="Article",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Photo de stock",
+                "verbose_name_plural": "Photos de stock",
+                "indexes": [
+                    models.Index(fields=["day"], name="inventory_s_day_56715d_idx")
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="stocksnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("item", "day"), name="unique_stock_snapshot_item_day"
+            ),
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0002_stocksnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockForecast",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "daily_rate_7",
+                    models.DecimalField(
+                        decimal_places=3,
+                        default=0,
+                        max_digits=10,
+                        verbose_name="Conso./jour (7 j)",
+                    ),
+                ),
+                (
+                    "daily_rate_30",
+                    models.DecimalField(
+                        decimal_places=3,
+                        default=0,
+                        max_digits=10,
+                        verbose_name="Conso./jour (30 j)",
+                    ),
+                ),
+                (
+                    "daily_rate_90",
+                    models.DecimalField(
+                        decimal_places=3,
+                        default=0,
+                        max_digits=10,
+                        verbose_name="Conso./jour (90 j)",
+                    ),
+                ),
+                (
+                    "daily_rate",
+                    models.DecimalField(
+                        decimal_places=3,
+                        default=0,
+                        max_digits=10,
+                        verbose_name="Conso./jour retenue",
+                    ),
+                ),
+                (
+                    "days_until_stockout",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=1,
+                        max_digits=8,
+                        null=True,
+                        verbose_name="Jours avant rupture",
+                    ),
+                ),
+                (
+                    "reorder_point",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Seuil de commande"
+                    ),
+                ),
+                (
+                    "suggested_qty",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Quantité à commander"
+                    ),
+                ),
+                ("computed_at", models.DateTimeField(verbose_name="Calculé le")),
+                (
+                    "item",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="forecast",
+                        to="inventory.inventoryitem",
+                        verbose_name="Article",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Prévision de stock",
+                "verbose_name_plural": "Prévisions de stock",
+                "indexes": [
+                    models.Index(
+                        fields=["days_until_stockout"],
+                        name="inventory_s_days_un_4aa2c2_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,7 +1,20 @@
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Case, IntegerField, Sum, Value, When
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.utils import timezone
+
+
+def signed_quantity():
+    """Expression SQL du mouvement signé (entrées positives, sorties négatives)."""
+    return Case(
+        When(type=StockMove.Type.IN, then=F("qty")),
+        When(type=StockMove.Type.ADJUST, then=F("qty")),
+        When(type=StockMove.Type.OUT, then=-1 * F("qty")),
+        When(type=StockMove.Type.LOSS, then=-1 * F("qty")),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
 
 
 class InventoryItem(models.Model):
@@ -31,22 +44,14 @@ class InventoryItem(models.Model):
         moves = self.moves.all()
         if exclude_move_id:
             moves = moves.exclude(pk=exclude_move_id)
-        totals = moves.aggregate(
-            total=Sum(
-                Case(
-                    When(type=StockMove.Type.IN, then=models.F("qty")),
-                    When(type=StockMove.Type.ADJUST, then=models.F("qty")),
-                    When(type=StockMove.Type.OUT, then=-1 * models.F("qty")),
-                    When(type=StockMove.Type.LOSS, then=-1 * models.F("qty")),
-                    default=Value(0),
-                    output_field=IntegerField(),
-                )
-            )
-        )
+        totals = moves.aggregate(total=Sum(signed_quantity()))
         return totals["total"] or 0
 
     def get_current_stock(self) -> int:
-        return self.get_stock_from_moves()
+        try:
+            return self.stock_level.quantity
+        except StockLevel.DoesNotExist:
+            return self.get_stock_from_moves()
 
     def refresh_stock_level(self) -> "StockLevel":
         quantity = self.get_stock_from_moves()
@@ -57,6 +62,25 @@ class InventoryItem(models.Model):
         )
         return stock_level
 
+    def lock_stock_level(self) -> "StockLevel":
+        """Verrouille le niveau de stock, créé depuis le journal s'il manque.
+
+        À appeler dans une transaction, après ``select_for_update`` sur l'article.
+        """
+        level = StockLevel.objects.select_for_update().filter(item=self).first()
+        return level or self.refresh_stock_level()
+
+    def apply_stock_delta(self, level: "StockLevel", delta: int) -> None:
+        if delta:
+            level.quantity += delta
+            level.alert = level.quantity < self.min_stock
+            StockLevel.objects.filter(pk=level.pk).update(
+                quantity=F("quantity") + delta,
+                alert=level.alert,
+                updated_at=timezone.now(),
+            )
+        self._state.fields_cache.pop("stock_level", None)
+
 
 class StockMove(models.Model):
     class Type(models.TextChoices):
@@ -106,8 +130,7 @@ class StockMove(models.Model):
             return -abs(self.qty)
         return self.qty
 
-    def clean(self) -> None:
-        super().clean()
+    def validate_quantity(self) -> None:
         errors = {}
         if self.qty == 0:
             errors["qty"] = "La quantité doit être différente de zéro."
@@ -116,23 +139,75 @@ class StockMove(models.Model):
         if errors:
             raise ValidationError(errors)
 
-        current_stock = self.item.get_stock_from_moves(exclude_move_id=self.pk)
-        if current_stock + self.get_delta() < 0:
+    def clean(self) -> None:
+        super().clean()
+        self.validate_quantity()
+        if self.item_id and self._available_stock() + self.get_delta() < 0:
             raise ValidationError("Stock insuffisant pour cette opération.")
 
+    def _previous_delta(self) -> int:
+        if not self.pk:
+            return 0
+        previous = StockMove.objects.filter(pk=self.pk, item_id=self.item_id).first()
+        return previous.get_delta() if previous else 0
+
+    def _available_stock(self) -> int:
+        quantity = (
+            StockLevel.objects.filter(item_id=self.item_id)
+            .values_list("quantity", flat=True)
+            .first()
+        )
+        if quantity is None:
+            return self.item.get_stock_from_moves(exclude_move_id=self.pk)
+        return quantity - self._previous_delta()
+
+    def _invalidate_snapshots(self, item_ids) -> None:
+        if self.created_at:
+            StockSnapshot.objects.filter(
+                item_id__in=item_ids,
+                day__gte=timezone.localtime(self.created_at).date(),
+            ).delete()
+
+    def _forget_cached_level(self) -> None:
+        item = self._state.fields_cache.get("item")
+        if item is not None:
+            item._state.fields_cache.pop("stock_level", None)
+
     def save(self, *args, **kwargs):
         self.full_clean()
         with transaction.atomic():
-            InventoryItem.objects.select_for_update().get(pk=self.item_id)
+            item = InventoryItem.objects.select_for_update().get(pk=self.item_id)
+            previous = StockMove.objects.filter(pk=self.pk).first() if self.pk else None
+            previous_delta = 0
+            if previous is not None and previous.item_id == self.item_id:
+                previous_delta = previous.get_delta()
+            level = item.lock_stock_level()
+            # Revérifie sous verrou : clean() a pu lire un solde déjà périmé.
+            if level.quantity - previous_delta + self.get_delta() < 0:
+                raise ValidationError("Stock insuffisant pour cette opération.")
             super().save(*args, **kwargs)
-            self.item.refresh_stock_level()
+            item.apply_stock_delta(level, self.get_delta() - previous_delta)
+            if previous is not None and previous.item_id != self.item_id:
+                previous_item = InventoryItem.objects.select_for_update().get(
+                    pk=previous.item_id
+                )
+                previous_item.apply_stock_delta(
+                    previous_item.lock_stock_level(), -previous.get_delta()
+                )
+            if previous is not None:
+                self._invalidate_snapshots({previous.item_id, self.item_id})
+        self._forget_cached_level()
 
     def delete(self, *args, **kwargs):
-        item = self.item
         with transaction.atomic():
-            InventoryItem.objects.select_for_update().get(pk=item.pk)
-            super().delete(*args, **kwargs)
-            item.refresh_stock_level()
+            item = InventoryItem.objects.select_for_update().get(pk=self.item_id)
+            level = item.lock_stock_level()
+            delta = self.get_delta()
+            self._invalidate_snapshots({self.item_id})
+            result = super().delete(*args, **kwargs)
+            item.apply_stock_delta(level, -delta)
+        self._forget_cached_level()
+        return result
 
 
 class StockLevel(models.Model):
@@ -152,3 +227,71 @@ class StockLevel(models.Model):
 
     def __str__(self) -> str:
         return f"{self.item} ({self.quantity})"
+
+
+class StockSnapshot(models.Model):
+    item = models.ForeignKey(
+        InventoryItem,
+        on_delete=models.CASCADE,
+        related_name="snapshots",
+        verbose_name="Article",
+    )
+    day = models.DateField(verbose_name="Jour")
+    quantity = models.IntegerField(verbose_name="Quantité en fin de journée")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+
+    class Meta:
+        verbose_name = "Photo de stock"
+        verbose_name_plural = "Photos de stock"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["item", "day"], name="unique_stock_snapshot_item_day"
+            )
+        ]
+        indexes = [models.Index(fields=["day"])]
+
+    def __str__(self) -> str:
+        return f"{self.item} ({self.day:%d/%m/%Y} : {self.quantity})"
+
+
+class StockForecast(models.Model):
+    item = models.OneToOneField(
+        InventoryItem,
+        on_delete=models.CASCADE,
+        related_name="forecast",
+        verbose_name="Article",
+    )
+    daily_rate_7 = models.DecimalField(
+        max_digits=10, decimal_places=3, default=0, verbose_name="Conso./jour (7 j)"
+    )
+    daily_rate_30 = models.DecimalField(
+        max_digits=10, decimal_places=3, default=0, verbose_name="Conso./jour (30 j)"
+    )
+    daily_rate_90 = models.DecimalField(
+        max_digits=10, decimal_places=3, default=0, verbose_name="Conso./jour (90 j)"
+    )
+    daily_rate = models.DecimalField(
+        max_digits=10, decimal_places=3, default=0, verbose_name="Conso./jour retenue"
+    )
+    days_until_stockout = models.DecimalField(
+        max_digits=8,
+        decimal_places=1,
+        null=True,
+        blank=True,
+        verbose_name="Jours avant rupture",
+    )
+    reorder_point = models.PositiveIntegerField(
+        default=0, verbose_name="Seuil de commande"
+    )
+    suggested_qty = models.PositiveIntegerField(
+        default=0, verbose_name="Quantité à commander"
+    )
+    computed_at = models.DateTimeField(verbose_name="Calculé le")
+
+    class Meta:
+        verbose_name = "Prévision de stock"
+        verbose_name_plural = "Prévisions de stock"
+        indexes = [models.Index(fields=["days_until_stockout"])]
+
+    def __str__(self) -> str:
+        return f"{self.item} ({self.daily_rate}/jour)"
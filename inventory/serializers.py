@@ -1,7 +1,7 @@
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 
-from inventory.models import InventoryItem, StockMove
+from inventory.models import InventoryItem, StockForecast, StockMove
 
 
 class InventoryItemSerializer(serializers.ModelSerializer):
@@ -62,3 +62,50 @@ class StockMoveSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 exc.message_dict or {"detail": str(exc)}
             ) from exc
+
+
+class StockMoveLineSerializer(serializers.Serializer):
+    item = serializers.IntegerField(required=False)
+    sku = serializers.CharField(required=False, allow_blank=True)
+    type = serializers.ChoiceField(choices=StockMove.Type.choices, required=False)
+    qty = serializers.IntegerField(required=False)
+    counted = serializers.IntegerField(required=False, min_value=0)
+    reference = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        if not attrs.get("item") and not attrs.get("sku"):
+            raise serializers.ValidationError("L'article ou le SKU est obligatoire.")
+        if attrs.get("counted") is None and (
+            attrs.get("type") is None or attrs.get("qty") is None
+        ):
+            raise serializers.ValidationError(
+                "Indiquez le type et la quantité, ou la quantité comptée."
+            )
+        return attrs
+
+
+class BulkStockMoveSerializer(serializers.Serializer):
+    moves = StockMoveLineSerializer(many=True, allow_empty=False)
+
+
+class StockForecastSerializer(serializers.ModelSerializer):
+    item_name = serializers.CharField(source="item.name", read_only=True)
+    sku = serializers.CharField(source="item.sku", read_only=True)
+    quantity = serializers.IntegerField(source="item.stock_level.quantity", default=0)
+
+    class Meta:
+        model = StockForecast
+        fields = (
+            "item",
+            "item_name",
+            "sku",
+            "quantity",
+            "daily_rate_7",
+            "daily_rate_30",
+            "daily_rate_90",
+            "daily_rate",
+            "days_until_stockout",
+            "reorder_point",
+            "suggested_qty",
+            "computed_at",
+        )
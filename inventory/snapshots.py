@@ -0,0 +1,75 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from django.db.models import OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from inventory.models import InventoryItem, StockMove, StockSnapshot, signed_quantity
+
+
+def end_of_day(day: date) -> datetime:
+    """Premier instant (heure locale) du lendemain de ``day``."""
+    return timezone.make_aware(
+        datetime.combine(day + timedelta(days=1), time.min),
+        timezone.get_current_timezone(),
+    )
+
+
+def stock_as_of(day: date, item_ids: Optional[Iterable[int]] = None) -> dict:
+    """Retourne le stock de chaque article à la fin de ``day``.
+
+    Part de la photo la plus récente antérieure ou égale à ``day`` puis ajoute
+    les mouvements enregistrés depuis, groupés par jour de photo : le coût
+    dépend du nombre d'articles, pas de la longueur de l'historique.
+    """
+    latest = StockSnapshot.objects.filter(item=OuterRef("pk"), day__lte=day).order_by(
+        "-day"
+    )
+    items = InventoryItem.objects.annotate(
+        snapshot_day=Subquery(latest.values("day")[:1]),
+        snapshot_quantity=Subquery(latest.values("quantity")[:1]),
+    )
+    if item_ids is not None:
+        items = items.filter(pk__in=list(item_ids))
+
+    balances = {}
+    by_snapshot_day = defaultdict(list)
+    for item_id, snapshot_day, snapshot_quantity in items.values_list(
+        "pk", "snapshot_day", "snapshot_quantity"
+    ):
+        balances[item_id] = snapshot_quantity or 0
+        by_snapshot_day[snapshot_day].append(item_id)
+
+    upper = end_of_day(day)
+    for snapshot_day, ids in by_snapshot_day.items():
+        if snapshot_day == day:
+            continue
+        moves = StockMove.objects.filter(item_id__in=ids, created_at__lt=upper)
+        if snapshot_day is not None:
+            moves = moves.filter(created_at__gte=end_of_day(snapshot_day))
+        for item_id, total in (
+            moves.values("item_id")
+            .annotate(total=Sum(signed_quantity()))
+            .values_list("item_id", "total")
+        ):
+            balances[item_id] += total or 0
+    return balances
+
+
+def take_stock_snapshot(day: date) -> int:
+    """Enregistre (ou remplace) la photo de fin de journée de tous les articles."""
+    if day >= timezone.localdate():
+        raise ValueError("Seules les journées terminées peuvent être photographiées.")
+    balances = stock_as_of(day)
+    StockSnapshot.objects.bulk_create(
+        [
+            StockSnapshot(item_id=item_id, day=day, quantity=quantity)
+            for item_id, quantity in balances.items()
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["item", "day"],
+        update_fields=["quantity"],
+    )
+    return len(balances)
@@ -0,0 +1,105 @@
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from inventory.models import InventoryItem, StockForecast, StockLevel, StockMove
+
+
+class BulkStockMoveTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="stock", password="Test12345!")
+        self.client.force_authenticate(user=self.user)
+        self.gel = InventoryItem.objects.create(
+            name="Gel", sku="GEL", category=InventoryItem.Category.SALE, min_stock=3
+        )
+        self.brush = InventoryItem.objects.create(
+            name="Brosse", sku="BRS", category=InventoryItem.Category.SALE
+        )
+        StockMove.objects.create(item=self.gel, qty=5, type=StockMove.Type.IN)
+
+    def test_bulk_delivery_and_count(self):
+        with self.assertNumQueries(9):
+            response = self.client.post(
+                "/api/inventory/moves/bulk/",
+                {
+                    "moves": [
+                        {"item": self.brush.id, "type": "IN", "qty": 10},
+                        {"sku": "GEL", "type": "OUT", "qty": 2},
+                        {"sku": "BRS", "counted": 7, "reference": "Inventaire"},
+                        {"sku": "GEL", "counted": 3},
+                    ]
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 3, "items": 2})
+        self.assertEqual(StockLevel.objects.get(item=self.brush).quantity, 7)
+        gel_level = StockLevel.objects.get(item=self.gel)
+        self.assertEqual(gel_level.quantity, 3)
+        self.assertFalse(gel_level.alert)
+        adjust = StockMove.objects.get(item=self.brush, type=StockMove.Type.ADJUST)
+        self.assertEqual((adjust.qty, adjust.reference), (-3, "Inventaire"))
+        self.assertEqual(adjust.created_by, self.user)
+
+    def test_bulk_is_rejected_as_a_whole(self):
+        response = self.client.post(
+            "/api/inventory/moves/bulk/",
+            {
+                "moves": [
+                    {"item": self.gel.id, "type": "OUT", "qty": 4},
+                    {"item": self.gel.id, "type": "OUT", "qty": 4},
+                    {"sku": "INCONNU", "type": "IN", "qty": 1},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Ligne 2", response.data["moves"][0])
+        self.assertIn("Ligne 3", response.data["moves"][1])
+        self.assertEqual(StockMove.objects.count(), 1)
+        self.assertEqual(StockLevel.objects.get(item=self.gel).quantity, 5)
+
+    def test_csv_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write("sku,type,qty,counted\nBRS,IN,4,\nGEL,,,1\n")
+        output = StringIO()
+
+        call_command(
+            "import_stock_moves", handle.name, reference="Livraison", stdout=output
+        )
+
+        self.assertIn("Mouvements importés : 2", output.getvalue())
+        self.assertEqual(StockLevel.objects.get(item=self.brush).quantity, 4)
+        self.assertEqual(StockLevel.objects.get(item=self.gel).quantity, 1)
+        self.assertTrue(StockLevel.objects.get(item=self.gel).alert)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write("sku,type,qty\nBRS,OUT,99\n")
+        with self.assertRaises(CommandError):
+            call_command("import_stock_moves", handle.name, stdout=StringIO())
+
+    def test_stock_as_of_endpoint(self):
+        response = self.client.get("/api/inventory/items/stock_as_of/")
+
+        self.assertEqual(response.status_code, 200)
+        quantities = {row["sku"]: row["quantity"] for row in response.data["items"]}
+        self.assertEqual(quantities, {"BRS": 0, "GEL": 5})
+
+    def test_reorder_endpoint_lists_suggestions(self):
+        call_command("forecast_stock", stdout=StringIO())
+        StockForecast.objects.filter(item=self.gel).update(
+            suggested_qty=12, days_until_stockout=2
+        )
+
+        response = self.client.get("/api/inventory/items/reorder/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["sku"], "GEL")
+        self.assertEqual(response.data[0]["quantity"], 5)
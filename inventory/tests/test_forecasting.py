@@ -0,0 +1,61 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from inventory.forecasting import compute_stock_forecasts, forecast_item, rolling_rates
+from inventory.models import InventoryItem, StockForecast, StockMove
+
+
+class RollingRateTests(TestCase):
+    def test_windows_share_one_pass(self):
+        end = timezone.localdate()
+        per_day = {end: 7, end - timedelta(days=10): 30, end - timedelta(days=200): 365}
+
+        rates = rolling_rates(per_day, end)
+
+        self.assertEqual(rates[7], Decimal("1"))
+        self.assertEqual(rates[30], Decimal("37") / 30)
+        self.assertEqual(rates[365], Decimal("402") / 365)
+
+    def test_reorder_suggestion(self):
+        rates = {7: Decimal("2"), 30: Decimal("2"), 90: Decimal("2"), 365: Decimal("2")}
+
+        values = forecast_item(
+            rates, quantity=10, min_stock=4, lead_days=7, cover_days=30
+        )
+
+        self.assertEqual(values["days_until_stockout"], Decimal("5.0"))
+        self.assertEqual(values["reorder_point"], 18)
+        self.assertEqual(values["suggested_qty"], 68)
+
+
+class StockForecastTests(TestCase):
+    def test_forecasts_all_items_in_grouped_queries(self):
+        busy = InventoryItem.objects.create(
+            name="Shampoing", category=InventoryItem.Category.CONSUMABLE, min_stock=2
+        )
+        idle = InventoryItem.objects.create(
+            name="Peigne", category=InventoryItem.Category.SALE
+        )
+        StockMove.objects.create(item=busy, qty=40, type=StockMove.Type.IN)
+        StockMove.objects.create(item=idle, qty=5, type=StockMove.Type.IN)
+        for days_ago in range(5):
+            move = StockMove.objects.create(item=busy, qty=3, type=StockMove.Type.OUT)
+            StockMove.objects.filter(pk=move.pk).update(
+                created_at=timezone.now() - timedelta(days=days_ago)
+            )
+
+        with self.assertNumQueries(4):
+            self.assertEqual(compute_stock_forecasts(), 2)
+
+        forecast = StockForecast.objects.get(item=busy)
+        self.assertEqual(forecast.daily_rate_7, Decimal("2.143"))
+        self.assertGreater(forecast.days_until_stockout, 0)
+        idle_forecast = StockForecast.objects.get(item=idle)
+        self.assertIsNone(idle_forecast.days_until_stockout)
+        self.assertEqual(idle_forecast.suggested_qty, 0)
+
+        compute_stock_forecasts()
+        self.assertEqual(StockForecast.objects.count(), 2)
@@ -1,7 +1,15 @@
+from datetime import timedelta
+from io import StringIO
+
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from inventory.models import InventoryItem, StockLevel, StockMove
+from inventory.models import InventoryItem, StockLevel, StockMove, StockSnapshot
+from inventory.snapshots import stock_as_of, take_stock_snapshot
 
 
 class StockComputationTests(TestCase):
@@ -29,3 +37,85 @@ class StockValidationTests(TestCase):
 
         with self.assertRaises(ValidationError):
             StockMove.objects.create(item=item, qty=1, type=StockMove.Type.OUT)
+
+
+class StockLevelMaintenanceTests(TestCase):
+    def setUp(self):
+        self.item = InventoryItem.objects.create(
+            name="Gel", category=InventoryItem.Category.SALE, min_stock=2
+        )
+        StockMove.objects.create(item=self.item, qty=5, type=StockMove.Type.IN)
+
+    def test_move_does_not_aggregate_ledger(self):
+        with CaptureQueriesContext(connection) as queries:
+            StockMove.objects.create(item=self.item, qty=1, type=StockMove.Type.OUT)
+
+        self.assertFalse([query for query in queries if "SUM(" in query["sql"].upper()])
+        self.assertEqual(StockLevel.objects.get(item=self.item).quantity, 4)
+
+    def test_update_and_delete_apply_deltas(self):
+        move = StockMove.objects.create(item=self.item, qty=3, type=StockMove.Type.OUT)
+        move.qty = 4
+        move.save()
+        self.assertEqual(StockLevel.objects.get(item=self.item).quantity, 1)
+        self.assertTrue(StockLevel.objects.get(item=self.item).alert)
+
+        move.delete()
+        level = StockLevel.objects.get(item=self.item)
+        self.assertEqual(level.quantity, 5)
+        self.assertFalse(level.alert)
+
+    def test_reconcile_repairs_drift(self):
+        StockLevel.objects.filter(item=self.item).update(quantity=42)
+        output = StringIO()
+
+        call_command("reconcile_stock_levels", dry_run=True, stdout=output)
+        self.assertIn("niveau 42, journal 5", output.getvalue())
+        self.assertEqual(StockLevel.objects.get(item=self.item).quantity, 42)
+
+        call_command("reconcile_stock_levels", stdout=StringIO())
+        self.assertEqual(StockLevel.objects.get(item=self.item).quantity, 5)
+
+
+class StockSnapshotTests(TestCase):
+    def setUp(self):
+        self.item = InventoryItem.objects.create(
+            name="Huile", category=InventoryItem.Category.SALE
+        )
+        self.today = timezone.localdate()
+
+    def _move(self, qty, move_type, days_ago):
+        move = StockMove.objects.create(item=self.item, qty=qty, type=move_type)
+        created_at = timezone.now() - timedelta(days=days_ago)
+        StockMove.objects.filter(pk=move.pk).update(created_at=created_at)
+        move.refresh_from_db()
+        return move
+
+    def test_as_of_combines_snapshot_and_later_moves(self):
+        self._move(10, StockMove.Type.IN, days_ago=5)
+        self._move(3, StockMove.Type.OUT, days_ago=3)
+        call_command(
+            "snapshot_stock",
+            date=(self.today - timedelta(days=3)).isoformat(),
+            stdout=StringIO(),
+        )
+        StockSnapshot.objects.filter(item=self.item).update(quantity=100)
+        self._move(2, StockMove.Type.LOSS, days_ago=1)
+
+        self.assertEqual(stock_as_of(self.today - timedelta(days=4))[self.item.pk], 10)
+        # La photo (volontairement faussée) sert de point de départ.
+        self.assertEqual(stock_as_of(self.today)[self.item.pk], 98)
+
+    def test_editing_an_old_move_drops_later_snapshots(self):
+        move = self._move(10, StockMove.Type.IN, days_ago=5)
+        take_stock_snapshot(self.today - timedelta(days=2))
+
+        move.qty = 8
+        move.save()
+
+        self.assertFalse(StockSnapshot.objects.exists())
+        self.assertEqual(stock_as_of(self.today)[self.item.pk], 8)
+
+    def test_open_days_cannot_be_snapshotted(self):
+        with self.assertRaises(ValueError):
+            take_stock_snapshot(self.today)
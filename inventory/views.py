@@ -1,13 +1,63 @@
-from rest_framework import viewsets
+from datetime import date
 
-from inventory.models import InventoryItem, StockMove
-from inventory.serializers import InventoryItemSerializer, StockMoveSerializer
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.response import Response
+
+from inventory import snapshots
+from inventory.bulk import apply_stock_moves, resolve_items
+from inventory.models import InventoryItem, StockForecast, StockMove
+from inventory.serializers import (
+    BulkStockMoveSerializer,
+    InventoryItemSerializer,
+    StockForecastSerializer,
+    StockMoveSerializer,
+)
 
 
 class InventoryItemViewSet(viewsets.ModelViewSet):
-    queryset = InventoryItem.objects.all()
+    queryset = InventoryItem.objects.select_related("stock_level")
     serializer_class = InventoryItemSerializer
 
+    @action(detail=False, methods=["get"])
+    def reorder(self, request):
+        forecasts = (
+            StockForecast.objects.filter(suggested_qty__gt=0)
+            .select_related("item__stock_level")
+            .order_by(F("days_until_stockout").asc(nulls_last=True), "item__name")
+        )
+        serializer = StockForecastSerializer(forecasts, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def stock_as_of(self, request):
+        value = request.query_params.get("date")
+        try:
+            day = date.fromisoformat(value) if value else timezone.localdate()
+        except ValueError as exc:
+            raise DRFValidationError({"date": "Format attendu : AAAA-MM-JJ."}) from exc
+        balances = snapshots.stock_as_of(day)
+        items = InventoryItem.objects.filter(pk__in=balances).order_by("name")
+        return Response(
+            {
+                "date": day.isoformat(),
+                "items": [
+                    {
+                        "id": item.id,
+                        "name": item.name,
+                        "sku": item.sku,
+                        "quantity": balances[item.id],
+                    }
+                    for item in items.only("id", "name", "sku")
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 class StockMoveViewSet(viewsets.ModelViewSet):
     queryset = StockMove.objects.select_related("item", "created_by")
@@ -16,3 +66,24 @@ class StockMoveViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         user = self.request.user if self.request.user.is_authenticated else None
         serializer.save(created_by=user)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        serializer = BulkStockMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        lines = [dict(line) for line in serializer.validated_data["moves"]]
+        resolve_items(lines)
+        user = request.user if request.user.is_authenticated else None
+        try:
+            moves = apply_stock_moves(lines, user=user)
+        except ValidationError as exc:
+            raise DRFValidationError(
+                exc.message_dict if hasattr(exc, "error_dict") else exc.messages
+            ) from exc
+        return Response(
+            {
+                "created": len(moves),
+                "items": len({move.item_id for move in moves}),
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "status", "attempts", "created_by", "created_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", "dedupe_key")
+    ordering = ("-created_at",)
+    readonly_fields = ("locked_at", "locked_by", "result", "error", "finished_at")
@@ -0,0 +1,96 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from jobs.queue import claim_jobs, run_job
+
+
+def _run_in_thread(pk: int) -> None:
+    try:
+        run_job(pk)
+    finally:
+        # Chaque thread du pool ouvre sa propre connexion.
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches de fond en attente (rendus PDF, certificats)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.JOB_WORKER_THREADS,
+            help="Nombre de tâches exécutées en parallèle.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            dest="poll_interval",
+            type=float,
+            default=2.0,
+            help="Attente en secondes lorsque la file est vide.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Vide la file puis s'arrête au lieu d'attendre de nouvelles tâches.",
+        )
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        if threads < 1:
+            raise CommandError("--threads doit être supérieur ou égal à 1.")
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Worker {worker_id} démarré ({threads} threads).")
+        try:
+            if threads == 1:
+                processed = self._run_inline(worker_id, options)
+            else:
+                processed = self._run_pool(worker_id, threads, options)
+        except KeyboardInterrupt:
+            self.stdout.write("Arrêt demandé.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Tâches exécutées : {processed}"))
+
+    def _run_inline(self, worker_id, options) -> int:
+        processed = 0
+        while True:
+            close_old_connections()
+            claimed = claim_jobs(worker_id, 1)
+            for pk in claimed:
+                run_job(pk)
+                processed += 1
+            if not claimed:
+                if options["once"]:
+                    return processed
+                time.sleep(options["poll_interval"])
+
+    def _run_pool(self, worker_id, threads, options) -> int:
+        processed = 0
+        running = set()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            while True:
+                close_old_connections()
+                claimed = claim_jobs(worker_id, threads - len(running))
+                for pk in claimed:
+                    running.add(pool.submit(_run_in_thread, pk))
+                processed += len(claimed)
+                if claimed:
+                    continue
+                if not running and options["once"]:
+                    return processed
+                if running:
+                    done, running = wait(
+                        running,
+                        timeout=options["poll_interval"],
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        future.result()
+                else:
+                    time.sleep(options["poll_interval"])
@@ -0,0 +1,128 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Job",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task", models.CharField(max_length=200, verbose_name="Tâche")),
+                (
+                    "payload",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Paramètres"
+                    ),
+                ),
+                (
+                    "dedupe_key",
+                    models.CharField(
+                        blank=True, max_length=200, verbose_name="Clé de déduplication"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QUEUED", "En attente"),
+                            ("RUNNING", "En cours"),
+                            ("SUCCEEDED", "Terminée"),
+                            ("FAILED", "Échec"),
+                        ],
+                        default="QUEUED",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="Tentatives"),
+                ),
+                (
+                    "max_attempts",
+                    models.PositiveIntegerField(
+                        default=3, verbose_name="Tentatives maximum"
+                    ),
+                ),
+                (
+                    "run_after",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Exécuter après"
+                    ),
+                ),
+                (
+                    "locked_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Prise le"
+                    ),
+                ),
+                (
+                    "locked_by",
+                    models.CharField(blank=True, max_length=100, verbose_name="Worker"),
+                ),
+                (
+                    "result",
+                    models.JSONField(blank=True, null=True, verbose_name="Résultat"),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Erreur")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Créée le"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Mis à jour le"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Terminée le"
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="jobs",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Demandée par",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tâche de fond",
+                "verbose_name_plural": "Tâches de fond",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "run_after"], name="jobs_status_run_idx"
+                    ),
+                    models.Index(
+                        fields=["dedupe_key", "status"], name="jobs_dedupe_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "En attente"
+        RUNNING = "RUNNING", "En cours"
+        SUCCEEDED = "SUCCEEDED", "Terminée"
+        FAILED = "FAILED", "Échec"
+
+    task = models.CharField(max_length=200, verbose_name="Tâche")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Paramètres")
+    dedupe_key = models.CharField(
+        max_length=200, blank=True, verbose_name="Clé de déduplication"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        verbose_name="Statut",
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentatives")
+    max_attempts = models.PositiveIntegerField(
+        default=3, verbose_name="Tentatives maximum"
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now, verbose_name="Exécuter après"
+    )
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="Prise le")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    result = models.JSONField(null=True, blank=True, verbose_name="Résultat")
+    error = models.TextField(blank=True, verbose_name="Erreur")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="jobs",
+        verbose_name="Demandée par",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créée le")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Mis à jour le")
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Terminée le"
+    )
+
+    ACTIVE_STATUSES = (Status.QUEUED, Status.RUNNING)
+
+    class Meta:
+        verbose_name = "Tâche de fond"
+        verbose_name_plural = "Tâches de fond"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="jobs_status_run_idx"),
+            models.Index(fields=["dedupe_key", "status"], name="jobs_dedupe_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk}"
@@ -0,0 +1,132 @@
+import traceback
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.models import Job
+
+# Erreurs qu'une nouvelle tentative ne corrigera pas.
+PERMANENT_ERRORS = (ValidationError, ObjectDoesNotExist, ImportError, TypeError)
+
+
+def task_path(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def enqueue(
+    func: Callable,
+    payload: Optional[dict] = None,
+    *,
+    user=None,
+    dedupe_key: str = "",
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """Met en file l'appel ``func(**payload)``.
+
+    ``func`` doit être une fonction de module et ``payload`` sérialisable en
+    JSON. Avec ``dedupe_key``, une tâche identique encore en attente ou en
+    cours est renvoyée au lieu d'en créer une seconde.
+    """
+    if dedupe_key:
+        existing = Job.objects.filter(
+            dedupe_key=dedupe_key, status__in=Job.ACTIVE_STATUSES
+        ).first()
+        if existing:
+            return existing
+    return Job.objects.create(
+        task=task_path(func),
+        payload=payload or {},
+        dedupe_key=dedupe_key,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        created_by=user if user and user.is_authenticated else None,
+    )
+
+
+def claim_jobs(worker_id: str, limit: int) -> list[int]:
+    """Réserve jusqu'à ``limit`` tâches prêtes pour ``worker_id``.
+
+    La réservation est une mise à jour conditionnelle sur le statut lu : deux
+    workers ne peuvent pas prendre la même tâche, sans verrou de ligne (absent
+    de SQLite). Une tâche restée en cours au-delà de ``JOB_LOCK_TIMEOUT`` est
+    considérée comme abandonnée par un worker arrêté et reprise.
+    """
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    candidates = Job.objects.filter(
+        Q(status=Job.Status.QUEUED, run_after__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_at__lt=stale)
+    ).order_by("run_after", "pk")
+    claimed = []
+    for pk, status, locked_at in candidates.values_list("pk", "status", "locked_at")[
+        : limit * 2
+    ]:
+        updated = Job.objects.filter(pk=pk, status=status, locked_at=locked_at).update(
+            status=Job.Status.RUNNING,
+            locked_at=now,
+            locked_by=worker_id,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if updated:
+            claimed.append(pk)
+            if len(claimed) >= limit:
+                break
+    return claimed
+
+
+def run_job(pk: int) -> Job:
+    """Exécute une tâche réservée et enregistre son issue."""
+    job = Job.objects.get(pk=pk)
+    try:
+        if job.attempts > job.max_attempts:
+            raise RuntimeError("Tâche abandonnée après l'arrêt de son worker.")
+        result = import_string(job.task)(**job.payload)
+    except Exception as exc:  # noqa: BLE001 - l'erreur est consignée sur la tâche
+        _record_failure(job, exc)
+    else:
+        job.status = Job.Status.SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.locked_at = None
+        job.finished_at = timezone.now()
+        job.save(
+            update_fields=[
+                "status",
+                "result",
+                "error",
+                "locked_at",
+                "finished_at",
+                "updated_at",
+            ]
+        )
+    return job
+
+
+def _record_failure(job: Job, exc: Exception) -> None:
+    now = timezone.now()
+    job.error = "".join(traceback.format_exception(exc))[-4000:]
+    job.locked_at = None
+    if isinstance(exc, PERMANENT_ERRORS) or job.attempts >= job.max_attempts:
+        job.status = Job.Status.FAILED
+        job.finished_at = now
+    else:
+        job.status = Job.Status.QUEUED
+        delay = settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+        job.run_after = now + timedelta(seconds=delay)
+    job.save(
+        update_fields=[
+            "status",
+            "error",
+            "locked_at",
+            "run_after",
+            "finished_at",
+            "updated_at",
+        ]
+    )
@@ -0,0 +1,28 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from jobs.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    status_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = (
+            "id",
+            "task",
+            "status",
+            "attempts",
+            "max_attempts",
+            "result",
+            "error",
+            "status_url",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+    def get_status_url(self, obj):
+        return reverse("job-detail", args=[obj.pk])
@@ -0,0 +1,160 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from jobs.models import Job
+from jobs.queue import claim_jobs, enqueue, run_job
+from lms.models import Certificate, Course, Enrollment
+
+CALLS = []
+
+
+def record(value):
+    CALLS.append(value)
+    return {"value": value}
+
+
+def flaky():
+    raise ConnectionError("indisponible")
+
+
+def invalid():
+    raise ValidationError("Paramètres invalides.")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_dedupes_active_jobs(self):
+        first = enqueue(record, {"value": 1}, dedupe_key="record:1")
+        second = enqueue(record, {"value": 1}, dedupe_key="record:1")
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(first.task, "jobs.tests.test_queue.record")
+
+    def test_claim_is_exclusive(self):
+        job = enqueue(record, {"value": 1})
+
+        self.assertEqual(claim_jobs("worker-a", 5), [job.pk])
+        self.assertEqual(claim_jobs("worker-b", 5), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.locked_by, "worker-a")
+
+    def test_run_job_stores_result(self):
+        job = enqueue(record, {"value": 7})
+        claim_jobs("worker", 1)
+
+        job = run_job(job.pk)
+
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {"value": 7})
+        self.assertEqual(CALLS, [7])
+
+    @override_settings(JOB_RETRY_DELAY=0)
+    def test_transient_failure_is_retried_then_failed(self):
+        job = enqueue(flaky, max_attempts=2)
+
+        claim_jobs("worker", 1)
+        job = run_job(job.pk)
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertIn("indisponible", job.error)
+
+        claim_jobs("worker", 1)
+        job = run_job(job.pk)
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_validation_error_is_not_retried(self):
+        job = enqueue(invalid)
+        claim_jobs("worker", 1)
+
+        job = run_job(job.pk)
+
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 1)
+
+    @override_settings(JOB_LOCK_TIMEOUT=60)
+    def test_stale_running_job_is_reclaimed(self):
+        job = enqueue(record, {"value": 1})
+        claim_jobs("crashed", 1)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.assertEqual(claim_jobs("worker", 1), [job.pk])
+
+    def test_run_worker_once_drains_queue(self):
+        enqueue(record, {"value": 1})
+        enqueue(record, {"value": 2})
+        out = StringIO()
+
+        call_command("run_worker", "--once", "--threads", "1", stdout=out)
+
+        self.assertEqual(sorted(CALLS), [1, 2])
+        self.assertIn("Tâches exécutées : 2", out.getvalue())
+
+
+@override_settings(JOB_QUEUE_ENABLED=True)
+class CertificateJobApiTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user_model = get_user_model()
+        self.manager = user_model.objects.create_user(
+            username="manager", password="pass", role="MANAGER"
+        )
+        self.learner = user_model.objects.create_user(
+            username="learner", password="pass", role="STAFF"
+        )
+        self.enrollment = Enrollment.objects.create(
+            user=self.learner,
+            course=Course.objects.create(title="Formation"),
+            status=Enrollment.Status.COMPLETED,
+        )
+
+    def test_issue_certificate_is_queued(self):
+        self.client.force_authenticate(self.manager)
+        url = f"/api/lms/enrollments/{self.enrollment.pk}/issue_certificate/"
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(Certificate.objects.exists())
+        job_id = response.data["id"]
+        self.assertEqual(self.client.post(url).data["id"], job_id)
+
+        claim_jobs("worker", 1)
+        run_job(job_id)
+        status_response = self.client.get(response.data["status_url"])
+
+        self.assertEqual(status_response.data["status"], Job.Status.SUCCEEDED)
+        certificate = Certificate.objects.get(enrollment=self.enrollment)
+        self.assertTrue(certificate.pdf_file)
+        self.assertEqual(
+            status_response.data["result"]["certificate_id"], str(certificate.id)
+        )
+        # Le certificat existe : la requête suivante répond sans passer par la file.
+        self.assertEqual(self.client.post(url).status_code, 201)
+
+    def test_job_status_is_private(self):
+        job = enqueue(record, {"value": 1}, user=self.manager)
+        self.client.force_authenticate(self.learner)
+
+        response = self.client.get(f"/api/jobs/{job.pk}/")
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,22 @@
+from django.http import JsonResponse
+from rest_framework import permissions, viewsets
+
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+
+
+def accepted_response(job: Job) -> JsonResponse:
+    """Réponse 202 des vues classiques qui délèguent leur travail au worker."""
+    return JsonResponse(JobSerializer(job).data, status=202)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role in {"OWNER", "ADMIN", "MANAGER"}:
+            return self.queryset
+        return self.queryset.filter(created_by=user)
@@ -1,7 +1,14 @@
+from django.conf import settings
 from django.contrib import admin
 from django.utils import timezone
 
+from jobs.queue import enqueue
 from lms import models
+from lms.services.certificates import (
+    certifiable_enrollments,
+    issue_certificates,
+    issue_course_certificates_job,
+)
 from lms.services.quiz import compute_score
 
 
@@ -76,6 +83,31 @@ class CourseAdmin(admin.ModelAdmin):
     list_display = ("title", "duration_weeks", "is_active", "updated_at")
     list_filter = ("is_active",)
     search_fields = ("title", "description")
+    actions = ["issue_course_certificates"]
+
+    def issue_course_certificates(self, request, queryset):
+        if request.user.role not in {"OWNER", "ADMIN", "MANAGER"}:
+            return
+        if settings.JOB_QUEUE_ENABLED:
+            for course in queryset:
+                enqueue(
+                    issue_course_certificates_job,
+                    {"course_id": str(course.pk), "created_by_id": request.user.pk},
+                    user=request.user,
+                    dedupe_key=f"course-certificates:{course.pk}",
+                )
+            self.message_user(request, "Émission des certificats mise en file.")
+            return
+        certificates = issue_certificates(
+            certifiable_enrollments().filter(course__in=queryset).select_related("course"),
+            created_by=request.user,
+            workers=1,
+        )
+        self.message_user(request, f"Certificats émis : {len(certificates)}")
+
+    issue_course_certificates.short_description = (
+        "Émettre les certificats des inscriptions terminées"
+    )
 
 
 @admin.register(models.Module)
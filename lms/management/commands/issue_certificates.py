@@ -0,0 +1,35 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.models import Course
+from lms.services.certificates import certifiable_enrollments, issue_certificates
+
+
+class Command(BaseCommand):
+    help = "Émet les certificats de toutes les inscriptions terminées qui n'en ont pas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            help="Slug du cours (tous les cours par défaut).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Processus de rendu en parallèle (nombre de processeurs par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        course = None
+        if options.get("course"):
+            course = Course.objects.filter(slug=options["course"]).first()
+            if course is None:
+                raise CommandError(f"Cours introuvable : {options['course']}")
+        if options.get("workers") is not None and options["workers"] < 1:
+            raise CommandError("--workers doit être supérieur ou égal à 1.")
+
+        enrollments = certifiable_enrollments(course).select_related("course")
+        workers = options.get("workers") or os.cpu_count() or 1
+        certificates = issue_certificates(enrollments, workers=workers)
+        self.stdout.write(self.style.SUCCESS(f"Certificats émis : {len(certificates)}"))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.models import Course
+from lms.services.progress import recompute_course_progress
+
+
+class Command(BaseCommand):
+    help = "Recalcule la progression et la complétion des inscriptions d'un cours."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            help="Slug du cours (tous les cours par défaut).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Compte les inscriptions à corriger sans rien écrire.",
+        )
+
+    def handle(self, *args, **options):
+        courses = Course.objects.order_by("slug")
+        if options.get("course"):
+            courses = courses.filter(slug=options["course"])
+            if not courses.exists():
+                raise CommandError(f"Cours introuvable : {options['course']}")
+
+        total = changed = 0
+        for course in courses:
+            course_total, course_changed = recompute_course_progress(
+                course, dry_run=options["dry_run"]
+            )
+            total += course_total
+            changed += course_changed
+            if course_changed:
+                self.stdout.write(
+                    f"{course.slug} : {course_changed}/{course_total} modifiée(s)"
+                )
+
+        label = "à modifier" if options["dry_run"] else "modifiées"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inscriptions recalculées : {total}, {label} : {changed}"
+            )
+        )
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.models import Quiz
+from lms.services.quiz import regrade_quiz
+
+
+def _shared_cache() -> bool:
+    return not isinstance(caches["default"], LocMemCache)
+
+
+class Command(BaseCommand):
+    help = "Re-note toutes les soumissions d'un quiz après correction de son corrigé."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quiz", required=True, help="Identifiant du quiz.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Soumissions traitées par transaction (500 par défaut).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Affiche les changements sans rien écrire.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size doit être supérieur ou égal à 1.")
+        try:
+            quiz = Quiz.objects.select_related("lesson__module__course").get(
+                pk=options["quiz"]
+            )
+        except (Quiz.DoesNotExist, ValidationError):
+            raise CommandError(f"Quiz introuvable : {options['quiz']}")
+
+        summary = regrade_quiz(
+            quiz, chunk_size=options["chunk_size"], dry_run=options["dry_run"]
+        )
+        self.stdout.write(
+            f"Soumissions : {summary['submissions']}, "
+            f"modifiées : {summary['changed_submissions']}, "
+            f"réponses modifiées : {summary['changed_answers']}"
+        )
+        self.stdout.write(
+            f"Échec → réussite : {summary['now_passed']}, "
+            f"réussite → échec : {summary['now_failed']}"
+        )
+        if not options["dry_run"]:
+            self.stdout.write(
+                f"Progressions mises à jour : {summary['changed_progress']}, "
+                f"inscriptions recalculées : {summary['changed_enrollments']}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Quiz re-noté : {quiz.title}"))
+        if not options["dry_run"] and not _shared_cache():
+            self.stdout.write(
+                self.style.WARNING(
+                    "Cache local au processus : les serveurs web garderont l'ancien "
+                    f"corrigé jusqu'à {settings.QUIZ_ANSWER_KEY_TIMEOUT} s."
+                )
+            )
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lms", "0007_alter_badge_rule_type"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="assignmentsubmission",
+            index=models.Index(
+                fields=["status", "created_at", "id"], name="lms_assignment_queue_idx"
+            ),
+        ),
+    ]
@@ -666,6 +666,9 @@ class AssignmentSubmission(UUIDTimeStampedModel):
         ]
         indexes = [
             models.Index(fields=["status"], name="lms_assignment_status_idx"),
+            models.Index(
+                fields=["status", "created_at", "id"], name="lms_assignment_queue_idx"
+            ),
         ]
 
 
@@ -0,0 +1,80 @@
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Pagination par curseur sur ``(created_at, id)``, du plus ancien au plus récent.
+
+    Chaque page repart de la dernière ligne servie (``WHERE (created_at, id) >
+    curseur``) au lieu d'un ``OFFSET`` : son coût ne dépend pas de la position
+    dans la file.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 25
+    max_page_size = 100
+
+    def _encode(self, item) -> str:
+        payload = json.dumps([item.created_at.isoformat(), str(item.pk)])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode(self, value):
+        try:
+            created_at, pk = json.loads(base64.urlsafe_b64decode(value.encode()))
+            created_at = parse_datetime(created_at)
+            pk = uuid.UUID(pk)
+        except (AttributeError, TypeError, ValueError):
+            created_at = None
+        if created_at is None:
+            raise NotFound("Curseur invalide.")
+        return created_at, pk
+
+    def _page_size(self, request) -> int:
+        try:
+            size = int(
+                request.query_params.get(self.page_size_query_param, self.page_size)
+            )
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        queryset = queryset.order_by("created_at", "pk")
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self._decode(cursor)
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+            )
+        size = self._page_size(request)
+        items = list(queryset[: size + 1])
+        self.next_cursor = self._encode(items[size - 1]) if len(items) > size else None
+        return items[:size]
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
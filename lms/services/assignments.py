@@ -1,3 +1,6 @@
+import hashlib
+import os
+from collections import defaultdict
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
@@ -13,6 +16,11 @@ from lms.models import (
 )
 from lms.services.progress import refresh_enrollment_progress
 
+FILE_FIELDS = {
+    AssignmentKPIEvidence: "proof_file",
+    AssignmentSubmissionAttachment: "image",
+}
+
 
 def _validate_kpi_value(requirement, value: Decimal) -> None:
     if requirement.min_value is not None and value < requirement.min_value:
@@ -25,19 +33,15 @@ def _validate_kpi_value(requirement, value: Decimal) -> None:
         )
 
 
-def validate_kpi_evidence(submission: AssignmentSubmission) -> None:
-    assignment = submission.assignment
+def _check_kpi_evidence(assignment, evidences) -> None:
+    """Contrôle des preuves KPI, en mémoire : aucune écriture n'est nécessaire."""
     if not assignment.requires_kpi_evidence:
         return
-
-    evidence_qs = AssignmentKPIEvidence.objects.filter(submission=submission)
-    if not evidence_qs.exists():
+    if not evidences:
         raise ValidationError({"kpi": "Aucune preuve KPI fournie."})
 
-    required_requirements = assignment.kpi_requirements.filter(is_required=True)
-    evidence_by_req = {e.requirement_id: e for e in evidence_qs}
-
-    for requirement in required_requirements:
+    evidence_by_req = {e.requirement_id: e for e in evidences}
+    for requirement in assignment.kpi_requirements.filter(is_required=True):
         evidence = evidence_by_req.get(requirement.id)
         if not evidence:
             raise ValidationError(
@@ -50,7 +54,117 @@ def validate_kpi_evidence(submission: AssignmentSubmission) -> None:
         _validate_kpi_value(requirement, evidence.value)
 
 
-@transaction.atomic
+def validate_kpi_evidence(submission: AssignmentSubmission) -> None:
+    _check_kpi_evidence(
+        submission.assignment,
+        list(AssignmentKPIEvidence.objects.filter(submission=submission)),
+    )
+
+
+def _file_size(field_file):
+    try:
+        return field_file.size
+    except (OSError, ValueError):
+        return None
+
+
+def _evidence_key(evidence):
+    return (
+        evidence.requirement_id,
+        evidence.value,
+        evidence.proof_url,
+        evidence.proof_file.name or "",
+        evidence.notes,
+        evidence.crm_client_id,
+        evidence.activity_id,
+    )
+
+
+def _file_digest(field_file):
+    """Empreinte SHA-256 du contenu, lu par morceaux ; ``None`` si illisible."""
+    digest = hashlib.sha256()
+    try:
+        if field_file._committed:
+            with field_file.open("rb") as handle:
+                for chunk in handle.chunks():
+                    digest.update(chunk)
+        else:
+            upload = field_file.file
+            for chunk in upload.chunks():
+                digest.update(chunk)
+            upload.seek(0)
+    except (OSError, ValueError):
+        return None
+    return digest.hexdigest()
+
+
+def _attachment_name_size(attachment):
+    image = attachment.image
+    if image._committed:
+        return os.path.basename(image.name), _file_size(image)
+    return image.storage.get_valid_name(os.path.basename(image.name)), image.size
+
+
+def _attachment_key_for(wanted):
+    """Clé des pièces jointes : nom, taille, puis empreinte du contenu.
+
+    Un navigateur mobile envoie souvent ``image.jpg`` et des formats à taille
+    fixe donnent des tailles égales : seul le contenu dit si la photo est
+    inchangée. Il n'est lu que pour les fichiers stockés dont le nom et la
+    taille correspondent à un envoi.
+    """
+    candidates = {_attachment_name_size(attachment) for attachment in wanted}
+
+    def key(attachment):
+        name_size = _attachment_name_size(attachment)
+        if name_size not in candidates:
+            return name_size
+        digest = _file_digest(attachment.image)
+        # Un fichier illisible ne correspond à rien : il est remplacé.
+        return (*name_size, digest) if digest else object()
+
+    return key
+
+
+def _link_key(link):
+    return link.url
+
+
+def _kpi_key(kpi):
+    return kpi.label, kpi.value, kpi.unit
+
+
+def _diff_children(existing, wanted, key) -> tuple[list, list]:
+    """Lignes à supprimer et à créer pour passer de ``existing`` à ``wanted``.
+
+    Les enfants identiques (selon ``key``) sont conservés tels quels, doublons
+    compris.
+    """
+    kept = defaultdict(list)
+    for child in existing:
+        kept[key(child)].append(child)
+    to_create = []
+    for child in wanted:
+        matches = kept.get(key(child))
+        if matches:
+            matches.pop()
+        else:
+            to_create.append(child)
+    to_delete = [child for children in kept.values() for child in children]
+    return to_delete, to_create
+
+
+def _store_files(children, field_name) -> list:
+    """Écrit les fichiers reçus avant d'ouvrir la transaction."""
+    stored = []
+    for child in children:
+        field_file = getattr(child, field_name)
+        if field_file and not field_file._committed:
+            field_file.save(field_file.name, field_file.file, save=False)
+            stored.append(field_file)
+    return stored
+
+
 def submit_assignment(
     enrollment,
     assignment,
@@ -60,23 +174,17 @@ def submit_assignment(
     proof_links: list[str] | None = None,
     kpis: list[dict] | None = None,
 ) -> AssignmentSubmission:
-    submission, _ = AssignmentSubmission.objects.update_or_create(
-        enrollment=enrollment,
-        assignment=assignment,
-        defaults={
-            "response_text": response_text,
-            "status": AssignmentSubmission.Status.SUBMITTED,
-            "feedback": "",
-            "reviewed_at": None,
-            "reviewed_by": None,
-        },
-    )
+    """Enregistre la soumission et ses quatre collections enfants.
 
+    La validation porte sur les données reçues, avant toute écriture. Chaque
+    collection fournie est comparée à l'existant : les enfants inchangés sont
+    conservés, les autres supprimés ou insérés par ``bulk_create``. Les
+    fichiers sont stockés hors transaction pour ne pas bloquer la base.
+    """
+    collections = {}
     if evidence_payloads is not None:
-        AssignmentKPIEvidence.objects.filter(submission=submission).delete()
-        for payload in evidence_payloads:
-            AssignmentKPIEvidence.objects.create(
-                submission=submission,
+        collections[AssignmentKPIEvidence] = [
+            AssignmentKPIEvidence(
                 requirement=payload.get("requirement"),
                 value=payload.get("value"),
                 proof_url=payload.get("proof_url", ""),
@@ -85,35 +193,83 @@ def submit_assignment(
                 crm_client=payload.get("crm_client"),
                 activity=payload.get("activity"),
             )
-
+            for payload in evidence_payloads
+        ]
     if attachments is not None:
-        AssignmentSubmissionAttachment.objects.filter(submission=submission).delete()
-        for attachment in attachments:
-            if not attachment:
-                continue
-            AssignmentSubmissionAttachment.objects.create(
-                submission=submission,
-                image=attachment,
-            )
-
+        collections[AssignmentSubmissionAttachment] = [
+            AssignmentSubmissionAttachment(image=attachment)
+            for attachment in attachments
+            if attachment
+        ]
     if proof_links is not None:
-        AssignmentSubmissionLink.objects.filter(submission=submission).delete()
-        for link in proof_links:
-            if not link:
-                continue
-            AssignmentSubmissionLink.objects.create(submission=submission, url=link)
-
+        collections[AssignmentSubmissionLink] = [
+            AssignmentSubmissionLink(url=link) for link in proof_links if link
+        ]
     if kpis is not None:
-        AssignmentSubmissionKPI.objects.filter(submission=submission).delete()
-        for kpi in kpis:
-            AssignmentSubmissionKPI.objects.create(
-                submission=submission,
+        collections[AssignmentSubmissionKPI] = [
+            AssignmentSubmissionKPI(
                 label=kpi.get("label", ""),
                 value=kpi.get("value"),
                 unit=kpi.get("unit", ""),
             )
+            for kpi in kpis
+        ]
+
+    current = AssignmentSubmission.objects.filter(
+        enrollment=enrollment, assignment=assignment
+    ).first()
+
+    def existing(model):
+        if current is None:
+            return []
+        return list(model.objects.filter(submission=current))
 
-    validate_kpi_evidence(submission)
+    if AssignmentKPIEvidence in collections:
+        _check_kpi_evidence(assignment, collections[AssignmentKPIEvidence])
+    elif assignment.requires_kpi_evidence:
+        _check_kpi_evidence(assignment, existing(AssignmentKPIEvidence))
+
+    keys = {
+        AssignmentKPIEvidence: _evidence_key,
+        AssignmentSubmissionAttachment: _attachment_key_for(
+            collections.get(AssignmentSubmissionAttachment, [])
+        ),
+        AssignmentSubmissionLink: _link_key,
+        AssignmentSubmissionKPI: _kpi_key,
+    }
+    changes = {
+        model: _diff_children(existing(model), wanted, keys[model])
+        for model, wanted in collections.items()
+    }
+    stored = []
+    try:
+        for model, field_name in FILE_FIELDS.items():
+            if model in changes:
+                stored += _store_files(changes[model][1], field_name)
+        with transaction.atomic():
+            submission, _ = AssignmentSubmission.objects.update_or_create(
+                enrollment=enrollment,
+                assignment=assignment,
+                defaults={
+                    "response_text": response_text,
+                    "status": AssignmentSubmission.Status.SUBMITTED,
+                    "feedback": "",
+                    "reviewed_at": None,
+                    "reviewed_by": None,
+                },
+            )
+            for model, (to_delete, to_create) in changes.items():
+                if to_delete:
+                    model.objects.filter(
+                        pk__in=[child.pk for child in to_delete]
+                    ).delete()
+                for child in to_create:
+                    child.submission = submission
+                model.objects.bulk_create(to_create)
+    except Exception:
+        for field_file in stored:
+            field_file.storage.delete(field_file.name)
+        raise
     return submission
 
 
@@ -1,111 +1,193 @@
+from collections import defaultdict
 from decimal import Decimal
 
 from django.db import transaction
-from django.db.models import Q, Sum
+from django.db.models import F, FloatField, Max, Sum
+from django.db.models.functions import Cast
 
 from lms.models import (
-    Assignment,
     AssignmentKPIEvidence,
     AssignmentSubmission,
     Badge,
     BadgeAward,
-    Quiz,
     QuizAttempt,
 )
-from lms.services.progress import is_module_completed
+from lms.services.progress import EnrollmentProgress
 
+PERCENT_PRECISION = Decimal("0.000001")
 
-def _best_quiz_percent_for_scope(enrollment, quizzes) -> Decimal:
-    best_percent = Decimal("0.00")
-    for quiz in quizzes:
-        attempts = QuizAttempt.objects.filter(enrollment=enrollment, quiz=quiz)
-        for attempt in attempts:
-            if attempt.max_score:
-                percent = (attempt.score / attempt.max_score) * 100
-                if percent > best_percent:
-                    best_percent = percent
-    return best_percent
 
+def _badge_scope(badge):
+    """Clé d'index d'un badge : sa règle et la portée la plus précise renseignée."""
+    rule = badge.rule_type
+    if rule == Badge.RuleType.ASSIGNMENT_APPROVED:
+        if badge.assignment_id:
+            return rule, "assignment", badge.assignment_id
+        if badge.module_id:
+            return rule, "module", badge.module_id
+        if badge.course_id:
+            return rule, "course", badge.course_id
+        return None
+    if rule == Badge.RuleType.QUIZ_SCORE:
+        if badge.module_id:
+            return rule, "module", badge.module_id
+        return rule, "course", badge.course_id
+    if rule == Badge.RuleType.MODULE_COMPLETED:
+        return (rule, "module", badge.module_id) if badge.module_id else None
+    if rule == Badge.RuleType.COURSE_COMPLETED:
+        return rule, "course", badge.course_id
+    if rule == Badge.RuleType.KPI_TARGET:
+        return rule, "kpi", (badge.kpi_label or "").lower()
+    return None
 
-def _kpi_total_for_label(enrollment, label: str) -> Decimal:
-    if not label:
-        return Decimal("0.00")
-    total = (
+
+def _index_badges():
+    index = defaultdict(list)
+    for badge in Badge.objects.filter(is_active=True).select_related("module"):
+        key = _badge_scope(badge)
+        if key is not None:
+            index[key].append(badge)
+    return index
+
+
+def _best_quiz_percents(enrollment) -> dict:
+    """Meilleur pourcentage par module et par cours, en une requête groupée par quiz."""
+    percent = Cast("score", FloatField()) * 100 / Cast("max_score", FloatField())
+    best = {}
+    for row in (
+        QuizAttempt.objects.filter(enrollment=enrollment, max_score__gt=0)
+        .values(
+            "quiz_id",
+            module=F("quiz__module_id"),
+            lesson_module=F("quiz__lesson__module_id"),
+            course=F("quiz__module__course_id"),
+            lesson_course=F("quiz__lesson__module__course_id"),
+        )
+        .annotate(best=Max(percent))
+    ):
+        value = Decimal(row["best"]).quantize(PERCENT_PRECISION)
+        scopes = {("module", row["module"]), ("module", row["lesson_module"])}
+        scopes |= {("course", row["course"]), ("course", row["lesson_course"])}
+        for scope in scopes:
+            if scope[1] is not None and value > best.get(scope, Decimal("0.00")):
+                best[scope] = value
+    return best
+
+
+def _approved_scopes(enrollment) -> tuple[set, set]:
+    """Devoirs validés de l'inscription et portées (devoir, module, cours) couvertes."""
+    assignment_ids = set()
+    scopes = set()
+    for assignment_id, *parents in (
+        AssignmentSubmission.objects.filter(
+            enrollment=enrollment, status=AssignmentSubmission.Status.APPROVED
+        )
+        .values_list(
+            "assignment_id",
+            "assignment__module_id",
+            "assignment__lesson__module_id",
+            "assignment__module__course_id",
+            "assignment__lesson__module__course_id",
+        )
+        .distinct()
+    ):
+        assignment_ids.add(assignment_id)
+        scopes.add(("assignment", assignment_id))
+        module_id, lesson_module_id, course_id, lesson_course_id = parents
+        scopes |= {("module", module_id), ("module", lesson_module_id)}
+        scopes |= {("course", course_id), ("course", lesson_course_id)}
+    return assignment_ids, {scope for scope in scopes if scope[1] is not None}
+
+
+def _kpi_totals(enrollment) -> dict:
+    totals = defaultdict(Decimal)
+    for label, total in (
         AssignmentKPIEvidence.objects.filter(
-            submission__enrollment=enrollment,
-            requirement__label__iexact=label,
+            submission__enrollment=enrollment, requirement__isnull=False
         )
-        .aggregate(total=Sum("value"))
-        .get("total")
-    )
-    return Decimal(total or 0)
+        .values("requirement__label")
+        .annotate(total=Sum("value"))
+        .values_list("requirement__label", "total")
+    ):
+        totals[label.lower()] += Decimal(total or 0)
+    return totals
 
 
 @transaction.atomic
 def award_badges_for_enrollment(enrollment) -> list[BadgeAward]:
-    awards = []
-    for badge in Badge.objects.filter(is_active=True):
-        should_award = False
-
-        if badge.rule_type == Badge.RuleType.COURSE_COMPLETED:
-            if enrollment.status == enrollment.Status.COMPLETED and (
-                not badge.course or badge.course_id == enrollment.course_id
-            ):
-                should_award = True
-
-        elif badge.rule_type == Badge.RuleType.MODULE_COMPLETED:
-            module = badge.module
-            if module and module.course_id == enrollment.course_id:
-                should_award = is_module_completed(enrollment, module)
-
-        elif badge.rule_type == Badge.RuleType.QUIZ_SCORE:
-            if badge.module:
-                quizzes = Quiz.objects.filter(
-                    Q(module=badge.module) | Q(lesson__module=badge.module)
-                )
-            else:
-                course_id = badge.course_id or enrollment.course_id
-                quizzes = Quiz.objects.filter(
-                    Q(module__course_id=course_id)
-                    | Q(lesson__module__course_id=course_id)
-                )
-            best_percent = _best_quiz_percent_for_scope(enrollment, quizzes)
-            if best_percent >= badge.min_score:
-                should_award = True
-
-        elif badge.rule_type == Badge.RuleType.KPI_TARGET:
-            total = _kpi_total_for_label(enrollment, badge.kpi_label)
-            if badge.kpi_min_value is not None and total >= badge.kpi_min_value:
-                should_award = True
-        elif badge.rule_type == Badge.RuleType.ASSIGNMENT_APPROVED:
-            if badge.assignment:
-                should_award = AssignmentSubmission.objects.filter(
-                    enrollment=enrollment,
-                    assignment=badge.assignment,
-                    status=AssignmentSubmission.Status.APPROVED,
-                ).exists()
-            else:
-                assignments = Assignment.objects.none()
-                if badge.module:
-                    assignments = Assignment.objects.filter(
-                        Q(module=badge.module) | Q(lesson__module=badge.module)
-                    )
-                elif badge.course:
-                    assignments = Assignment.objects.filter(
-                        Q(module__course=badge.course)
-                        | Q(lesson__module__course=badge.course)
-                    )
-                if assignments.exists():
-                    should_award = AssignmentSubmission.objects.filter(
-                        enrollment=enrollment,
-                        assignment__in=assignments,
-                        status=AssignmentSubmission.Status.APPROVED,
-                    ).exists()
-
-        if should_award:
-            award, _ = BadgeAward.objects.get_or_create(
-                badge=badge, user=enrollment.user, defaults={"enrollment": enrollment}
+    """Attribue les badges dont la règle est satisfaite par l'inscription.
+
+    Les badges sont indexés par règle et portée, puis confrontés aux faits de
+    l'inscription lus en quelques agrégats : le nombre de requêtes ne dépend ni
+    du nombre de badges ni du nombre de quiz.
+    """
+    index = _index_badges()
+    if not index:
+        return []
+    rules = {key[0] for key in index}
+    earned = []
+
+    if Badge.RuleType.COURSE_COMPLETED in rules and (
+        enrollment.status == enrollment.Status.COMPLETED
+    ):
+        for course_id in (None, enrollment.course_id):
+            earned += index.get(
+                (Badge.RuleType.COURSE_COMPLETED, "course", course_id), []
+            )
+
+    approved_ids = None
+    if rules & {Badge.RuleType.ASSIGNMENT_APPROVED, Badge.RuleType.MODULE_COMPLETED}:
+        approved_ids, approved_scopes = _approved_scopes(enrollment)
+        for kind, object_id in approved_scopes:
+            earned += index.get(
+                (Badge.RuleType.ASSIGNMENT_APPROVED, kind, object_id), []
             )
-            awards.append(award)
 
-    return awards
+    module_badges = [
+        badges
+        for (rule, _, _), badges in index.items()
+        if rule == Badge.RuleType.MODULE_COMPLETED
+        and badges[0].module.course_id == enrollment.course_id
+    ]
+    if module_badges:
+        state = EnrollmentProgress(enrollment, approved_assignments=approved_ids)
+        for badges in module_badges:
+            if state.module_completed(badges[0].module_id):
+                earned += badges
+
+    if Badge.RuleType.QUIZ_SCORE in rules:
+        best = _best_quiz_percents(enrollment)
+        for (rule, kind, object_id), badges in index.items():
+            if rule != Badge.RuleType.QUIZ_SCORE:
+                continue
+            if kind == "course" and object_id is None:
+                object_id = enrollment.course_id
+            percent = best.get((kind, object_id), Decimal("0.00"))
+            earned += [badge for badge in badges if percent >= badge.min_score]
+
+    if Badge.RuleType.KPI_TARGET in rules:
+        totals = _kpi_totals(enrollment)
+        for (rule, _, label), badges in index.items():
+            if rule != Badge.RuleType.KPI_TARGET:
+                continue
+            total = totals.get(label, Decimal("0.00")) if label else Decimal("0.00")
+            earned += [
+                badge
+                for badge in badges
+                if badge.kpi_min_value is not None and total >= badge.kpi_min_value
+            ]
+
+    if not earned:
+        return []
+    BadgeAward.objects.bulk_create(
+        [
+            BadgeAward(badge=badge, user=enrollment.user, enrollment=enrollment)
+            for badge in earned
+        ],
+        ignore_conflicts=True,
+    )
+    return list(
+        BadgeAward.objects.filter(
+            user=enrollment.user, badge__in=earned
+        ).select_related("badge")
+    )
@@ -1,16 +1,19 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
+from django.db.models import Q
 from django.utils import timezone
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-import qrcode
 
-from lms.models import Certificate
+from floxy.pdf import draw_qr_code, load_image
+from lms.models import Certificate, Enrollment
 
 
 def _build_certificate_number(enrollment) -> str:
@@ -28,57 +31,91 @@ def _build_verification_url(certificate) -> str:
     return f"{base}/api/lms/certificates/verify/{certificate.id}/"
 
 
-def _render_pdf(enrollment, certificate) -> bytes:
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
+def _draw_template(c, width, height, logo_path) -> None:
+    """Partie fixe de la page : titres et logo (décodé une fois par processus)."""
     c.setFont("Helvetica-Bold", 20)
     c.drawCentredString(width / 2, height - 3 * cm, "Certificat de réussite")
 
-    if getattr(settings, "FLOXY_LOGO_PATH", None):
-        try:
-            c.drawImage(settings.FLOXY_LOGO_PATH, 2 * cm, height - 4 * cm, width=3 * cm, preserveAspectRatio=True)
-        except Exception:
-            pass
+    logo = load_image(logo_path) if logo_path else None
+    if logo is not None:
+        c.drawImage(logo, 2 * cm, height - 4 * cm, width=3 * cm, preserveAspectRatio=True)
 
     c.setFont("Helvetica", 12)
     c.drawCentredString(width / 2, height - 5 * cm, "Cette attestation certifie que")
+    c.drawCentredString(width / 2, height - 8 * cm, "a complété le cours")
 
-    full_name = enrollment.user.get_full_name() or enrollment.user.username
-    c.setFont("Helvetica-Bold", 16)
-    c.drawCentredString(width / 2, height - 6.5 * cm, full_name)
 
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width / 2, height - 8 * cm, "a complété le cours")
+def render_certificate_pdf(context: dict) -> bytes:
+    """Génère le PDF à partir de valeurs simples, sans accès à la base.
+
+    Sérialisable tel quel, ``context`` peut être rendu dans un autre processus.
+    """
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    _draw_template(c, width, height, context["logo_path"])
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawCentredString(width / 2, height - 6.5 * cm, context["full_name"])
 
     c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(width / 2, height - 9.5 * cm, enrollment.course.title)
+    c.drawCentredString(width / 2, height - 9.5 * cm, context["course_title"])
 
     c.setFont("Helvetica", 10)
-    c.drawString(2 * cm, 2 * cm, f"Date: {timezone.now().strftime('%d/%m/%Y')}")
-    c.drawString(2 * cm, 1.3 * cm, f"Certificat: {certificate.certificate_number}")
-
-    verify_url = _build_verification_url(certificate)
-    qr = qrcode.QRCode(box_size=2, border=1)
-    qr.add_data(verify_url)
-    qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-    qr_buffer = BytesIO()
-    qr_img.save(qr_buffer, format="PNG")
-    qr_buffer.seek(0)
-    qr_reader = ImageReader(qr_buffer)
-    c.drawImage(qr_reader, width - 5 * cm, 1.5 * cm, width=3 * cm, height=3 * cm)
+    c.drawString(2 * cm, 2 * cm, f"Date: {context['issued_on']}")
+    c.drawString(2 * cm, 1.3 * cm, f"Certificat: {context['certificate_number']}")
+
+    draw_qr_code(c, context["verify_url"], width - 5 * cm, 1.5 * cm, 3 * cm)
 
     c.showPage()
     c.save()
     return buffer.getvalue()
 
 
-def issue_certificate(enrollment, created_by=None) -> Certificate:
+def _pdf_context(enrollment, certificate) -> dict:
+    issued_at = timezone.localtime(certificate.issued_at or timezone.now())
+    return {
+        "full_name": enrollment.user.get_full_name() or enrollment.user.username,
+        "course_title": enrollment.course.title,
+        "issued_on": issued_at.strftime("%d/%m/%Y"),
+        "certificate_number": certificate.certificate_number,
+        "verify_url": _build_verification_url(certificate),
+        "logo_path": getattr(settings, "FLOXY_LOGO_PATH", "") or "",
+    }
+
+
+def _render_pdf(enrollment, certificate) -> bytes:
+    return render_certificate_pdf(_pdf_context(enrollment, certificate))
+
+
+def render_certificate_pdfs(contexts: list[dict], workers: int = 1) -> list[bytes]:
+    """Rend une série de certificats, en parallèle si ``workers`` le demande.
+
+    reportlab est limité par le processeur : des threads ne servent à rien. Les
+    processus sont créés par ``fork`` pour hériter de Django déjà configuré ; à
+    défaut (Windows), ou pour un seul certificat, le rendu reste séquentiel.
+    Forker un processus multithread (serveur web, worker de la file) peut copier
+    des verrous tenus et des connexions ouvertes : seule la commande
+    ``issue_certificates`` demande plusieurs processus.
+    """
+    workers = min(workers or 1, len(contexts))
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return [render_certificate_pdf(context) for context in contexts]
+    chunksize = max(1, len(contexts) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("fork")
+    ) as pool:
+        return list(pool.map(render_certificate_pdf, contexts, chunksize=chunksize))
+
+
+def ensure_certifiable(enrollment) -> None:
     if enrollment.status != enrollment.Status.COMPLETED:
         raise ValidationError("L'inscription doit être terminée pour émettre un certificat.")
 
+
+def issue_certificate(enrollment, created_by=None) -> Certificate:
+    ensure_certifiable(enrollment)
+
     certificate_number = _build_certificate_number(enrollment)
     certificate, _ = Certificate.objects.get_or_create(
         enrollment=enrollment,
@@ -95,3 +132,83 @@ def issue_certificate(enrollment, created_by=None) -> Certificate:
         certificate.pdf_file.save(filename, ContentFile(pdf_bytes), save=True)
 
     return certificate
+
+
+def issue_certificate_job(enrollment_id, created_by_id=None) -> dict:
+    """Point d'entrée du worker : émet le certificat hors de la requête HTTP."""
+    enrollment = Enrollment.objects.select_related("user", "course").get(pk=enrollment_id)
+    created_by = (
+        get_user_model().objects.filter(pk=created_by_id).first() if created_by_id else None
+    )
+    certificate = issue_certificate(enrollment, created_by=created_by)
+    return {
+        "certificate_id": str(certificate.id),
+        "certificate_number": certificate.certificate_number,
+    }
+
+
+def certifiable_enrollments(course=None):
+    """Inscriptions terminées sans certificat, ou dont le PDF manque."""
+    enrollments = Enrollment.objects.filter(status=Enrollment.Status.COMPLETED).filter(
+        Q(certificate__isnull=True)
+        | Q(certificate__pdf_file="")
+        | Q(certificate__pdf_file__isnull=True)
+    )
+    if course is not None:
+        enrollments = enrollments.filter(course=course)
+    return enrollments
+
+
+def issue_certificates(enrollments, created_by=None, workers: int = 1) -> list[Certificate]:
+    """Émet les certificats d'une cohorte : une insertion groupée, un rendu groupé.
+
+    Les inscriptions non terminées sont ignorées ; un certificat déjà émis sans
+    PDF est complété plutôt que dupliqué.
+    """
+    enrollments = [
+        enrollment
+        for enrollment in enrollments
+        if enrollment.status == Enrollment.Status.COMPLETED
+    ]
+    if not enrollments:
+        return []
+    now = timezone.now()
+    Certificate.objects.bulk_create(
+        [
+            Certificate(
+                enrollment=enrollment,
+                certificate_number=_build_certificate_number(enrollment),
+                issued_at=now,
+                created_by=created_by,
+            )
+            for enrollment in enrollments
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    pending = list(
+        Certificate.objects.filter(enrollment__in=enrollments)
+        .filter(Q(pdf_file="") | Q(pdf_file__isnull=True))
+        .select_related("enrollment__user", "enrollment__course")
+    )
+    rendered = render_certificate_pdfs(
+        [_pdf_context(certificate.enrollment, certificate) for certificate in pending],
+        workers=workers,
+    )
+    for certificate, pdf_bytes in zip(pending, rendered):
+        filename = f"certificate-{certificate.certificate_number}.pdf"
+        certificate.pdf_file.save(filename, ContentFile(pdf_bytes), save=False)
+        certificate.updated_at = now
+    Certificate.objects.bulk_update(pending, ["pdf_file", "updated_at"], batch_size=500)
+    return pending
+
+
+def issue_course_certificates_job(course_id, created_by_id=None) -> dict:
+    """Point d'entrée du worker pour l'émission groupée d'un cours."""
+    created_by = (
+        get_user_model().objects.filter(pk=created_by_id).first() if created_by_id else None
+    )
+    certificates = issue_certificates(
+        certifiable_enrollments().filter(course_id=course_id), created_by=created_by
+    )
+    return {"issued": len(certificates)}
@@ -1,11 +1,13 @@
+from collections import defaultdict
 from decimal import Decimal
 
-from django.db.models import Q
+from django.db.models import Count, Exists, OuterRef, Q
 from django.utils import timezone
 
 from lms.models import (
     Assignment,
     AssignmentSubmission,
+    Enrollment,
     Lesson,
     Module,
     Progress,
@@ -14,20 +16,177 @@ from lms.models import (
 )
 
 
-def _required_quizzes(lesson: Lesson):
-    return Quiz.objects.filter(lesson=lesson, is_required_for_completion=True)
+class CourseStructure:
+    """Modules, leçons, quiz requis et devoirs d'un cours, en quatre requêtes.
 
+    Commune à toutes les inscriptions du cours, elle est chargée une seule fois
+    lors d'un recalcul de cohorte.
+    """
 
-def _lesson_quiz_passed(enrollment, lesson: Lesson) -> bool:
-    required_quizzes = list(_required_quizzes(lesson))
-    if not required_quizzes:
-        return True
-    for quiz in required_quizzes:
-        if not Submission.objects.filter(
-            enrollment=enrollment, quiz=quiz, passed=True
-        ).exists():
+    def __init__(self, course_id):
+        self.module_ids = list(
+            Module.objects.filter(course_id=course_id).values_list("pk", flat=True)
+        )
+        self.lessons_by_module = defaultdict(set)
+        for lesson_id, module_id in Lesson.objects.filter(
+            module__course_id=course_id
+        ).values_list("pk", "module_id"):
+            self.lessons_by_module[module_id].add(lesson_id)
+
+        self.required_quizzes = defaultdict(set)
+        for quiz_id, lesson_id in Quiz.objects.filter(
+            lesson__module__course_id=course_id, is_required_for_completion=True
+        ).values_list("pk", "lesson_id"):
+            self.required_quizzes[lesson_id].add(quiz_id)
+
+        self.assignments_by_module = defaultdict(set)
+        self.final_assignments = set()
+        for assignment_id, module_id, lesson_module_id, is_final in Assignment.objects.filter(
+            Q(module__course_id=course_id) | Q(lesson__module__course_id=course_id)
+        ).values_list("pk", "module_id", "lesson__module_id", "is_final_assessment"):
+            for scope in {module_id, lesson_module_id} - {None}:
+                self.assignments_by_module[scope].add(assignment_id)
+            if is_final:
+                self.final_assignments.add(assignment_id)
+
+        self.total_lessons = sum(len(lessons) for lessons in self.lessons_by_module.values())
+
+
+def _completed_by_module(progress_rows) -> dict:
+    """Leçons terminées par (inscription, module), en un GROUP BY."""
+    counts = defaultdict(dict)
+    for enrollment_id, module_id, total in (
+        progress_rows.filter(completed=True)
+        .values("enrollment_id", "lesson__module_id")
+        .annotate(total=Count("pk"))
+        .values_list("enrollment_id", "lesson__module_id", "total")
+    ):
+        counts[enrollment_id][module_id] = total
+    return counts
+
+
+def _grouped_ids(rows) -> dict:
+    grouped = defaultdict(set)
+    for owner_id, item_id in rows:
+        grouped[owner_id].add(item_id)
+    return grouped
+
+
+class EnrollmentProgress:
+    """Progression d'une inscription évaluée en mémoire.
+
+    La structure du cours et les faits de l'inscription (leçons terminées par
+    module, quiz réussis, devoirs validés) sont chargés en sept requêtes, quel
+    que soit le nombre de modules ; les règles de complétion ne font ensuite
+    plus d'accès à la base. ``for_course`` charge les faits de toute une cohorte
+    avec le même nombre de requêtes.
+    """
+
+    def __init__(
+        self,
+        enrollment,
+        structure=None,
+        completed_by_module=None,
+        passed_quizzes=None,
+        approved_assignments=None,
+    ):
+        course_id = enrollment.course_id
+        self.structure = structure or CourseStructure(course_id)
+        if completed_by_module is None:
+            completed_by_module = _completed_by_module(
+                Progress.objects.filter(
+                    enrollment=enrollment, lesson__module__course_id=course_id
+                )
+            )[enrollment.pk]
+        if passed_quizzes is None:
+            passed_quizzes = set(
+                Submission.objects.filter(enrollment=enrollment, passed=True).values_list(
+                    "quiz_id", flat=True
+                )
+            )
+        if approved_assignments is None:
+            approved_assignments = set(
+                AssignmentSubmission.objects.filter(
+                    enrollment=enrollment, status=AssignmentSubmission.Status.APPROVED
+                ).values_list("assignment_id", flat=True)
+            )
+        self.completed_by_module = completed_by_module
+        self.passed_quizzes = passed_quizzes
+        self.approved_assignments = approved_assignments
+
+    @classmethod
+    def for_course(cls, course_id, enrollments) -> dict:
+        """Progression de chaque inscription du cours, indexée par identifiant."""
+        structure = CourseStructure(course_id)
+        completed = _completed_by_module(
+            Progress.objects.filter(
+                enrollment__course_id=course_id, lesson__module__course_id=course_id
+            )
+        )
+        passed = _grouped_ids(
+            Submission.objects.filter(enrollment__course_id=course_id, passed=True)
+            .values_list("enrollment_id", "quiz_id")
+            .distinct()
+        )
+        approved = _grouped_ids(
+            AssignmentSubmission.objects.filter(
+                enrollment__course_id=course_id,
+                status=AssignmentSubmission.Status.APPROVED,
+            )
+            .values_list("enrollment_id", "assignment_id")
+            .distinct()
+        )
+        return {
+            enrollment.pk: cls(
+                enrollment,
+                structure=structure,
+                completed_by_module=completed.get(enrollment.pk, {}),
+                passed_quizzes=passed.get(enrollment.pk, set()),
+                approved_assignments=approved.get(enrollment.pk, set()),
+            )
+            for enrollment in enrollments
+        }
+
+    @property
+    def total_lessons(self) -> int:
+        return self.structure.total_lessons
+
+    @property
+    def completed_lesson_count(self) -> int:
+        return sum(self.completed_by_module.values())
+
+    def progress_percent(self) -> Decimal:
+        if not self.total_lessons:
+            return Decimal("0.00")
+        percent = Decimal(self.completed_lesson_count) / Decimal(self.total_lessons) * 100
+        return percent.quantize(Decimal("0.01"))
+
+    def lesson_quiz_passed(self, lesson_id) -> bool:
+        return self.structure.required_quizzes[lesson_id] <= self.passed_quizzes
+
+    def module_completed(self, module_id) -> bool:
+        lessons = self.structure.lessons_by_module[module_id]
+        if not lessons or self.completed_by_module.get(module_id, 0) < len(lessons):
             return False
-    return True
+        return bool(self.structure.assignments_by_module[module_id] & self.approved_assignments)
+
+    def course_completed(self) -> bool:
+        if not self.structure.module_ids:
+            return False
+        if not all(self.module_completed(module_id) for module_id in self.structure.module_ids):
+            return False
+        return bool(self.structure.final_assignments & self.approved_assignments)
+
+
+def _lesson_quiz_passed(enrollment, lesson: Lesson) -> bool:
+    passed = Submission.objects.filter(
+        enrollment=enrollment, quiz=OuterRef("pk"), passed=True
+    )
+    return not (
+        Quiz.objects.filter(lesson=lesson, is_required_for_completion=True)
+        .filter(~Exists(passed))
+        .exists()
+    )
 
 
 def mark_lesson_viewed(enrollment, lesson: Lesson) -> Progress:
@@ -63,69 +222,92 @@ def update_progress_for_quiz(submission: Submission) -> Progress | None:
 
 
 def is_module_completed(enrollment, module: Module) -> bool:
-    lessons = Lesson.objects.filter(module=module)
-    total_lessons = lessons.count()
-    completed_lessons = Progress.objects.filter(
-        enrollment=enrollment, lesson__module=module, completed=True
-    ).count()
+    return EnrollmentProgress(enrollment).module_completed(module.pk)
 
-    if total_lessons == 0 or completed_lessons < total_lessons:
-        return False
 
-    assignments = Assignment.objects.filter(Q(module=module) | Q(lesson__module=module))
-    if not assignments.exists():
-        return False
+def is_course_completed(enrollment) -> bool:
+    return EnrollmentProgress(enrollment).course_completed()
 
-    approved_submission_exists = AssignmentSubmission.objects.filter(
-        enrollment=enrollment,
-        assignment__in=assignments,
-        status=AssignmentSubmission.Status.APPROVED,
-    ).exists()
-    return approved_submission_exists
 
+def _apply_progress(enrollment, state: EnrollmentProgress) -> None:
+    enrollment.progress_percent = state.progress_percent()
+    if state.completed_lesson_count > 0 and enrollment.status == enrollment.Status.ENROLLED:
+        enrollment.status = enrollment.Status.IN_PROGRESS
 
-def is_course_completed(enrollment) -> bool:
-    modules = Module.objects.filter(course=enrollment.course)
-    if not modules.exists():
-        return False
+    if state.course_completed():
+        enrollment.status = enrollment.Status.COMPLETED
+        enrollment.completed_at = enrollment.completed_at or timezone.now()
 
-    for module in modules:
-        if not is_module_completed(enrollment, module):
-            return False
 
-    final_assignments = Assignment.objects.filter(
-        Q(module__course=enrollment.course) | Q(lesson__module__course=enrollment.course),
-        is_final_assessment=True,
-    )
-    if not final_assignments.exists():
-        return False
+def refresh_enrollment_progress(enrollment) -> None:
+    _apply_progress(enrollment, EnrollmentProgress(enrollment))
+    enrollment.save(update_fields=["status", "progress_percent", "completed_at", "updated_at"])
 
-    final_approved = AssignmentSubmission.objects.filter(
-        enrollment=enrollment,
-        assignment__in=final_assignments,
-        status=AssignmentSubmission.Status.APPROVED,
-    ).exists()
-    return final_approved
 
+def recompute_course_progress(
+    course, dry_run: bool = False, enrollment_ids=None
+) -> tuple[int, int]:
+    """Recalcule progression, statut et complétion des inscriptions du cours.
 
-def refresh_enrollment_progress(enrollment) -> None:
-    total_lessons = Lesson.objects.filter(module__course=enrollment.course).count()
-    completed_lessons = Progress.objects.filter(
-        enrollment=enrollment, completed=True
-    ).count()
-
-    progress_percent = (
-        Decimal(completed_lessons) / Decimal(total_lessons) * 100
-        if total_lessons
-        else Decimal("0.00")
-    )
+    Les faits de la cohorte sont lus en requêtes groupées et seules les
+    inscriptions modifiées sont réécrites, par ``bulk_update``. ``enrollment_ids``
+    restreint le calcul à ces inscriptions (filtrées en Python, comme
+    ``refresh_lesson_quiz_progress``). Retourne le nombre d'inscriptions traitées
+    et le nombre d'inscriptions modifiées.
+    """
+    fields = ["status", "progress_percent", "completed_at"]
+    enrollments = [
+        enrollment
+        for enrollment in Enrollment.objects.filter(course=course).only(
+            "pk", "course_id", *fields
+        )
+        if enrollment_ids is None or enrollment.pk in enrollment_ids
+    ]
+    states = EnrollmentProgress.for_course(course.pk, enrollments)
+    now = timezone.now()
+    changed = []
+    for enrollment in enrollments:
+        before = [getattr(enrollment, field) for field in fields]
+        _apply_progress(enrollment, states[enrollment.pk])
+        if [getattr(enrollment, field) for field in fields] != before:
+            enrollment.updated_at = now
+            changed.append(enrollment)
+    if changed and not dry_run:
+        Enrollment.objects.bulk_update(changed, [*fields, "updated_at"], batch_size=500)
+    return len(enrollments), len(changed)
 
-    enrollment.progress_percent = progress_percent.quantize(Decimal("0.01"))
-    if completed_lessons > 0 and enrollment.status == enrollment.Status.ENROLLED:
-        enrollment.status = enrollment.Status.IN_PROGRESS
 
-    if is_course_completed(enrollment):
-        enrollment.status = enrollment.Status.COMPLETED
-        enrollment.completed_at = enrollment.completed_at or timezone.now()
+def refresh_lesson_quiz_progress(lesson, enrollment_ids=None) -> set:
+    """Réaligne ``quiz_passed`` des progressions de la leçon après une re-correction.
 
-    enrollment.save(update_fields=["status", "progress_percent", "completed_at", "updated_at"])
+    Même règle que ``update_progress_for_quiz`` (tous les quiz requis réussis ;
+    une leçon terminée le reste), appliquée en trois lectures et un
+    ``bulk_update``, sans liste d'identifiants dans le SQL (une cohorte entière
+    peut être concernée). Retourne les inscriptions dont la progression a changé.
+    """
+    required_quizzes = Quiz.objects.filter(lesson=lesson, is_required_for_completion=True)
+    required = set(required_quizzes.values_list("pk", flat=True))
+    passed = _grouped_ids(
+        Submission.objects.filter(quiz__in=required_quizzes, passed=True)
+        .values_list("enrollment_id", "quiz_id")
+        .distinct()
+    )
+    now = timezone.now()
+    changed = []
+    for progress in Progress.objects.filter(lesson=lesson):
+        if enrollment_ids is not None and progress.enrollment_id not in enrollment_ids:
+            continue
+        quiz_passed = required <= passed.get(progress.enrollment_id, set())
+        completed = progress.completed or bool(progress.viewed_at and quiz_passed)
+        if (quiz_passed, completed) == (progress.quiz_passed, progress.completed):
+            continue
+        progress.quiz_passed = quiz_passed
+        if completed and not progress.completed:
+            progress.completed = True
+            progress.completed_at = progress.completed_at or now
+        progress.updated_at = now
+        changed.append(progress)
+    Progress.objects.bulk_update(
+        changed, ["quiz_passed", "completed", "completed_at", "updated_at"], batch_size=500
+    )
+    return {progress.enrollment_id for progress in changed}
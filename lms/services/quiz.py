@@ -1,110 +1,232 @@
+from collections import defaultdict
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
 
-from lms.models import Choice, Question, Quiz, Submission, SubmissionAnswer
-
-
-def _normalize_text(value: str, case_sensitive: bool) -> str:
-    value = (value or "").strip()
-    return value if case_sensitive else value.lower()
-
+from floxy import answer_keys
+from floxy.answer_keys import AnswerKey
+from lms.models import Question, Quiz, Submission, SubmissionAnswer
+
+AUTO_GRADED_TYPES = {Question.QuestionType.MCQ, Question.QuestionType.TRUE_FALSE}
+
+
+def compile_answer_key(quiz) -> AnswerKey:
+    """Compile le corrigé du quiz en deux requêtes (questions, puis choix)."""
+    questions = []
+    for question in Question.objects.filter(quiz=quiz).prefetch_related("choices"):
+        choices = list(question.choices.all())
+        if question.question_type in AUTO_GRADED_TYPES:
+            kind = answer_keys.CHOICE
+        elif question.manual_review_required:
+            kind = answer_keys.MANUAL
+        elif question.correct_text:
+            kind = answer_keys.TEXT
+        else:
+            kind = answer_keys.OPEN
+        questions.append(
+            answer_keys.QuestionKey(
+                id=question.id,
+                points=question.points,
+                kind=kind,
+                choices={str(choice.id): choice.id for choice in choices},
+                correct_choices=frozenset(
+                    str(choice.id) for choice in choices if choice.is_correct
+                ),
+                expected_text=answer_keys.normalize_text(
+                    question.correct_text, question.case_sensitive
+                ),
+                case_sensitive=question.case_sensitive,
+            )
+        )
+    return AnswerKey(tuple(questions))
 
-@transaction.atomic
-def score_quiz_attempt(enrollment, quiz: Quiz, answers: list[dict]) -> Submission:
-    if quiz.max_attempts:
-        attempt_count = Submission.objects.filter(
-            enrollment=enrollment, quiz=quiz
-        ).count()
-        if attempt_count >= quiz.max_attempts:
-            raise ValidationError("Nombre maximal de tentatives atteint.")
-    attempt_number = (
-        Submission.objects.filter(enrollment=enrollment, quiz=quiz).count() + 1
-    )
 
-    submission = Submission.objects.create(
-        enrollment=enrollment,
-        quiz=quiz,
-        attempt_number=attempt_number,
-    )
+def get_answer_key(quiz) -> AnswerKey:
+    return answer_keys.cached_answer_key(quiz, compile_answer_key)
 
-    answers_map = {item.get("question_id"): item for item in answers}
-    questions = list(Question.objects.filter(quiz=quiz).prefetch_related("choices"))
 
-    for question in questions:
-        payload = answers_map.get(question.id, {})
-        selected_choice_id = payload.get("choice_id")
-        text_answer = payload.get("text_answer", "") or ""
+def _is_manual(question, answer) -> bool:
+    return question.kind == answer_keys.MANUAL and answer.manual_scored
 
-        selected_choice = None
-        if selected_choice_id:
-            selected_choice = Choice.objects.filter(
-                id=selected_choice_id, question=question
-            ).first()
 
-        SubmissionAnswer.objects.create(
-            attempt=submission,
-            question=question,
-            selected_choice=selected_choice,
-            text_answer=text_answer if question.question_type == Question.QuestionType.SHORT else "",
-        )
+def _grade_answer(question, answer) -> tuple[bool, Decimal]:
+    if question.kind == answer_keys.CHOICE:
+        if question.is_correct_choice(answer.selected_choice_id):
+            return True, Decimal(question.points)
+    elif question.kind == answer_keys.MANUAL:
+        if answer.manual_scored:
+            return answer.is_correct, Decimal(answer.score_awarded or 0)
+    elif question.kind == answer_keys.TEXT:
+        if question.matches_text(answer.text_answer):
+            return True, Decimal(question.points)
+    return False, Decimal("0.00")
 
-    compute_score(submission)
-    return submission
 
+def _apply_scores(submission, answer_key: AnswerKey, answers: dict) -> list:
+    """Note les réponses en mémoire et renseigne le score de la soumission.
 
-@transaction.atomic
-def compute_score(submission: Submission) -> Submission:
-    questions = list(Question.objects.filter(quiz=submission.quiz))
-    answers = {answer.question_id: answer for answer in submission.answers.select_related("question", "selected_choice")}
-    max_score = Decimal("0.00")
+    Retourne les réponses dont la note a changé ; les réponses corrigées à la
+    main ne sont jamais réécrites.
+    """
     total_score = Decimal("0.00")
-
-    for question in questions:
-        max_score += Decimal(question.points)
+    changed = []
+    for question in answer_key.questions:
         answer = answers.get(question.id)
         if not answer:
             continue
-
-        is_correct = False
-        awarded = Decimal("0.00")
-
-        if question.question_type in {
-            Question.QuestionType.MCQ,
-            Question.QuestionType.TRUE_FALSE,
-        }:
-            if answer.selected_choice and answer.selected_choice.is_correct:
-                is_correct = True
-                awarded = Decimal(question.points)
-        elif question.question_type == Question.QuestionType.SHORT:
-            if question.manual_review_required:
-                if answer.manual_scored:
-                    awarded = Decimal(answer.score_awarded or 0)
-                    is_correct = answer.is_correct
-                else:
-                    awarded = Decimal("0.00")
-                    is_correct = False
-            elif question.correct_text:
-                normalized = _normalize_text(answer.text_answer, question.case_sensitive)
-                expected = _normalize_text(question.correct_text, question.case_sensitive)
-                if normalized == expected:
-                    is_correct = True
-                    awarded = Decimal(question.points)
-
-        if not (question.question_type == Question.QuestionType.SHORT and question.manual_review_required and answer.manual_scored):
+        is_correct, awarded = _grade_answer(question, answer)
+        if not _is_manual(question, answer) and (
+            answer.is_correct != is_correct or answer.score_awarded != awarded
+        ):
             answer.is_correct = is_correct
             answer.score_awarded = awarded
-            answer.save(update_fields=["is_correct", "score_awarded"])
-
+            changed.append(answer)
         total_score += awarded
 
+    max_score = Decimal(answer_key.total_points)
     submission.score = total_score
     submission.max_score = max_score
     achieved_percent = (total_score / max_score * 100) if max_score else Decimal("0.00")
     submission.passed = achieved_percent >= Decimal(submission.quiz.passing_score)
+    return changed
+
+
+@transaction.atomic
+def score_quiz_attempt(enrollment, quiz: Quiz, answers: list[dict]) -> Submission:
+    """Enregistre et note une tentative en un nombre fixe de requêtes.
+
+    Le corrigé compilé vient du cache ; la soumission, notée en mémoire,
+    est insérée avec son score et ses réponses d'un seul ``bulk_create`` : un quiz
+    de 40 questions coûte autant qu'un quiz de 4.
+    """
+    attempt_count = Submission.objects.filter(enrollment=enrollment, quiz=quiz).count()
+    if quiz.max_attempts and attempt_count >= quiz.max_attempts:
+        raise ValidationError("Nombre maximal de tentatives atteint.")
+
+    submission = Submission(
+        enrollment=enrollment,
+        quiz=quiz,
+        attempt_number=attempt_count + 1,
+    )
+
+    answers_map = {str(item.get("question_id")): item for item in answers}
+    answer_key = get_answer_key(quiz)
+    rows = {}
+    for question in answer_key.questions:
+        payload = answers_map.get(str(question.id), {})
+        text_answer = payload.get("text_answer", "") or ""
+        rows[question.id] = SubmissionAnswer(
+            attempt=submission,
+            question_id=question.id,
+            selected_choice_id=question.choice_id(payload.get("choice_id")),
+            text_answer=text_answer if question.kind != answer_keys.CHOICE else "",
+        )
+
+    _apply_scores(submission, answer_key, rows)
+    submission.save(force_insert=True)
+    SubmissionAnswer.objects.bulk_create(rows.values())
+    from lms.services.progress import update_progress_for_quiz
+
+    update_progress_for_quiz(submission)
+    return submission
+
+
+@transaction.atomic
+def compute_score(submission: Submission) -> Submission:
+    answers = {answer.question_id: answer for answer in submission.answers.all()}
+    changed = _apply_scores(submission, get_answer_key(submission.quiz), answers)
+    if changed:
+        SubmissionAnswer.objects.bulk_update(changed, ["is_correct", "score_awarded"])
     submission.save(update_fields=["score", "max_score", "passed"])
     from lms.services.progress import update_progress_for_quiz
 
     update_progress_for_quiz(submission)
     return submission
+
+
+def regrade_quiz(quiz: Quiz, chunk_size: int = 500, dry_run: bool = False) -> dict:
+    """Re-note toutes les soumissions du quiz avec son corrigé actuel.
+
+    Le corrigé est recompilé depuis la base (une correction faite par
+    ``QuerySet.update`` n'émet pas de signal), puis les soumissions sont
+    traitées par paquets de ``chunk_size`` : réponses, scores et progressions
+    dépendantes sont réécrits par ``bulk_update``, chaque paquet dans sa propre
+    transaction pour ne pas bloquer la base pendant tout le traitement. Seules
+    les inscriptions dont un résultat a basculé voient leur progression recalculée.
+
+    Le corrigé en cache est invalidé dans le cache de ce processus : avec le cache
+    mémoire local, les serveurs web ne le verront qu'à l'expiration de
+    ``QUIZ_ANSWER_KEY_TIMEOUT``.
+    """
+    from lms.services.progress import (
+        recompute_course_progress,
+        refresh_lesson_quiz_progress,
+    )
+
+    answer_key = compile_answer_key(quiz)
+    summary = {
+        "submissions": 0,
+        "changed_submissions": 0,
+        "changed_answers": 0,
+        "now_passed": 0,
+        "now_failed": 0,
+        "changed_progress": 0,
+        "changed_enrollments": 0,
+    }
+    flipped_enrollments = set()
+    last_pk = None
+    while True:
+        submissions = Submission.objects.filter(quiz=quiz).order_by("pk")
+        if last_pk is not None:
+            submissions = submissions.filter(pk__gt=last_pk)
+        submissions = list(submissions[:chunk_size])
+        if not submissions:
+            break
+        last_pk = submissions[-1].pk
+
+        answers = defaultdict(dict)
+        for answer in SubmissionAnswer.objects.filter(attempt__in=submissions):
+            answers[answer.attempt_id][answer.question_id] = answer
+        changed_answers = []
+        changed_submissions = []
+        for submission in submissions:
+            submission.quiz = quiz
+            before = (submission.score, submission.max_score, submission.passed)
+            changed_answers += _apply_scores(
+                submission, answer_key, answers[submission.pk]
+            )
+            if (submission.score, submission.max_score, submission.passed) == before:
+                continue
+            changed_submissions.append(submission)
+            if submission.passed != before[2]:
+                summary["now_passed" if submission.passed else "now_failed"] += 1
+                flipped_enrollments.add(submission.enrollment_id)
+
+        summary["submissions"] += len(submissions)
+        summary["changed_answers"] += len(changed_answers)
+        summary["changed_submissions"] += len(changed_submissions)
+        if dry_run:
+            continue
+        with transaction.atomic():
+            SubmissionAnswer.objects.bulk_update(
+                changed_answers, ["is_correct", "score_awarded"], batch_size=500
+            )
+            Submission.objects.bulk_update(
+                changed_submissions, ["score", "max_score", "passed"], batch_size=500
+            )
+
+    if dry_run:
+        return summary
+    answer_keys.invalidate_answer_key(Quiz._meta.label_lower, quiz.pk)
+    if not flipped_enrollments or quiz.lesson_id is None:
+        return summary
+    with transaction.atomic():
+        lesson = quiz.lesson
+        changed = refresh_lesson_quiz_progress(lesson, flipped_enrollments)
+        summary["changed_progress"] = len(changed)
+        if changed:
+            _, summary["changed_enrollments"] = recompute_course_progress(
+                lesson.module.course, enrollment_ids=flipped_enrollments
+            )
+    return summary
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from floxy.answer_keys import invalidate_answer_key
+from lms.models import Choice, Question, Quiz
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz_answer_key(sender, instance, **kwargs):
+    invalidate_answer_key(Quiz._meta.label_lower, instance.pk)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_answer_key(sender, instance, **kwargs):
+    invalidate_answer_key(Quiz._meta.label_lower, instance.quiz_id)
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def invalidate_choice_answer_key(sender, instance, **kwargs):
+    quiz_id = (
+        Question.objects.filter(pk=instance.question_id)
+        .values_list("quiz_id", flat=True)
+        .first()
+    )
+    invalidate_answer_key(Quiz._meta.label_lower, quiz_id)
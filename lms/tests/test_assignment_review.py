@@ -1,6 +1,12 @@
+import base64
+import json
+
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
 
 from lms.models import Assignment, Course, Enrollment, Lesson, Module
 from lms.services.assignments import review_submission, submit_assignment
@@ -55,3 +61,101 @@ class AssignmentReviewTests(TestCase):
         )
         self.assertEqual(submission.status, submission.Status.REJECTED)
         self.assertEqual(submission.feedback, "À refaire")
+
+
+class ReviewQueueApiTests(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.supervisor = User.objects.create_user(
+            username="manager", password="pass", role="MANAGER"
+        )
+        self.course = Course.objects.create(title="Formation")
+        module = Module.objects.create(
+            course=self.course, week_number=1, title="S1", order=1
+        )
+        self.lesson = Lesson.objects.create(module=module, title="Intro", order=1)
+        self.url = "/api/lms/assignment-submissions/review-queue/"
+
+    def _submit(self, count, start=0):
+        submissions = []
+        for index in range(start, start + count):
+            learner = get_user_model().objects.create_user(
+                username=f"learner{index}", password="pass"
+            )
+            enrollment = Enrollment.objects.create(user=learner, course=self.course)
+            assignment = Assignment.objects.create(
+                lesson=self.lesson,
+                title=f"Mission {index}",
+                requires_kpi_evidence=False,
+            )
+            submissions.append(
+                submit_assignment(
+                    enrollment,
+                    assignment,
+                    proof_links=["https://example.com/preuve"],
+                    kpis=[{"label": "Ventes", "value": 3, "unit": ""}],
+                )
+            )
+        return submissions
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, len(context.captured_queries)
+
+    def test_queue_pages_follow_creation_order(self):
+        submissions = self._submit(5)
+        review_submission(
+            submissions[1],
+            reviewer=self.supervisor,
+            status=submissions[1].Status.APPROVED,
+        )
+        self.client.force_authenticate(self.supervisor)
+
+        seen = []
+        url = f"{self.url}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [item["id"] for item in response.data["results"]]
+            self.assertEqual(
+                response.data["results"][0]["proof_links"][0]["url"],
+                "https://example.com/preuve",
+            )
+            url = response.data["next"]
+
+        expected = [str(item.pk) for item in submissions if item is not submissions[1]]
+        self.assertEqual(seen, expected)
+
+    def test_queue_queries_do_not_grow_with_page_size(self):
+        self._submit(2)
+        self.client.force_authenticate(self.supervisor)
+        _, baseline = self._count_queries(f"{self.url}?page_size=2")
+
+        self._submit(8, start=2)
+        response, queries = self._count_queries(f"{self.url}?page_size=10")
+
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(queries, baseline)
+
+    def test_queue_rejects_malformed_filter_and_cursor(self):
+        self.client.force_authenticate(self.supervisor)
+        cursor = base64.urlsafe_b64encode(
+            json.dumps(["2026-01-01T00:00:00+00:00", "abc"]).encode()
+        ).decode()
+
+        self.assertEqual(
+            self.client.get(f"{self.url}?assignment=abc").status_code, 400
+        )
+        response = self.client.get(f"{self.url}?cursor={cursor}")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["detail"], "Curseur invalide.")
+
+    def test_queue_is_reserved_to_supervisors(self):
+        learner = self._submit(1)[0].enrollment.user
+        self.client.force_authenticate(learner)
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(
+            self.client.get(f"{self.url}?cursor=invalide").status_code, 403
+        )
@@ -1,11 +1,16 @@
+import shutil
+import tempfile
 from decimal import Decimal
+from io import BytesIO
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
 
 from lms.models import Assignment, AssignmentKPIRequirement, Course, Lesson, Module
-from lms.models import Enrollment
+from lms.models import AssignmentSubmission, Enrollment
 from lms.services.assignments import submit_assignment
 
 
@@ -62,3 +67,92 @@ class AssignmentSubmissionTests(TestCase):
         )
         self.assertEqual(submission.assignment, self.assignment)
         self.assertEqual(submission.kpi_evidence.count(), 1)
+
+
+class AssignmentResubmissionTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        user = get_user_model().objects.create_user(username="learner", password="pass")
+        course = Course.objects.create(title="Formation")
+        module = Module.objects.create(
+            course=course, week_number=1, title="S1", order=1
+        )
+        lesson = Lesson.objects.create(module=module, title="Intro", order=1)
+        self.assignment = Assignment.objects.create(
+            lesson=lesson, title="Mission", requires_kpi_evidence=False
+        )
+        self.enrollment = Enrollment.objects.create(user=user, course=course)
+
+    def _photo(self, name="photo.png", color="red", image_format="PNG"):
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), color).save(buffer, format=image_format)
+        content_type = f"image/{image_format.lower()}"
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type=content_type)
+
+    def _submit(self, links, kpis, photos):
+        return submit_assignment(
+            self.enrollment,
+            self.assignment,
+            attachments=photos,
+            proof_links=links,
+            kpis=kpis,
+        )
+
+    def test_resubmission_keeps_unchanged_children(self):
+        kpi = {"label": "Ventes", "value": Decimal("3"), "unit": "u"}
+        first = self._submit(
+            ["https://a.example", "https://b.example"], [kpi], [self._photo()]
+        )
+        link_a = first.proof_links.get(url="https://a.example")
+        kpi_row = first.kpi_values.get()
+        attachment = first.attachments.get()
+
+        second = self._submit(
+            ["https://a.example", "https://c.example"],
+            [{"label": "Ventes", "value": Decimal("3.00"), "unit": "u"}],
+            [self._photo(), self._photo("autre.png", "blue")],
+        )
+
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(
+            set(second.proof_links.values_list("url", flat=True)),
+            {"https://a.example", "https://c.example"},
+        )
+        self.assertTrue(second.proof_links.filter(pk=link_a.pk).exists())
+        self.assertEqual(
+            list(second.kpi_values.values_list("pk", flat=True)), [kpi_row.pk]
+        )
+        self.assertEqual(second.attachments.count(), 2)
+        self.assertTrue(second.attachments.filter(pk=attachment.pk).exists())
+
+    def test_resubmitted_photo_with_same_name_and_size_is_replaced(self):
+        # Un BMP a une taille fixe : seule l'empreinte distingue les deux photos.
+        first = self._submit([], [], [self._photo("image.bmp", "red", "BMP")])
+        old = first.attachments.get()
+
+        second = self._submit([], [], [self._photo("image.bmp", "blue", "BMP")])
+
+        attachment = second.attachments.get()
+        self.assertNotEqual(attachment.pk, old.pk)
+        self.assertEqual(attachment.image.size, old.image.size)
+        with attachment.image.open("rb") as handle:
+            self.assertEqual(Image.open(handle).getpixel((0, 0)), (0, 0, 255))
+
+    def test_invalid_evidence_writes_nothing(self):
+        self.assignment.requires_kpi_evidence = True
+        self.assignment.save(update_fields=["requires_kpi_evidence"])
+
+        with self.assertRaises(ValidationError):
+            submit_assignment(
+                self.enrollment,
+                self.assignment,
+                attachments=[self._photo()],
+                evidence_payloads=[],
+            )
+
+        self.assertFalse(AssignmentSubmission.objects.exists())
@@ -0,0 +1,110 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from lms.models import Certificate, Course, Enrollment
+from lms.services import certificates
+from lms.services.certificates import (
+    certifiable_enrollments,
+    issue_certificate,
+    issue_certificates,
+)
+
+
+class BulkCertificateTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.course = Course.objects.create(title="Formation", slug="formation")
+        user_model = get_user_model()
+        self.enrollments = [
+            Enrollment.objects.create(
+                user=user_model.objects.create_user(
+                    username=f"learner{index}", password="pass"
+                ),
+                course=self.course,
+                status=Enrollment.Status.COMPLETED,
+            )
+            for index in range(4)
+        ]
+        self.in_progress = Enrollment.objects.create(
+            user=user_model.objects.create_user(username="late", password="pass"),
+            course=self.course,
+            status=Enrollment.Status.IN_PROGRESS,
+        )
+
+    def test_issue_certificates_skips_existing_and_incomplete(self):
+        existing = issue_certificate(self.enrollments[0])
+
+        certificates = issue_certificates(
+            certifiable_enrollments(self.course), workers=1
+        )
+
+        self.assertEqual(len(certificates), 3)
+        self.assertEqual(Certificate.objects.count(), 4)
+        self.assertFalse(
+            Certificate.objects.filter(enrollment=self.in_progress).exists()
+        )
+        self.assertEqual(
+            Certificate.objects.get(enrollment=self.enrollments[0]).pk, existing.pk
+        )
+        for certificate in Certificate.objects.all():
+            with certificate.pdf_file.open("rb") as handle:
+                self.assertTrue(handle.read().startswith(b"%PDF"))
+        self.assertFalse(certifiable_enrollments(self.course).exists())
+
+    def test_process_pool_renders_every_certificate(self):
+        certificates = issue_certificates(self.enrollments, workers=2)
+
+        self.assertEqual(len(certificates), 4)
+        self.assertEqual(
+            Certificate.objects.filter(
+                pdf_file__startswith="lms/certificates/"
+            ).count(),
+            4,
+        )
+
+    def test_command_reports_issued_count(self):
+        out = StringIO()
+
+        call_command(
+            "issue_certificates", "--course", "formation", "--workers", "1", stdout=out
+        )
+        call_command("issue_certificates", "--workers", "1", stdout=out)
+
+        self.assertIn("Certificats émis : 4", out.getvalue())
+        self.assertIn("Certificats émis : 0", out.getvalue())
+
+    @override_settings(JOB_QUEUE_ENABLED=False)
+    def test_admin_action_renders_in_a_single_process(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="direction", password="pass", role="OWNER"
+        )
+        self.client.force_login(admin_user)
+
+        with patch.object(
+            certificates,
+            "render_certificate_pdfs",
+            wraps=certificates.render_certificate_pdfs,
+        ) as render:
+            response = self.client.post(
+                "/admin/lms/course/",
+                {
+                    "action": "issue_course_certificates",
+                    "_selected_action": [str(self.course.pk)],
+                },
+            )
+
+        self.assertEqual(response.status_code, 302)
+        render.assert_called_once()
+        self.assertEqual(render.call_args.kwargs["workers"], 1)
+        self.assertEqual(Certificate.objects.count(), 4)
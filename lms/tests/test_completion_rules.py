@@ -1,5 +1,10 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from lms.models import Assignment, AssignmentSubmission, Choice, Course, Lesson, Module, Quiz, Question
@@ -93,3 +98,63 @@ class CompletionRuleTests(TestCase):
         refresh_enrollment_progress(self.enrollment)
         self.enrollment.refresh_from_db()
         self.assertEqual(self.enrollment.status, self.enrollment.Status.COMPLETED)
+
+    def test_refresh_query_count_does_not_grow_with_course(self):
+        def count_refresh_queries():
+            self.enrollment.refresh_from_db()
+            with CaptureQueriesContext(connection) as context:
+                refresh_enrollment_progress(self.enrollment)
+            return len(context.captured_queries)
+
+        baseline = count_refresh_queries()
+        for week in range(2, 8):
+            module = Module.objects.create(
+                course=self.course, week_number=week, title=f"S{week}", order=week
+            )
+            for order in range(1, 4):
+                lesson = Lesson.objects.create(module=module, title="Leçon", order=order)
+                Quiz.objects.create(
+                    lesson=lesson, title="Quiz", is_required_for_completion=True
+                )
+                Assignment.objects.create(lesson=lesson, title="Mission")
+
+        self.assertEqual(count_refresh_queries(), baseline)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.status, self.enrollment.Status.ENROLLED)
+
+    def test_recompute_course_progress_matches_refresh(self):
+        other = Enrollment.objects.create(
+            user=get_user_model().objects.create_user(username="other", password="pass"),
+            course=self.course,
+        )
+        Progress.objects.create(
+            enrollment=self.enrollment,
+            lesson=self.lesson,
+            quiz_passed=True,
+            completed=True,
+            completed_at=timezone.now(),
+        )
+        for assignment in (self.assignment, self.final_assignment):
+            AssignmentSubmission.objects.create(
+                enrollment=self.enrollment,
+                assignment=assignment,
+                status=AssignmentSubmission.Status.APPROVED,
+            )
+        out = StringIO()
+
+        with CaptureQueriesContext(connection) as context:
+            call_command("recompute_lms_progress", "--course", self.course.slug, stdout=out)
+
+        self.enrollment.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.enrollment.status, Enrollment.Status.COMPLETED)
+        self.assertEqual(self.enrollment.progress_percent, 100)
+        self.assertIsNotNone(self.enrollment.completed_at)
+        self.assertEqual(other.status, Enrollment.Status.ENROLLED)
+        self.assertIn("Inscriptions recalculées : 2, modifiées : 1", out.getvalue())
+        # Cours, inscriptions, 7 lectures groupées et une écriture groupée.
+        self.assertLessEqual(len(context.captured_queries), 12)
+
+        out = StringIO()
+        call_command("recompute_lms_progress", "--course", self.course.slug, stdout=out)
+        self.assertIn("modifiées : 0", out.getvalue())
@@ -1,15 +1,22 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from lms.models import (
     Assignment,
+    AssignmentKPIEvidence,
+    AssignmentKPIRequirement,
     AssignmentSubmission,
     Badge,
+    BadgeAward,
     Course,
     Lesson,
     Module,
     Progress,
+    Quiz,
+    QuizAttempt,
 )
 from lms.models import Enrollment
 from lms.services.badges import award_badges_for_enrollment
@@ -116,3 +123,88 @@ class ProgressBadgeTests(TestCase):
         )
         awards = award_badges_for_enrollment(self.enrollment)
         self.assertEqual(len(awards), 1)
+
+    def test_quiz_score_and_kpi_rules(self):
+        quiz = Quiz.objects.create(lesson=self.lesson, title="Quiz")
+        QuizAttempt.objects.create(
+            enrollment=self.enrollment,
+            quiz=quiz,
+            score=2,
+            max_score=3,
+            attempt_number=1,
+        )
+        QuizAttempt.objects.create(
+            enrollment=self.enrollment,
+            quiz=quiz,
+            score=7,
+            max_score=10,
+            attempt_number=2,
+        )
+        requirement = AssignmentKPIRequirement.objects.create(
+            assignment=self.assignment, label="Ventes"
+        )
+        submission = AssignmentSubmission.objects.create(
+            enrollment=self.enrollment, assignment=self.assignment
+        )
+        AssignmentKPIEvidence.objects.create(
+            submission=submission, requirement=requirement, value=12
+        )
+        expected = {
+            Badge.objects.create(
+                name="Module 70",
+                rule_type=Badge.RuleType.QUIZ_SCORE,
+                module=self.module,
+                min_score=70,
+            ),
+            Badge.objects.create(
+                name="Cours 70", rule_type=Badge.RuleType.QUIZ_SCORE, min_score=70
+            ),
+            Badge.objects.create(
+                name="KPI",
+                rule_type=Badge.RuleType.KPI_TARGET,
+                kpi_label="ventes",
+                kpi_min_value=10,
+            ),
+        }
+        Badge.objects.create(
+            name="Cours 71", rule_type=Badge.RuleType.QUIZ_SCORE, min_score=71
+        )
+        Badge.objects.create(
+            name="KPI haut",
+            rule_type=Badge.RuleType.KPI_TARGET,
+            kpi_label="Ventes",
+            kpi_min_value=20,
+        )
+
+        awards = award_badges_for_enrollment(self.enrollment)
+
+        self.assertEqual({award.badge for award in awards}, expected)
+        # Un second passage ne duplique rien.
+        award_badges_for_enrollment(self.enrollment)
+        self.assertEqual(BadgeAward.objects.filter(user=self.user).count(), 3)
+
+    def test_badge_queries_do_not_grow_with_badges(self):
+        def count_award_queries():
+            with CaptureQueriesContext(connection) as context:
+                award_badges_for_enrollment(self.enrollment)
+            return len(context.captured_queries)
+
+        Badge.objects.create(
+            name="Quiz", rule_type=Badge.RuleType.QUIZ_SCORE, min_score=50
+        )
+        baseline = count_award_queries()
+        for order in range(2, 8):
+            Quiz.objects.create(lesson=self.lesson, title=f"Quiz {order}", order=order)
+            Badge.objects.create(
+                name=f"Quiz {order}",
+                rule_type=Badge.RuleType.QUIZ_SCORE,
+                min_score=order * 10,
+            )
+            Badge.objects.create(
+                name=f"Module {order}",
+                rule_type=Badge.RuleType.QUIZ_SCORE,
+                module=self.module,
+                min_score=order * 10,
+            )
+
+        self.assertEqual(count_award_queries(), baseline)
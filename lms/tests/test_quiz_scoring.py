@@ -1,9 +1,14 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from lms.models import Course, Module, Lesson, Quiz, Choice, Question
-from lms.models import Enrollment
+from lms.models import Enrollment, Progress, SubmissionAnswer
 from lms.services.quiz import compute_score, score_quiz_attempt
 
 
@@ -17,7 +22,9 @@ class QuizScoringTests(TestCase):
         )
         self.lesson = Lesson.objects.create(module=self.module, title="Intro", order=1)
         self.enrollment = Enrollment.objects.create(user=self.user, course=self.course)
-        self.quiz = Quiz.objects.create(lesson=self.lesson, title="Quiz 1", passing_score=50)
+        self.quiz = Quiz.objects.create(
+            lesson=self.lesson, title="Quiz 1", passing_score=50
+        )
 
         self.q1 = Question.objects.create(
             quiz=self.quiz,
@@ -95,8 +102,105 @@ class QuizScoringTests(TestCase):
         short_answer.manual_scored = True
         short_answer.is_correct = True
         short_answer.score_awarded = 1
-        short_answer.save(update_fields=["manual_scored", "is_correct", "score_awarded"])
+        short_answer.save(
+            update_fields=["manual_scored", "is_correct", "score_awarded"]
+        )
         compute_score(submission)
         submission.refresh_from_db()
         self.assertEqual(submission.score, 3)
         self.assertTrue(submission.passed)
+
+    def test_grading_queries_do_not_grow_with_questions(self):
+        def count_submit_queries():
+            answers = [
+                {"question_id": question.id, "choice_id": question.choices.first().id}
+                for question in self.quiz.questions.exclude(
+                    question_type=Question.QuestionType.SHORT
+                )
+            ]
+            with CaptureQueriesContext(connection) as context:
+                submission = score_quiz_attempt(self.enrollment, self.quiz, answers)
+            return submission, len(context.captured_queries)
+
+        self.quiz.max_attempts = 0
+        self.quiz.save(update_fields=["max_attempts"])
+        count_submit_queries()  # crée la progression de la leçon
+        _, baseline = count_submit_queries()
+        for order in range(4, 44):
+            question = Question.objects.create(
+                quiz=self.quiz,
+                question_type=Question.QuestionType.MCQ,
+                prompt=f"Q{order}",
+                points=1,
+                order=order,
+            )
+            Choice.objects.create(question=question, text="Oui", is_correct=True)
+
+        count_submit_queries()  # compile le nouveau corrigé
+        submission, queries = count_submit_queries()
+
+        self.assertEqual(queries, baseline)
+        self.assertEqual(
+            SubmissionAnswer.objects.filter(attempt=submission).count(), 43
+        )
+        self.assertEqual(submission.max_score, 44)
+
+    def test_answer_key_is_cached_until_choices_change(self):
+        answers = [{"question_id": self.q1.id, "choice_id": self.c2.id}]
+        self.quiz.max_attempts = 0
+        self.quiz.save(update_fields=["max_attempts"])
+        first = score_quiz_attempt(self.enrollment, self.quiz, answers)
+
+        with CaptureQueriesContext(connection) as context:
+            score_quiz_attempt(self.enrollment, self.quiz, answers)
+        self.assertFalse(
+            any("lms_question" in query["sql"] for query in context.captured_queries)
+        )
+
+        self.c2.is_correct = True
+        self.c2.save(update_fields=["is_correct"])
+        regraded = score_quiz_attempt(self.enrollment, self.quiz, answers)
+
+        self.assertEqual(first.score, 0)
+        self.assertEqual(regraded.score, 2)
+
+    def test_regrade_quiz_flips_results_and_progress(self):
+        self.quiz.max_attempts = 0
+        self.quiz.is_required_for_completion = True
+        self.quiz.save(update_fields=["max_attempts", "is_required_for_completion"])
+        wrong = [{"question_id": self.q1.id, "choice_id": self.c2.id}]
+        right = [{"question_id": self.q1.id, "choice_id": self.c1.id}]
+        failed = score_quiz_attempt(self.enrollment, self.quiz, wrong)
+        passed = score_quiz_attempt(self.enrollment, self.quiz, right)
+        Progress.objects.filter(enrollment=self.enrollment, lesson=self.lesson).update(
+            viewed_at=passed.submitted_at
+        )
+        bystander = Enrollment.objects.create(
+            user=get_user_model().objects.create_user(username="other", password="pass"),
+            course=self.course,
+        )
+        Enrollment.objects.filter(pk=bystander.pk).update(progress_percent=42)
+
+        # Correction du corrigé sans signal : c2 était la bonne réponse.
+        Choice.objects.filter(pk=self.c1.pk).update(is_correct=False)
+        Choice.objects.filter(pk=self.c2.pk).update(is_correct=True)
+        out = StringIO()
+        call_command(
+            "regrade_quiz", "--quiz", str(self.quiz.pk), "--chunk-size", "1", stdout=out
+        )
+
+        failed.refresh_from_db()
+        passed.refresh_from_db()
+        self.assertTrue(failed.passed)
+        self.assertFalse(passed.passed)
+        self.assertIn("Échec → réussite : 1, réussite → échec : 1", out.getvalue())
+        progress = Progress.objects.get(enrollment=self.enrollment, lesson=self.lesson)
+        self.assertTrue(progress.quiz_passed)
+        self.assertTrue(progress.completed)
+        bystander.refresh_from_db()
+        self.assertEqual(bystander.progress_percent, 42)
+        self.assertIn("garderont l'ancien corrigé", out.getvalue())
+
+        out = StringIO()
+        call_command("regrade_quiz", "--quiz", str(self.quiz.pk), stdout=out)
+        self.assertIn("Soumissions : 2, modifiées : 0", out.getvalue())
@@ -1,3 +1,6 @@
+import uuid
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.http import FileResponse
 from django.shortcuts import get_object_or_404, render
@@ -9,6 +12,8 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from crm.models import Client
+from jobs.queue import enqueue
+from jobs.serializers import JobSerializer
 from lms.models import (
     Assignment,
     AssignmentKPIRequirement,
@@ -26,6 +31,7 @@ from lms.models import (
     QuizChoice,
     QuizQuestion,
 )
+from lms.pagination import KeysetPagination
 from lms.permissions import IsEnrollmentOwnerOrAdmin, IsLmsAdmin, IsReadOnlyOrAdmin
 from lms.serializers import (
     AssignmentSerializer,
@@ -48,7 +54,11 @@ from lms.serializers import (
 )
 from lms.services.assignments import review_submission, submit_assignment
 from lms.services.badges import award_badges_for_enrollment
-from lms.services.certificates import issue_certificate
+from lms.services.certificates import (
+    ensure_certifiable,
+    issue_certificate,
+    issue_certificate_job,
+)
 from lms.services.progress import mark_lesson_viewed, refresh_enrollment_progress
 from lms.services.quiz import score_quiz_attempt
 from operations.models import Activity
@@ -195,6 +205,32 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
             return [IsLmsAdmin()]
         return super().get_permissions()
 
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsLmsAdmin],
+        pagination_class=KeysetPagination,
+        url_path="review-queue",
+    )
+    def review_queue(self, request):
+        """File de correction : soumissions en attente, plus anciennes d'abord."""
+        queryset = (
+            AssignmentSubmission.objects.filter(status=AssignmentSubmission.Status.SUBMITTED)
+            .select_related("assignment", "enrollment")
+            .prefetch_related("attachments", "proof_links", "kpi_values", "kpi_evidence")
+        )
+        if request.query_params.get("assignment"):
+            try:
+                assignment_id = uuid.UUID(request.query_params["assignment"])
+            except ValueError as exc:
+                raise DRFValidationError(
+                    {"assignment": "Identifiant de devoir invalide."}
+                ) from exc
+            queryset = queryset.filter(assignment_id=assignment_id)
+        page = self.paginate_queryset(queryset)
+        serializer = AssignmentSubmissionSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=["post"], permission_classes=[IsLmsAdmin])
     def approve(self, request, pk=None):
         submission = self.get_object()
@@ -226,6 +262,15 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
         return Response(AssignmentSubmissionSerializer(submission).data, status=status.HTTP_200_OK)
 
 
+def _has_certificate_pdf(enrollment) -> bool:
+    return (
+        Certificate.objects.filter(enrollment=enrollment)
+        .exclude(pdf_file__isnull=True)
+        .exclude(pdf_file="")
+        .exists()
+    )
+
+
 class EnrollmentViewSet(viewsets.ModelViewSet):
     queryset = Enrollment.objects.select_related("user", "course")
     serializer_class = EnrollmentSerializer
@@ -260,6 +305,15 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
     def issue_certificate(self, request, pk=None):
         enrollment = self.get_object()
         try:
+            if settings.JOB_QUEUE_ENABLED and not _has_certificate_pdf(enrollment):
+                ensure_certifiable(enrollment)
+                job = enqueue(
+                    issue_certificate_job,
+                    {"enrollment_id": str(enrollment.pk), "created_by_id": request.user.pk},
+                    user=request.user,
+                    dedupe_key=f"certificate:{enrollment.pk}",
+                )
+                return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
             certificate = issue_certificate(enrollment, created_by=request.user)
         except ValidationError as exc:
             raise DRFValidationError(exc.message_dict or {"detail": str(exc)}) from exc
@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from operations.models import Activity, ActivityLine, PaymentLink, Service, ServiceCategory
+from operations.models import (
+    Activity,
+    ActivityLine,
+    PaymentLink,
+    RejectedPaymentMatch,
+    Service,
+    ServiceCategory,
+)
 
 
 @admin.register(ServiceCategory)
@@ -50,6 +57,21 @@ class ActivityLineAdmin(admin.ModelAdmin):
 
 @admin.register(PaymentLink)
 class PaymentLinkAdmin(admin.ModelAdmin):
-    list_display = ("activity", "manual_reference", "loyverse_receipt", "created_at")
+    list_display = (
+        "activity",
+        "manual_reference",
+        "loyverse_receipt",
+        "match_status",
+        "confidence",
+        "created_at",
+    )
+    list_filter = ("match_status",)
     search_fields = ("activity__client", "manual_reference")
     ordering = ("-created_at",)
+
+
+@admin.register(RejectedPaymentMatch)
+class RejectedPaymentMatchAdmin(admin.ModelAdmin):
+    list_display = ("activity", "loyverse_receipt", "rejected_by", "created_at")
+    search_fields = ("activity__client", "loyverse_receipt__receipt_id")
+    ordering = ("-created_at",)
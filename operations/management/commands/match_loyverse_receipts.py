@@ -0,0 +1,43 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from operations.matching import match_receipts_for_day
+
+
+class Command(BaseCommand):
+    help = "Rapproche automatiquement les reçus Loyverse des activités à encaisser."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            dest="date",
+            help="Jour à traiter au format YYYY-MM-DD (aujourd'hui par défaut).",
+        )
+        parser.add_argument(
+            "--days",
+            dest="days",
+            type=int,
+            default=1,
+            help="Nombre de jours à traiter en remontant depuis --date.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Affiche les rapprochements sans les enregistrer.",
+        )
+
+    def handle(self, *args, **options):
+        day = timezone.localdate()
+        if options.get("date"):
+            try:
+                day = date.fromisoformat(options["date"])
+            except ValueError as exc:
+                raise CommandError("Format de date invalide pour --date.") from exc
+
+        for offset in reversed(range(max(options.get("days") or 1, 1))):
+            result = match_receipts_for_day(
+                day - timedelta(days=offset), dry_run=options.get("dry_run")
+            )
+            self.stdout.write(result.summary())
@@ -0,0 +1,273 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from integrations.models import LoyverseReceipt
+from operations.models import Activity, PaymentLink, RejectedPaymentMatch
+from reporting.cache import bump_domain_version
+from reporting.rollups import day_bounds, invalidate_kpi_days
+
+MATCHABLE_STATUSES = [Activity.Status.DONE, Activity.Status.TO_COLLECT]
+AMBIGUITY_MARGIN = 0.05
+AMOUNT_WEIGHT = 0.5
+TIME_WEIGHT = 0.35
+STAFF_WEIGHT = 0.15
+
+
+@dataclass
+class MatchResult:
+    day: date
+    auto: int = 0
+    review: int = 0
+    unmatched_activities: int = 0
+    unmatched_receipts: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.day.isoformat()} : {self.auto} rapprochés, "
+            f"{self.review} à vérifier, "
+            f"{self.unmatched_activities} activités sans reçu, "
+            f"{self.unmatched_receipts} reçus sans activité"
+        )
+
+
+class ReceiptIndex:
+    """Reçus groupés par montant puis triés par heure.
+
+    Une recherche parcourt uniquement les montants compris dans la tolérance
+    et, pour chacun, la tranche horaire de la fenêtre par dichotomie.
+    """
+
+    def __init__(self, receipts: list[dict]):
+        groups = defaultdict(list)
+        for receipt in receipts:
+            groups[receipt["amount"]].append(receipt)
+        self.amounts = sorted(groups)
+        self.groups = {}
+        for amount, items in groups.items():
+            items.sort(key=lambda item: item["timestamp"])
+            self.groups[amount] = ([item["timestamp"] for item in items], items)
+
+    def candidates(self, amount: Decimal, tolerance: Decimal, timestamp, window):
+        low = bisect_left(self.amounts, amount - tolerance)
+        high = bisect_right(self.amounts, amount + tolerance)
+        for key in self.amounts[low:high]:
+            timestamps, items = self.groups[key]
+            start = bisect_left(timestamps, timestamp - window)
+            end = bisect_right(timestamps, timestamp + window)
+            yield from items[start:end]
+
+
+def _staff_score(employee_ref: str, staff_ref: str) -> float:
+    if not employee_ref or not staff_ref:
+        return 0.5
+    return 1.0 if employee_ref == staff_ref else 0.0
+
+
+def score_pair(
+    amount_gap: Decimal,
+    tolerance: Decimal,
+    time_gap: float,
+    window: float,
+    staff_score: float = 0.5,
+) -> float:
+    amount_score = 1.0 if not tolerance else 1 - 0.5 * float(amount_gap / tolerance)
+    time_score = 1 - time_gap / window if window else 1.0
+    return (
+        AMOUNT_WEIGHT * amount_score
+        + TIME_WEIGHT * time_score
+        + STAFF_WEIGHT * staff_score
+    )
+
+
+def _load_receipts(lower, upper) -> list[dict]:
+    rows = (
+        LoyverseReceipt.objects.filter(
+            receipt_date__gte=lower,
+            receipt_date__lt=upper,
+            receipt_type__in=["SALE", ""],
+            total_money__isnull=False,
+            payment_links__isnull=True,
+        )
+        .values_list("pk", "receipt_date", "total_money", "raw_json__employee_id")
+        .iterator()
+    )
+    return [
+        {
+            "pk": pk,
+            "timestamp": receipt_date.timestamp(),
+            "amount": total_money,
+            "employee_ref": str(employee_ref or ""),
+        }
+        for pk, receipt_date, total_money, employee_ref in rows
+    ]
+
+
+def _load_activities(lower, upper) -> list[Activity]:
+    return list(
+        Activity.objects.filter(
+            start_at__gte=lower,
+            start_at__lt=upper,
+            status__in=MATCHABLE_STATUSES,
+            payment_link__isnull=True,
+        )
+        .select_related("assigned_staff")
+        .only(
+            "pk",
+            "status",
+            "start_at",
+            "estimated_end_at",
+            "end_at",
+            "expected_amount",
+            "final_amount",
+            "assigned_staff__loyverse_employee_id",
+        )
+    )
+
+
+def _load_rejected_pairs(lower, upper) -> set:
+    return set(
+        RejectedPaymentMatch.objects.filter(
+            activity__start_at__gte=lower, activity__start_at__lt=upper
+        ).values_list("activity_id", "loyverse_receipt_id")
+    )
+
+
+def match_receipts_for_day(
+    day: date,
+    tolerance: Optional[Decimal] = None,
+    window_minutes: Optional[int] = None,
+    auto_confidence: Optional[float] = None,
+    dry_run: bool = False,
+) -> MatchResult:
+    """Rapproche les reçus Loyverse libres des activités à encaisser du jour.
+
+    Les paires au-dessus du seuil de confiance passent l'activité en payée ;
+    les autres alimentent la file de vérification. Une paire rejetée en
+    vérification n'est jamais reproposée.
+    """
+    tolerance = Decimal(
+        str(
+            tolerance
+            if tolerance is not None
+            else settings.PAYMENT_MATCH_AMOUNT_TOLERANCE
+        )
+    )
+    window = 60 * (
+        window_minutes
+        if window_minutes is not None
+        else settings.PAYMENT_MATCH_WINDOW_MINUTES
+    )
+    if auto_confidence is None:
+        auto_confidence = settings.PAYMENT_MATCH_AUTO_CONFIDENCE
+
+    lower, upper = day_bounds(day, day)
+    # Un reçu peut être émis peu après minuit pour une prestation de la veille.
+    receipts = _load_receipts(lower, upper + timedelta(seconds=window))
+    activities = _load_activities(lower, upper)
+    rejected = _load_rejected_pairs(lower, upper)
+    index = ReceiptIndex(receipts)
+
+    pairs = []
+    for activity in activities:
+        amount = (
+            activity.final_amount
+            if activity.final_amount is not None
+            else activity.expected_amount
+        )
+        if not amount or amount <= 0:
+            continue
+        reference = activity.end_at or activity.estimated_end_at or activity.start_at
+        timestamp = reference.timestamp()
+        staff_ref = (
+            activity.assigned_staff.loyverse_employee_id
+            if activity.assigned_staff
+            else ""
+        )
+        for receipt in index.candidates(amount, tolerance, timestamp, window):
+            if (activity.pk, receipt["pk"]) in rejected:
+                continue
+            score = score_pair(
+                abs(receipt["amount"] - amount),
+                tolerance,
+                abs(receipt["timestamp"] - timestamp),
+                window,
+                _staff_score(receipt["employee_ref"], staff_ref),
+            )
+            pairs.append((score, activity, receipt))
+
+    scores_by_key = defaultdict(list)
+    for score, activity, receipt in pairs:
+        scores_by_key[("activity", activity.pk)].append(score)
+        scores_by_key[("receipt", receipt["pk"])].append(score)
+
+    def is_ambiguous(key, score):
+        others = sorted(scores_by_key[key], reverse=True)
+        return len(others) > 1 and score - others[1] < AMBIGUITY_MARGIN
+
+    pairs.sort(key=lambda pair: (-pair[0], pair[1].pk, pair[2]["pk"]))
+    used_activities = set()
+    used_receipts = set()
+    links = []
+    paid = []
+    now = timezone.now()
+    result = MatchResult(day=day)
+    for score, activity, receipt in pairs:
+        if activity.pk in used_activities or receipt["pk"] in used_receipts:
+            continue
+        used_activities.add(activity.pk)
+        used_receipts.add(receipt["pk"])
+        confident = (
+            score >= auto_confidence
+            and not is_ambiguous(("activity", activity.pk), score)
+            and not is_ambiguous(("receipt", receipt["pk"]), score)
+        )
+        links.append(
+            PaymentLink(
+                activity=activity,
+                loyverse_receipt_id=receipt["pk"],
+                match_status=(
+                    PaymentLink.MatchStatus.AUTO
+                    if confident
+                    else PaymentLink.MatchStatus.REVIEW
+                ),
+                confidence=Decimal(str(round(score, 2))),
+            )
+        )
+        if confident:
+            activity.status = Activity.Status.PAID
+            if activity.final_amount is None:
+                activity.final_amount = receipt["amount"]
+            activity.updated_at = now
+            paid.append(activity)
+            result.auto += 1
+        else:
+            result.review += 1
+
+    result.unmatched_activities = len(activities) - len(used_activities)
+    result.unmatched_receipts = sum(
+        1
+        for receipt in receipts
+        if receipt["pk"] not in used_receipts
+        and receipt["timestamp"] < upper.timestamp()
+    )
+    if dry_run or not links:
+        return result
+
+    with transaction.atomic():
+        PaymentLink.objects.bulk_create(links, batch_size=500)
+        Activity.objects.bulk_update(
+            paid, ["status", "final_amount", "updated_at"], batch_size=500
+        )
+    if paid:
+        # bulk_update ne déclenche pas les signaux de post_save.
+        invalidate_kpi_days({day})
+        bump_domain_version("activities")
+    return result
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("operations", "0007_merge_20260120_0522"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="paymentlink",
+            name="confidence",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                max_digits=3,
+                null=True,
+                verbose_name="Indice de confiance",
+            ),
+        ),
+        migrations.AddField(
+            model_name="paymentlink",
+            name="match_status",
+            field=models.CharField(
+                choices=[
+                    ("MANUAL", "Manuel"),
+                    ("AUTO", "Automatique"),
+                    ("REVIEW", "À vérifier"),
+                    ("CONFIRMED", "Confirmé"),
+                ],
+                db_index=True,
+                default="MANUAL",
+                max_length=20,
+                verbose_name="Rapprochement",
+            ),
+        ),
+    ]
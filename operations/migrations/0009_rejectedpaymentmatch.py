@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("integrations", "0005_loyverse_receipt_normalization"),
+        ("operations", "0008_paymentlink_match_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RejectedPaymentMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Créé le"),
+                ),
+                (
+                    "activity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rejected_matches",
+                        to="operations.activity",
+                        verbose_name="Activité",
+                    ),
+                ),
+                (
+                    "loyverse_receipt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rejected_matches",
+                        to="integrations.loyversereceipt",
+                        verbose_name="Reçu Loyverse",
+                    ),
+                ),
+                (
+                    "rejected_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="rejected_payment_matches",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Rejeté par",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rapprochement rejeté",
+                "verbose_name_plural": "Rapprochements rejetés",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="rejectedpaymentmatch",
+            constraint=models.UniqueConstraint(
+                fields=("activity", "loyverse_receipt"),
+                name="unique_rejected_payment_match",
+            ),
+        ),
+    ]
@@ -195,6 +195,12 @@ class ActivityLine(models.Model):
 
 
 class PaymentLink(models.Model):
+    class MatchStatus(models.TextChoices):
+        MANUAL = "MANUAL", "Manuel"
+        AUTO = "AUTO", "Automatique"
+        REVIEW = "REVIEW", "À vérifier"
+        CONFIRMED = "CONFIRMED", "Confirmé"
+
     activity = models.OneToOneField(
         Activity,
         on_delete=models.CASCADE,
@@ -214,6 +220,20 @@ class PaymentLink(models.Model):
         blank=True,
         verbose_name="Référence manuelle",
     )
+    match_status = models.CharField(
+        max_length=20,
+        choices=MatchStatus.choices,
+        default=MatchStatus.MANUAL,
+        db_index=True,
+        verbose_name="Rapprochement",
+    )
+    confidence = models.DecimalField(
+        max_digits=3,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Indice de confiance",
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
 
     class Meta:
@@ -229,3 +249,42 @@ class PaymentLink(models.Model):
             raise ValidationError(
                 "Une référence manuelle ou un reçu Loyverse est requis."
             )
+
+
+class RejectedPaymentMatch(models.Model):
+    """Paire activité / reçu rejetée en vérification, jamais reproposée."""
+
+    activity = models.ForeignKey(
+        Activity,
+        on_delete=models.CASCADE,
+        related_name="rejected_matches",
+        verbose_name="Activité",
+    )
+    loyverse_receipt = models.ForeignKey(
+        "integrations.LoyverseReceipt",
+        on_delete=models.CASCADE,
+        related_name="rejected_matches",
+        verbose_name="Reçu Loyverse",
+    )
+    rejected_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="rejected_payment_matches",
+        verbose_name="Rejeté par",
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+
+    class Meta:
+        verbose_name = "Rapprochement rejeté"
+        verbose_name_plural = "Rapprochements rejetés"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["activity", "loyverse_receipt"],
+                name="unique_rejected_payment_match",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.activity} / {self.loyverse_receipt}"
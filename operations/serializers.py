@@ -1,7 +1,7 @@
 from django.utils import timezone
 from rest_framework import serializers
 
-from operations.models import Activity, ActivityLine, Service
+from operations.models import Activity, ActivityLine, PaymentLink, Service
 
 
 class PaymentLinkSerializer(serializers.Serializer):
@@ -12,6 +12,51 @@ class PaymentLinkSerializer(serializers.Serializer):
     )
 
 
+class MatchReceiptsSerializer(serializers.Serializer):
+    date = serializers.DateField(required=False)
+    dry_run = serializers.BooleanField(required=False, default=False)
+
+
+class PaymentReviewSerializer(serializers.ModelSerializer):
+    activity_client = serializers.CharField(source="activity.client", read_only=True)
+    activity_status = serializers.CharField(source="activity.status", read_only=True)
+    expected_amount = serializers.DecimalField(
+        source="activity.expected_amount",
+        max_digits=10,
+        decimal_places=2,
+        read_only=True,
+    )
+    receipt_reference = serializers.CharField(
+        source="loyverse_receipt.receipt_id", read_only=True
+    )
+    receipt_date = serializers.DateTimeField(
+        source="loyverse_receipt.receipt_date", read_only=True
+    )
+    receipt_total = serializers.DecimalField(
+        source="loyverse_receipt.total_money",
+        max_digits=12,
+        decimal_places=2,
+        read_only=True,
+    )
+
+    class Meta:
+        model = PaymentLink
+        fields = (
+            "id",
+            "activity",
+            "activity_client",
+            "activity_status",
+            "expected_amount",
+            "loyverse_receipt",
+            "receipt_reference",
+            "receipt_date",
+            "receipt_total",
+            "match_status",
+            "confidence",
+            "created_at",
+        )
+
+
 class ServiceSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source="category.name", read_only=True)
 
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from integrations.models import LoyverseReceipt
+from operations.matching import match_receipts_for_day
+from operations.models import Activity, PaymentLink, RejectedPaymentMatch
+
+
+def make_activity(amount, status=Activity.Status.TO_COLLECT, staff=None):
+    activity = Activity.objects.create(
+        type=Activity.Type.SERVICE,
+        status=status,
+        expected_amount=amount,
+        assigned_staff=staff,
+    )
+    activity.end_at = activity.start_at
+    activity.save(update_fields=["end_at"])
+    return activity
+
+
+def make_receipt(receipt_id, amount, at, employee_id=""):
+    return LoyverseReceipt.objects.create(
+        receipt_id=receipt_id,
+        raw_json={"id": receipt_id, "employee_id": employee_id},
+        receipt_type="SALE",
+        receipt_date=at,
+        total_money=amount,
+    )
+
+
+@override_settings(
+    PAYMENT_MATCH_AMOUNT_TOLERANCE="0",
+    PAYMENT_MATCH_WINDOW_MINUTES=90,
+    PAYMENT_MATCH_AUTO_CONFIDENCE=0.85,
+)
+class PaymentMatchingTests(TestCase):
+    def test_exact_match_marks_activity_paid(self):
+        activity = make_activity(15000)
+        receipt = make_receipt("r1", 15000, activity.end_at + timedelta(minutes=3))
+        make_receipt("r2", 9000, activity.end_at)
+
+        result = match_receipts_for_day(timezone.localdate(activity.start_at))
+
+        self.assertEqual((result.auto, result.review), (1, 0))
+        self.assertEqual(result.unmatched_receipts, 1)
+        link = PaymentLink.objects.get(activity=activity)
+        self.assertEqual(link.loyverse_receipt_id, receipt.pk)
+        self.assertEqual(link.match_status, PaymentLink.MatchStatus.AUTO)
+        activity.refresh_from_db()
+        self.assertEqual(activity.status, Activity.Status.PAID)
+        self.assertEqual(activity.final_amount, Decimal("15000"))
+
+    def test_ambiguous_receipts_go_to_review(self):
+        activity = make_activity(5000, status=Activity.Status.DONE)
+        make_receipt("r1", 5000, activity.end_at + timedelta(minutes=1))
+        make_receipt("r2", 5000, activity.end_at + timedelta(minutes=2))
+
+        result = match_receipts_for_day(timezone.localdate(activity.start_at))
+
+        self.assertEqual((result.auto, result.review), (0, 1))
+        activity.refresh_from_db()
+        self.assertEqual(activity.status, Activity.Status.DONE)
+
+    def test_staff_breaks_ties(self):
+        staff = User.objects.create_user(
+            username="coiffeuse", password="Test12345!", loyverse_employee_id="emp-2"
+        )
+        activity = make_activity(5000, staff=staff)
+        make_receipt("r1", 5000, activity.end_at, employee_id="emp-1")
+        expected = make_receipt("r2", 5000, activity.end_at, employee_id="emp-2")
+
+        result = match_receipts_for_day(timezone.localdate(activity.start_at))
+
+        self.assertEqual(result.auto, 1)
+        link = PaymentLink.objects.get(activity=activity)
+        self.assertEqual(link.loyverse_receipt_id, expected.pk)
+
+    def test_amount_and_window_are_enforced(self):
+        activity = make_activity(5000)
+        make_receipt("r1", 5100, activity.end_at)
+        make_receipt("r2", 5000, activity.end_at + timedelta(hours=3))
+
+        result = match_receipts_for_day(timezone.localdate(activity.start_at))
+
+        self.assertEqual((result.auto, result.review), (0, 0))
+        self.assertEqual(result.unmatched_activities, 1)
+        self.assertFalse(PaymentLink.objects.exists())
+
+    def test_linked_receipts_are_not_reused(self):
+        first = make_activity(5000)
+        receipt = make_receipt("r1", 5000, first.end_at)
+        match_receipts_for_day(timezone.localdate(first.start_at))
+        second = make_activity(5000)
+
+        match_receipts_for_day(timezone.localdate(second.start_at))
+
+        self.assertEqual(receipt.payment_links.count(), 1)
+        self.assertFalse(PaymentLink.objects.filter(activity=second).exists())
+
+
+@override_settings(PAYMENT_MATCH_AMOUNT_TOLERANCE="0")
+class PaymentReviewApiTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="manager", password="Test12345!", role=User.Role.MANAGER
+        )
+        self.client.force_authenticate(user=self.manager)
+
+    def test_review_queue_confirm_and_reject(self):
+        confirmed = make_activity(5000)
+        rejected = make_activity(7000)
+        for index, activity in enumerate([confirmed, confirmed, rejected, rejected]):
+            make_receipt(f"r{index}", activity.expected_amount, activity.end_at)
+
+        response = self.client.post(
+            "/api/activities/match_receipts/",
+            {"date": timezone.localdate(confirmed.start_at).isoformat()},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["review"], 2)
+
+        response = self.client.get("/api/activities/payment_review/")
+        self.assertEqual(len(response.data), 2)
+
+        response = self.client.post(f"/api/activities/{confirmed.id}/confirm_payment/")
+        self.assertEqual(response.status_code, 200)
+        confirmed.refresh_from_db()
+        self.assertEqual(confirmed.status, Activity.Status.PAID)
+        self.assertEqual(
+            confirmed.payment_link.match_status, PaymentLink.MatchStatus.CONFIRMED
+        )
+
+        response = self.client.post(f"/api/activities/{rejected.id}/reject_payment/")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(PaymentLink.objects.filter(activity=rejected).exists())
+
+    def test_rejected_pair_is_not_proposed_again(self):
+        activity = make_activity(5000)
+        receipt = make_receipt("r1", 5000, activity.end_at)
+        other = make_receipt("r2", 5000, activity.end_at + timedelta(minutes=1))
+        day = timezone.localdate(activity.start_at).isoformat()
+        response = self.client.post(
+            "/api/activities/match_receipts/", {"date": day}, format="json"
+        )
+        self.assertEqual(response.data["review"], 1)
+        self.assertEqual(activity.payment_link.loyverse_receipt_id, receipt.pk)
+
+        response = self.client.post(f"/api/activities/{activity.id}/reject_payment/")
+        self.assertEqual(response.status_code, 204)
+        self.assertTrue(
+            RejectedPaymentMatch.objects.filter(
+                activity=activity, loyverse_receipt=receipt, rejected_by=self.manager
+            ).exists()
+        )
+
+        response = self.client.post(
+            "/api/activities/match_receipts/", {"date": day}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["auto"] + response.data["review"], 1)
+        link = PaymentLink.objects.get(activity=activity)
+        self.assertEqual(link.loyverse_receipt_id, other.pk)
+        self.assertFalse(receipt.payment_links.exists())
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status, viewsets
@@ -8,17 +9,49 @@ from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.response import Response
 
 from integrations.models import LoyverseReceipt
-from operations.models import Activity, ActivityLine, PaymentLink, Service
+from operations.matching import match_receipts_for_day
+from operations.models import (
+    Activity,
+    ActivityLine,
+    PaymentLink,
+    RejectedPaymentMatch,
+    Service,
+)
 from operations.serializers import (
     ActivityLineSerializer,
     ActivitySerializer,
+    MatchReceiptsSerializer,
     PaymentLinkSerializer,
+    PaymentReviewSerializer,
     ServiceSerializer,
 )
 
 User = get_user_model()
 
 
+def _require_manager(request) -> None:
+    if request.user.role not in {"MANAGER", "ADMIN"}:
+        raise DRFValidationError({"detail": "Accès réservé aux gestionnaires."})
+
+
+def _mark_paid(activity: Activity, final_amount=None) -> None:
+    if activity.status == Activity.Status.DONE:
+        activity.status = Activity.Status.TO_COLLECT
+    if activity.status == Activity.Status.TO_COLLECT:
+        activity.status = Activity.Status.PAID
+    elif activity.status != Activity.Status.PAID:
+        raise DRFValidationError(
+            {"detail": "Le statut doit être terminé ou à encaisser."}
+        )
+
+    if final_amount is not None:
+        activity.final_amount = final_amount
+    elif activity.final_amount is None:
+        activity.final_amount = activity.expected_amount
+
+    activity.save(update_fields=["status", "final_amount", "updated_at"])
+
+
 class ServiceViewSet(viewsets.ModelViewSet):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
@@ -73,8 +106,7 @@ class ActivityViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["post"])
     def link_payment(self, request, pk=None):
         activity = self.get_object()
-        if request.user.role not in {"MANAGER", "ADMIN"}:
-            raise DRFValidationError({"detail": "Accès réservé aux gestionnaires."})
+        _require_manager(request)
 
         serializer = PaymentLinkSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -98,24 +130,12 @@ class ActivityViewSet(viewsets.ModelViewSet):
             defaults={
                 "loyverse_receipt": loyverse_receipt,
                 "manual_reference": manual_reference,
+                "match_status": PaymentLink.MatchStatus.MANUAL,
+                "confidence": None,
             },
         )
 
-        if activity.status == Activity.Status.DONE:
-            activity.status = Activity.Status.TO_COLLECT
-        if activity.status == Activity.Status.TO_COLLECT:
-            activity.status = Activity.Status.PAID
-        elif activity.status != Activity.Status.PAID:
-            raise DRFValidationError(
-                {"detail": "Le statut doit être terminé ou à encaisser."}
-            )
-
-        if final_amount is not None:
-            activity.final_amount = final_amount
-        elif activity.final_amount is None:
-            activity.final_amount = activity.expected_amount
-
-        activity.save(update_fields=["status", "final_amount", "updated_at"])
+        _mark_paid(activity, final_amount)
 
         return Response(
             {
@@ -126,3 +146,74 @@ class ActivityViewSet(viewsets.ModelViewSet):
             },
             status=status.HTTP_200_OK,
         )
+
+    @action(detail=False, methods=["post"])
+    def match_receipts(self, request):
+        _require_manager(request)
+        serializer = MatchReceiptsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        day = serializer.validated_data.get("date") or timezone.localdate()
+        result = match_receipts_for_day(
+            day, dry_run=serializer.validated_data["dry_run"]
+        )
+        return Response(
+            {
+                "date": day.isoformat(),
+                "auto": result.auto,
+                "review": result.review,
+                "unmatched_activities": result.unmatched_activities,
+                "unmatched_receipts": result.unmatched_receipts,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"])
+    def payment_review(self, request):
+        _require_manager(request)
+        links = (
+            PaymentLink.objects.filter(match_status=PaymentLink.MatchStatus.REVIEW)
+            .select_related("activity", "loyverse_receipt")
+            .order_by("-confidence", "activity_id")
+        )
+        serializer = PaymentReviewSerializer(links, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"])
+    def confirm_payment(self, request, pk=None):
+        activity = self.get_object()
+        _require_manager(request)
+        payment_link = get_object_or_404(
+            PaymentLink.objects.select_related("loyverse_receipt"),
+            activity=activity,
+            match_status=PaymentLink.MatchStatus.REVIEW,
+        )
+        receipt = payment_link.loyverse_receipt
+        final_amount = None
+        if activity.final_amount is None and receipt is not None:
+            final_amount = receipt.total_money
+        _mark_paid(activity, final_amount)
+        payment_link.match_status = PaymentLink.MatchStatus.CONFIRMED
+        payment_link.save(update_fields=["match_status"])
+        return Response(
+            PaymentReviewSerializer(payment_link).data, status=status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=["post"])
+    def reject_payment(self, request, pk=None):
+        activity = self.get_object()
+        _require_manager(request)
+        payment_link = get_object_or_404(
+            PaymentLink,
+            activity=activity,
+            match_status=PaymentLink.MatchStatus.REVIEW,
+        )
+        with transaction.atomic():
+            # Mémorise la paire pour que le prochain rapprochement ne la repropose pas.
+            if payment_link.loyverse_receipt_id:
+                RejectedPaymentMatch.objects.get_or_create(
+                    activity=activity,
+                    loyverse_receipt_id=payment_link.loyverse_receipt_id,
+                    defaults={"rejected_by": request.user},
+                )
+            payment_link.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
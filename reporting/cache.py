@@ -0,0 +1,94 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+DOMAINS = ("activities", "tasks", "content", "care_wigs", "stock")
+VIEWS = ("overview", "today", "rendement")
+
+_MISSING = object()
+
+
+def _version_key(domain: str) -> str:
+    return f"dashboard:version:{domain}"
+
+
+def _stats_key(view_name: str, outcome: str) -> str:
+    return f"dashboard:stats:{view_name}:{outcome}"
+
+
+def _initial_version() -> int:
+    # Un horodatage évite de réutiliser une ancienne version si la clé a été évincée.
+    return int(time.time() * 1000)
+
+
+def get_domain_versions(domains) -> dict:
+    keys = {_version_key(domain): domain for domain in domains}
+    found = cache.get_many(keys.keys())
+    versions = {}
+    for key, domain in keys.items():
+        version = found.get(key)
+        if version is None:
+            version = _initial_version()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        versions[domain] = version
+    return versions
+
+
+def bump_domain_version(domain: str) -> None:
+    key = _version_key(domain)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def _count(view_name: str, outcome: str) -> None:
+    key = _stats_key(view_name, outcome)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def cached_dashboard(view_name: str, params: dict, domains, compute):
+    """Retourne le résultat de ``compute`` en cache pour ces filtres et versions."""
+    versions = get_domain_versions(domains)
+    payload = json.dumps(
+        {"params": params, "versions": versions}, sort_keys=True, default=str
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    key = f"dashboard:{view_name}:{digest}"
+
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _count(view_name, "hits")
+        return value
+
+    _count(view_name, "misses")
+    value = compute()
+    cache.set(key, value, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+    return value
+
+
+def get_cache_stats() -> dict:
+    keys = [
+        _stats_key(view_name, outcome)
+        for view_name in VIEWS
+        for outcome in ("hits", "misses")
+    ]
+    counters = cache.get_many(keys)
+    return {
+        "vues": {
+            view_name: {
+                "hits": counters.get(_stats_key(view_name, "hits"), 0),
+                "misses": counters.get(_stats_key(view_name, "misses"), 0),
+            }
+            for view_name in VIEWS
+        },
+        "versions": get_domain_versions(DOMAINS),
+    }
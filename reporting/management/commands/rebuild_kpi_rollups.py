@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reporting.rollups import build_kpi_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcule les agrégats KPI quotidiens du tableau de bord."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            dest="since",
+            help="Premier jour à recalculer (ex: 2024-01-01). Par défaut : 90 jours.",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            dest="chunk_days",
+            type=int,
+            default=31,
+            help="Nombre de jours recalculés par lot.",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        end_date = today - timedelta(days=1)
+        since_value = options.get("since")
+        if since_value:
+            try:
+                start_date = datetime.strptime(since_value, "%Y-%m-%d").date()
+            except ValueError:
+                self.stdout.write(
+                    self.style.ERROR("Format de date invalide pour --since.")
+                )
+                return
+        else:
+            start_date = today - timedelta(days=90)
+
+        if start_date > end_date:
+            self.stdout.write(self.style.WARNING("Aucun jour clôturé à recalculer."))
+            return
+
+        chunk_days = max(options.get("chunk_days") or 1, 1)
+        rebuilt = 0
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+            rebuilt += build_kpi_rollups(chunk_start, chunk_end)
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Jours recalculés : {rebuilt}"))
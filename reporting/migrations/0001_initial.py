@@ -0,0 +1,198 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("operations", "0007_merge_20260120_0522"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityKpiRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Jour")),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[
+                            ("TOTAL", "Toutes prestations"),
+                            ("SERVICE", "Service"),
+                            ("CATEGORY", "Catégorie"),
+                        ],
+                        default="TOTAL",
+                        max_length=20,
+                        verbose_name="Périmètre",
+                    ),
+                ),
+                ("status", models.CharField(max_length=30, verbose_name="Statut")),
+                (
+                    "activities_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Activités"),
+                ),
+                (
+                    "expected_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Montant attendu",
+                    ),
+                ),
+                (
+                    "final_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Montant final",
+                    ),
+                ),
+                (
+                    "lines_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Lignes"),
+                ),
+                (
+                    "lines_quantity",
+                    models.PositiveIntegerField(default=0, verbose_name="Quantité"),
+                ),
+                (
+                    "lines_revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Chiffre des lignes",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Agrégat KPI activité",
+                "verbose_name_plural": "Agrégats KPI activités",
+            },
+        ),
+        migrations.CreateModel(
+            name="ContentKpiRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Jour")),
+                (
+                    "platform",
+                    models.CharField(max_length=20, verbose_name="Plateforme"),
+                ),
+                ("status", models.CharField(max_length=30, verbose_name="Statut")),
+                (
+                    "items_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Contenus"),
+                ),
+            ],
+            options={
+                "verbose_name": "Agrégat KPI contenu",
+                "verbose_name_plural": "Agrégats KPI contenus",
+            },
+        ),
+        migrations.CreateModel(
+            name="KpiRollupDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(unique=True, verbose_name="Jour")),
+                (
+                    "tasks_created",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Tâches créées"
+                    ),
+                ),
+                (
+                    "tasks_done",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Tâches terminées"
+                    ),
+                ),
+                (
+                    "metrics_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Métriques publiées"
+                    ),
+                ),
+                (
+                    "metrics_score_sum",
+                    models.FloatField(default=0, verbose_name="Somme des scores"),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Calculé le"),
+                ),
+            ],
+            options={
+                "verbose_name": "Agrégat KPI quotidien",
+                "verbose_name_plural": "Agrégats KPI quotidiens",
+                "ordering": ["-day"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="contentkpirollup",
+            constraint=models.UniqueConstraint(
+                fields=("day", "platform", "status"), name="unique_content_kpi_rollup"
+            ),
+        ),
+        migrations.AddField(
+            model_name="activitykpirollup",
+            name="category",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="kpi_rollups",
+                to="operations.servicecategory",
+                verbose_name="Catégorie",
+            ),
+        ),
+        migrations.AddField(
+            model_name="activitykpirollup",
+            name="service",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="kpi_rollups",
+                to="operations.service",
+                verbose_name="Service",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitykpirollup",
+            index=models.Index(
+                fields=["scope", "day"], name="reporting_a_scope_3ff93a_idx"
+            ),
+        ),
+    ]
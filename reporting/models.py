@@ -0,0 +1,101 @@
+from django.db import models
+
+
+class KpiRollupDay(models.Model):
+    day = models.DateField(unique=True, verbose_name="Jour")
+    tasks_created = models.PositiveIntegerField(default=0, verbose_name="Tâches créées")
+    tasks_done = models.PositiveIntegerField(default=0, verbose_name="Tâches terminées")
+    metrics_count = models.PositiveIntegerField(
+        default=0, verbose_name="Métriques publiées"
+    )
+    metrics_score_sum = models.FloatField(default=0, verbose_name="Somme des scores")
+    computed_at = models.DateTimeField(auto_now=True, verbose_name="Calculé le")
+
+    class Meta:
+        verbose_name = "Agrégat KPI quotidien"
+        verbose_name_plural = "Agrégats KPI quotidiens"
+        ordering = ["-day"]
+
+    def __str__(self) -> str:
+        return f"KPI {self.day:%d/%m/%Y}"
+
+
+class ActivityKpiRollup(models.Model):
+    class Scope(models.TextChoices):
+        TOTAL = "TOTAL", "Toutes prestations"
+        SERVICE = "SERVICE", "Service"
+        CATEGORY = "CATEGORY", "Catégorie"
+
+    day = models.DateField(verbose_name="Jour")
+    scope = models.CharField(
+        max_length=20,
+        choices=Scope.choices,
+        default=Scope.TOTAL,
+        verbose_name="Périmètre",
+    )
+    service = models.ForeignKey(
+        "operations.Service",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="kpi_rollups",
+        verbose_name="Service",
+    )
+    category = models.ForeignKey(
+        "operations.ServiceCategory",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="kpi_rollups",
+        verbose_name="Catégorie",
+    )
+    status = models.CharField(max_length=30, verbose_name="Statut")
+    activities_count = models.PositiveIntegerField(default=0, verbose_name="Activités")
+    expected_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Montant attendu",
+    )
+    final_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Montant final",
+    )
+    lines_count = models.PositiveIntegerField(default=0, verbose_name="Lignes")
+    lines_quantity = models.PositiveIntegerField(default=0, verbose_name="Quantité")
+    lines_revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Chiffre des lignes",
+    )
+
+    class Meta:
+        verbose_name = "Agrégat KPI activité"
+        verbose_name_plural = "Agrégats KPI activités"
+        indexes = [models.Index(fields=["scope", "day"])]
+
+    def __str__(self) -> str:
+        return f"{self.day:%d/%m/%Y} - {self.get_scope_display()} - {self.status}"
+
+
+class ContentKpiRollup(models.Model):
+    day = models.DateField(verbose_name="Jour")
+    platform = models.CharField(max_length=20, verbose_name="Plateforme")
+    status = models.CharField(max_length=30, verbose_name="Statut")
+    items_count = models.PositiveIntegerField(default=0, verbose_name="Contenus")
+
+    class Meta:
+        verbose_name = "Agrégat KPI contenu"
+        verbose_name_plural = "Agrégats KPI contenus"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "platform", "status"],
+                name="unique_content_kpi_rollup",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day:%d/%m/%Y} - {self.platform} - {self.status}"
@@ -0,0 +1,428 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, TruncDate
+from django.utils import timezone
+
+from content.models import ContentItem, ContentMetric
+from operations.models import Activity, ActivityLine, Service
+from reporting.models import ActivityKpiRollup, ContentKpiRollup, KpiRollupDay
+from tasks.models import Task
+
+PUBLISHED_STATUSES = [
+    ContentItem.Status.PUBLISHED,
+    ContentItem.Status.METRICS_RECORDED,
+]
+
+
+def day_bounds(start_date, end_date):
+    """Retourne les bornes [début, fin[ en heure locale pour une plage de jours."""
+    tz = timezone.get_current_timezone()
+    lower = timezone.make_aware(datetime.combine(start_date, time.min), tz)
+    upper = timezone.make_aware(
+        datetime.combine(end_date + timedelta(days=1), time.min), tz
+    )
+    return lower, upper
+
+
+def _iter_days(start_date, end_date):
+    current = start_date
+    while current <= end_date:
+        yield current
+        current += timedelta(days=1)
+
+
+def _contiguous_runs(days):
+    runs = []
+    for day in sorted(days):
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def _metric_score_expression():
+    interactions = F("likes") + F("comments") + F("shares") + F("saves")
+    return models.Case(
+        models.When(
+            reach__gt=0,
+            then=Cast(interactions, FloatField())
+            * Value(100.0)
+            / Cast(F("reach"), FloatField()),
+        ),
+        default=Cast(interactions, FloatField()),
+        output_field=FloatField(),
+    )
+
+
+def compute_kpi_rollups(start_date, end_date):
+    """Calcule en mémoire les agrégats KPI d'une plage de jours sans les enregistrer."""
+    lower, upper = day_bounds(start_date, end_date)
+    days = {day: KpiRollupDay(day=day) for day in _iter_days(start_date, end_date)}
+    activity_rows = {}
+
+    def _activity_row(day, scope, status, service_id=None, category_id=None):
+        key = (day, scope, service_id, category_id, status)
+        row = activity_rows.get(key)
+        if row is None:
+            row = ActivityKpiRollup(
+                day=day,
+                scope=scope,
+                service_id=service_id,
+                category_id=category_id,
+                status=status,
+            )
+            activity_rows[key] = row
+        return row
+
+    def _add_activity(row, expected_amount, final_amount):
+        row.activities_count += 1
+        row.expected_amount += expected_amount
+        row.final_amount += final_amount
+
+    activities = {}
+    activity_values = Activity.objects.filter(
+        start_at__gte=lower, start_at__lt=upper
+    ).values_list("id", "start_at", "status", "expected_amount", "final_amount")
+    for activity_id, start_at, status, expected_amount, final_amount in activity_values:
+        day = timezone.localtime(start_at).date()
+        activities[activity_id] = (
+            day,
+            status,
+            expected_amount or Decimal("0"),
+            final_amount or Decimal("0"),
+        )
+        _add_activity(
+            _activity_row(day, ActivityKpiRollup.Scope.TOTAL, status),
+            expected_amount or Decimal("0"),
+            final_amount or Decimal("0"),
+        )
+
+    services_by_activity = defaultdict(dict)
+    line_values = ActivityLine.objects.filter(
+        activity__start_at__gte=lower,
+        activity__start_at__lt=upper,
+        service__isnull=False,
+    ).values_list(
+        "activity_id", "service_id", "service__category_id", "quantity", "unit_price"
+    )
+    for activity_id, service_id, category_id, quantity, unit_price in line_values:
+        activity = activities.get(activity_id)
+        if activity is None:
+            continue
+        day, status, _, _ = activity
+        row = _activity_row(
+            day, ActivityKpiRollup.Scope.SERVICE, status, service_id, category_id
+        )
+        row.lines_count += 1
+        row.lines_quantity += quantity
+        row.lines_revenue += quantity * unit_price
+        services_by_activity[activity_id][service_id] = category_id
+
+    for activity_id, services in services_by_activity.items():
+        day, status, expected_amount, final_amount = activities[activity_id]
+        for service_id, category_id in services.items():
+            _add_activity(
+                _activity_row(
+                    day,
+                    ActivityKpiRollup.Scope.SERVICE,
+                    status,
+                    service_id,
+                    category_id,
+                ),
+                expected_amount,
+                final_amount,
+            )
+        for category_id in {value for value in services.values() if value}:
+            _add_activity(
+                _activity_row(
+                    day,
+                    ActivityKpiRollup.Scope.CATEGORY,
+                    status,
+                    category_id=category_id,
+                ),
+                expected_amount,
+                final_amount,
+            )
+
+    tasks_created = (
+        Task.objects.filter(created_at__gte=lower, created_at__lt=upper)
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(count=Count("id"))
+    )
+    for item in tasks_created:
+        days[item["day"]].tasks_created = item["count"]
+
+    tasks_done = (
+        Task.objects.filter(
+            status=Task.Status.DONE, updated_at__gte=lower, updated_at__lt=upper
+        )
+        .annotate(day=TruncDate("updated_at"))
+        .values("day")
+        .annotate(count=Count("id"))
+    )
+    for item in tasks_done:
+        days[item["day"]].tasks_done = item["count"]
+
+    metrics = (
+        ContentMetric.objects.filter(
+            content_item__status__in=PUBLISHED_STATUSES,
+            created_at__gte=lower,
+            created_at__lt=upper,
+        )
+        .annotate(day=TruncDate("created_at"), score=_metric_score_expression())
+        .values("day")
+        .annotate(count=Count("id"), score_sum=Sum("score"))
+    )
+    for item in metrics:
+        days[item["day"]].metrics_count = item["count"]
+        days[item["day"]].metrics_score_sum = item["score_sum"] or 0.0
+
+    content_rows = [
+        ContentKpiRollup(
+            day=item["day"],
+            platform=item["platform"],
+            status=item["status"],
+            items_count=item["count"],
+        )
+        for item in ContentItem.objects.filter(
+            created_at__gte=lower, created_at__lt=upper
+        )
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "platform", "status")
+        .annotate(count=Count("id"))
+    ]
+
+    return days, list(activity_rows.values()), content_rows
+
+
+def build_kpi_rollups(start_date, end_date) -> int:
+    """Recalcule et enregistre les agrégats KPI d'une plage de jours."""
+    days, activity_rows, content_rows = compute_kpi_rollups(start_date, end_date)
+    with transaction.atomic():
+        KpiRollupDay.objects.filter(day__range=(start_date, end_date)).delete()
+        ActivityKpiRollup.objects.filter(day__range=(start_date, end_date)).delete()
+        ContentKpiRollup.objects.filter(day__range=(start_date, end_date)).delete()
+        KpiRollupDay.objects.bulk_create(days.values())
+        ActivityKpiRollup.objects.bulk_create(activity_rows, batch_size=500)
+        ContentKpiRollup.objects.bulk_create(content_rows, batch_size=500)
+    return len(days)
+
+
+def ensure_kpi_rollups(start_date, end_date) -> int:
+    """Construit les agrégats manquants des jours clôturés de la plage."""
+    closed_end = min(end_date, timezone.localdate() - timedelta(days=1))
+    if start_date > closed_end:
+        return 0
+    existing = set(
+        KpiRollupDay.objects.filter(day__range=(start_date, closed_end)).values_list(
+            "day", flat=True
+        )
+    )
+    missing = [day for day in _iter_days(start_date, closed_end) if day not in existing]
+    built = 0
+    for run_start, run_end in _contiguous_runs(missing):
+        built += build_kpi_rollups(run_start, run_end)
+    return built
+
+
+def invalidate_kpi_days(days) -> None:
+    """Supprime les agrégats des jours clôturés touchés par une écriture."""
+    today = timezone.localdate()
+    closed_days = {day for day in days if day and day < today}
+    if not closed_days:
+        return
+    KpiRollupDay.objects.filter(day__in=closed_days).delete()
+    ActivityKpiRollup.objects.filter(day__in=closed_days).delete()
+    ContentKpiRollup.objects.filter(day__in=closed_days).delete()
+
+
+def _activity_scope_filter(service_ids, category_id):
+    if service_ids is None:
+        return {"scope": ActivityKpiRollup.Scope.TOTAL}
+    if category_id is not None:
+        return {"scope": ActivityKpiRollup.Scope.CATEGORY, "category_id": category_id}
+    return {"scope": ActivityKpiRollup.Scope.SERVICE, "service_id__in": service_ids}
+
+
+def _row_matches(row, filters) -> bool:
+    if row.scope != filters["scope"]:
+        return False
+    if "category_id" in filters and row.category_id != filters["category_id"]:
+        return False
+    if "service_id__in" in filters and row.service_id not in filters["service_id__in"]:
+        return False
+    return True
+
+
+def get_overview_kpis(start_date, end_date, service_ids=None, category_id=None):
+    """Assemble les KPI du tableau de bord depuis les agrégats et le jour courant.
+
+    ``service_ids`` vaut ``None`` sans filtre de prestation ; ``category_id``
+    indique un filtre par secteur.
+    """
+    ensure_kpi_rollups(start_date, end_date)
+    today = timezone.localdate()
+    closed_end = min(end_date, today - timedelta(days=1))
+    live_start = max(start_date, today)
+
+    live_days, live_activity_rows, live_content_rows = {}, [], []
+    if live_start <= end_date:
+        live_days, live_activity_rows, live_content_rows = compute_kpi_rollups(
+            live_start, end_date
+        )
+
+    kpis = {
+        "activities_total": 0,
+        "activities_paid": 0,
+        "revenue_expected": Decimal("0"),
+        "revenue_final": Decimal("0"),
+        "tasks_total": 0,
+        "tasks_done": 0,
+        "content_total": 0,
+        "content_approved": 0,
+        "content_published": 0,
+        "content_score_avg": 0.0,
+        "platform_counts": {},
+        "prestations": [],
+    }
+
+    activity_items = []
+    line_items = []
+    has_closed_days = start_date <= closed_end
+    if service_ids is None or service_ids:
+        filters = _activity_scope_filter(service_ids, category_id)
+        if has_closed_days:
+            activity_items.extend(
+                ActivityKpiRollup.objects.filter(
+                    day__range=(start_date, closed_end), **filters
+                )
+                .values("status")
+                .annotate(
+                    activities=Sum("activities_count"),
+                    expected=Sum("expected_amount"),
+                    final=Sum("final_amount"),
+                )
+            )
+        activity_items.extend(
+            {
+                "status": row.status,
+                "activities": row.activities_count,
+                "expected": row.expected_amount,
+                "final": row.final_amount,
+            }
+            for row in live_activity_rows
+            if _row_matches(row, filters)
+        )
+
+        line_filters = {
+            "scope": ActivityKpiRollup.Scope.SERVICE,
+            "status": Activity.Status.PAID,
+        }
+        if service_ids is not None:
+            line_filters["service_id__in"] = service_ids
+        if has_closed_days:
+            line_items.extend(
+                ActivityKpiRollup.objects.filter(
+                    day__range=(start_date, closed_end), **line_filters
+                )
+                .values("service__name")
+                .annotate(
+                    total_lines=Sum("lines_count"),
+                    total_qty=Sum("lines_quantity"),
+                    revenue=Sum("lines_revenue"),
+                )
+            )
+        live_lines = [
+            row
+            for row in live_activity_rows
+            if row.status == Activity.Status.PAID and _row_matches(row, line_filters)
+        ]
+        if live_lines:
+            names = dict(
+                Service.objects.filter(
+                    id__in={row.service_id for row in live_lines}
+                ).values_list("id", "name")
+            )
+            line_items.extend(
+                {
+                    "service__name": names.get(row.service_id),
+                    "total_lines": row.lines_count,
+                    "total_qty": row.lines_quantity,
+                    "revenue": row.lines_revenue,
+                }
+                for row in live_lines
+            )
+
+    for item in activity_items:
+        kpis["activities_total"] += item["activities"] or 0
+        kpis["revenue_expected"] += item["expected"] or 0
+        if item["status"] == Activity.Status.PAID:
+            kpis["activities_paid"] += item["activities"] or 0
+            kpis["revenue_final"] += item["final"] or 0
+
+    prestations = {}
+    for item in line_items:
+        entry = prestations.setdefault(
+            item["service__name"],
+            {"total_lines": 0, "total_qty": 0, "revenue": Decimal("0")},
+        )
+        entry["total_lines"] += item["total_lines"] or 0
+        entry["total_qty"] += item["total_qty"] or 0
+        entry["revenue"] += item["revenue"] or 0
+    kpis["prestations"] = sorted(
+        ({"name": name, **values} for name, values in prestations.items()),
+        key=lambda entry: entry["revenue"],
+        reverse=True,
+    )
+
+    metrics_count = 0
+    metrics_score_sum = 0.0
+    if has_closed_days:
+        day_totals = KpiRollupDay.objects.filter(
+            day__range=(start_date, closed_end)
+        ).aggregate(
+            tasks_created=Sum("tasks_created"),
+            tasks_done=Sum("tasks_done"),
+            metrics_count=Sum("metrics_count"),
+            metrics_score_sum=Sum("metrics_score_sum"),
+        )
+        kpis["tasks_total"] += day_totals["tasks_created"] or 0
+        kpis["tasks_done"] += day_totals["tasks_done"] or 0
+        metrics_count += day_totals["metrics_count"] or 0
+        metrics_score_sum += day_totals["metrics_score_sum"] or 0.0
+    for day in live_days.values():
+        kpis["tasks_total"] += day.tasks_created
+        kpis["tasks_done"] += day.tasks_done
+        metrics_count += day.metrics_count
+        metrics_score_sum += day.metrics_score_sum
+    if metrics_count:
+        kpis["content_score_avg"] = metrics_score_sum / metrics_count
+
+    content_items = []
+    if has_closed_days:
+        content_items.extend(
+            ContentKpiRollup.objects.filter(day__range=(start_date, closed_end))
+            .values("platform", "status")
+            .annotate(count=Sum("items_count"))
+        )
+    content_items.extend(
+        {"platform": row.platform, "status": row.status, "count": row.items_count}
+        for row in live_content_rows
+    )
+    platform_counts = defaultdict(int)
+    for item in content_items:
+        count = item["count"] or 0
+        platform_counts[item["platform"]] += count
+        kpis["content_total"] += count
+        if item["status"] == ContentItem.Status.APPROVED:
+            kpis["content_approved"] += count
+        if item["status"] in PUBLISHED_STATUSES:
+            kpis["content_published"] += count
+    kpis["platform_counts"] = dict(sorted(platform_counts.items()))
+    return kpis
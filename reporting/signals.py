@@ -0,0 +1,104 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from content.models import ContentApproval, ContentItem, ContentMetric
+from inventory.models import StockLevel, StockMove
+from operations.models import Activity, ActivityLine
+from reporting.cache import bump_domain_version
+from reporting.rollups import invalidate_kpi_days
+from tasks.models import Task
+from wigs.models import CareWig
+
+CACHE_DOMAINS = {
+    Activity: "activities",
+    ActivityLine: "activities",
+    Task: "tasks",
+    ContentItem: "content",
+    ContentApproval: "content",
+    ContentMetric: "content",
+    CareWig: "care_wigs",
+    StockLevel: "stock",
+    # Les niveaux de stock sont mis à jour par delta, sans signal.
+    StockMove: "stock",
+}
+
+
+def _local_day(value):
+    return timezone.localtime(value).date() if value else None
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+def invalidate_activity_rollups(sender, instance, **kwargs):
+    invalidate_kpi_days({_local_day(instance.start_at)})
+
+
+@receiver(post_save, sender=ActivityLine)
+@receiver(post_delete, sender=ActivityLine)
+def invalidate_activity_line_rollups(sender, instance, **kwargs):
+    start_at = (
+        Activity.objects.filter(pk=instance.activity_id)
+        .values_list("start_at", flat=True)
+        .first()
+    )
+    invalidate_kpi_days({_local_day(start_at)})
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_previous_day(sender, instance, **kwargs):
+    previous = None
+    if instance.pk:
+        previous = (
+            Task.objects.filter(pk=instance.pk)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+    instance._kpi_previous_updated_at = previous
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_rollups(sender, instance, **kwargs):
+    invalidate_kpi_days(
+        {
+            _local_day(instance.created_at),
+            _local_day(instance.updated_at),
+            _local_day(getattr(instance, "_kpi_previous_updated_at", None)),
+        }
+    )
+
+
+@receiver(post_save, sender=ContentItem)
+@receiver(post_delete, sender=ContentItem)
+def invalidate_content_rollups(sender, instance, **kwargs):
+    days = {_local_day(instance.created_at)}
+    if kwargs.get("signal") is post_save:
+        days.update(
+            _local_day(created_at)
+            for created_at in instance.metrics.values_list("created_at", flat=True)
+        )
+    invalidate_kpi_days(days)
+
+
+@receiver(post_save, sender=ContentMetric)
+@receiver(post_delete, sender=ContentMetric)
+def invalidate_content_metric_rollups(sender, instance, **kwargs):
+    invalidate_kpi_days({_local_day(instance.created_at)})
+
+
+def bump_dashboard_cache_version(sender, **kwargs):
+    bump_domain_version(CACHE_DOMAINS[sender])
+
+
+for model in CACHE_DOMAINS:
+    post_save.connect(
+        bump_dashboard_cache_version,
+        sender=model,
+        dispatch_uid=f"dashboard-cache-save-{model._meta.label_lower}",
+    )
+    post_delete.connect(
+        bump_dashboard_cache_version,
+        sender=model,
+        dispatch_uid=f"dashboard-cache-delete-{model._meta.label_lower}",
+    )
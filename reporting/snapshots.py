@@ -0,0 +1,170 @@
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from content.models import ContentItem
+from inventory.models import StockLevel
+from operations.models import Activity, ActivityLine
+from reporting.rollups import day_bounds
+from tasks.models import Task
+from wigs.models import CareWig
+
+
+@dataclass
+class PrestationSummary:
+    name: str
+    total_lines: int = 0
+    total_qty: int = 0
+    revenue: Decimal = Decimal("0")
+
+    @property
+    def avg_ticket(self) -> float:
+        if not self.total_lines:
+            return 0
+        return round(float(self.revenue / self.total_lines), 2)
+
+
+@dataclass
+class TodaySnapshot:
+    day: date
+    activities_today: int = 0
+    tasks_due: int = 0
+    content_scheduled: int = 0
+    expected_revenue: Decimal = Decimal("0")
+    activities_summary: dict = field(default_factory=dict)
+    tasks_summary: dict = field(default_factory=dict)
+    content_summary: dict = field(default_factory=dict)
+    care_wigs_summary: dict = field(default_factory=dict)
+    stock_alerts: int = 0
+    prestations_today: list = field(default_factory=list)
+    prestations_categories: list = field(default_factory=list)
+    prestations_schedule: list = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        data = {
+            "day": self.day.isoformat(),
+            "activities_today": self.activities_today,
+            "tasks_due": self.tasks_due,
+            "content_scheduled": self.content_scheduled,
+            "expected_revenue": f"{self.expected_revenue:.2f}",
+            "activities_summary": dict(self.activities_summary),
+            "tasks_summary": dict(self.tasks_summary),
+            "content_summary": dict(self.content_summary),
+            "care_wigs_summary": dict(self.care_wigs_summary),
+            "stock_alerts": self.stock_alerts,
+        }
+        for key in ("prestations_today", "prestations_categories"):
+            data[key] = [
+                {
+                    "name": summary.name,
+                    "total_lines": summary.total_lines,
+                    "total_qty": summary.total_qty,
+                    "revenue": f"{summary.revenue:.2f}",
+                    "avg_ticket": summary.avg_ticket,
+                }
+                for summary in getattr(self, key)
+            ]
+        data["prestations_schedule"] = [
+            {
+                "service": line.service.name,
+                "client": line.activity.client,
+                "assigned_staff": str(line.activity.assigned_staff or ""),
+                "status": line.activity.status,
+                "total_amount": f"{line.total_amount:.2f}",
+            }
+            for line in self.prestations_schedule
+        ]
+        return data
+
+
+def _summarize_lines(lines, key) -> list[PrestationSummary]:
+    summaries = {}
+    for line in lines:
+        name = key(line)
+        summary = summaries.get(name)
+        if summary is None:
+            summary = summaries[name] = PrestationSummary(name=name)
+        summary.total_lines += 1
+        summary.total_qty += line.quantity or 0
+        summary.revenue += line.total_amount
+    return sorted(summaries.values(), key=lambda item: item.total_lines, reverse=True)
+
+
+def build_today_snapshot(day: date | None = None) -> TodaySnapshot:
+    """Calcule les indicateurs du jour avec une requête agrégée par table."""
+    day = day or timezone.localdate()
+    lower, upper = day_bounds(day, day)
+    is_today = Q(start_at__gte=lower, start_at__lt=upper)
+    open_statuses = [Task.Status.TODO, Task.Status.IN_PROGRESS]
+
+    activities = Activity.objects.aggregate(
+        today=Count("id", filter=is_today),
+        expected_revenue=Sum("expected_amount", filter=is_today),
+        in_progress=Count("id", filter=Q(status=Activity.Status.IN_PROGRESS)),
+        to_collect=Count("id", filter=Q(status=Activity.Status.TO_COLLECT)),
+        paid=Count("id", filter=Q(status=Activity.Status.PAID)),
+        done=Count("id", filter=Q(status=Activity.Status.DONE)),
+    )
+    tasks = Task.objects.aggregate(
+        due=Count("id", filter=Q(due_date=day)),
+        overdue=Count("id", filter=Q(due_date__lt=day, status__in=open_statuses)),
+        done=Count("id", filter=Q(status=Task.Status.DONE)),
+    )
+    contents = ContentItem.objects.aggregate(
+        scheduled_today=Count(
+            "id", filter=Q(scheduled_at__gte=lower, scheduled_at__lt=upper)
+        ),
+        to_validate=Count("id", filter=Q(status=ContentItem.Status.TO_VALIDATE)),
+        scheduled=Count("id", filter=Q(status=ContentItem.Status.SCHEDULED)),
+    )
+    care_wigs = CareWig.objects.aggregate(
+        in_progress=Count("id", filter=Q(status=CareWig.Status.IN_PROGRESS)),
+        ready=Count("id", filter=Q(status=CareWig.Status.READY)),
+        delivered=Count("id", filter=Q(status=CareWig.Status.DELIVERED)),
+    )
+
+    lines = list(
+        ActivityLine.objects.filter(
+            activity__start_at__gte=lower,
+            activity__start_at__lt=upper,
+            service__isnull=False,
+        )
+        .select_related(
+            "activity", "service", "service__category", "activity__assigned_staff"
+        )
+        .order_by("activity__start_at")
+    )
+    for line in lines:
+        line.total_amount = (line.quantity or 0) * (line.unit_price or 0)
+
+    return TodaySnapshot(
+        day=day,
+        activities_today=activities["today"],
+        tasks_due=tasks["due"],
+        content_scheduled=contents["scheduled_today"],
+        expected_revenue=activities["expected_revenue"] or Decimal("0"),
+        activities_summary={
+            "in_progress": activities["in_progress"],
+            "to_collect": activities["to_collect"],
+            "paid": activities["paid"],
+            "done": activities["done"],
+        },
+        tasks_summary={"overdue": tasks["overdue"], "done": tasks["done"]},
+        content_summary={
+            "to_validate": contents["to_validate"],
+            "scheduled": contents["scheduled"],
+        },
+        care_wigs_summary=care_wigs,
+        stock_alerts=StockLevel.objects.filter(alert=True).count(),
+        prestations_today=_summarize_lines(lines, lambda line: line.service.name),
+        prestations_categories=_summarize_lines(
+            lines,
+            lambda line: (
+                line.service.category.name if line.service.category else "Autres"
+            ),
+        ),
+        prestations_schedule=lines[:10],
+    )
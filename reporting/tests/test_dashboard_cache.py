@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from reporting.cache import cached_dashboard, get_cache_stats
+from tasks.models import Task
+from wigs.models import CareWig
+
+
+class DashboardCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def _compute(self):
+        self.calls += 1
+        return Task.objects.count()
+
+    def test_hit_until_domain_version_changes(self):
+        params = {"start": "2024-01-01"}
+
+        self.assertEqual(
+            cached_dashboard("overview", params, ("tasks",), self._compute), 0
+        )
+        self.assertEqual(
+            cached_dashboard("overview", params, ("tasks",), self._compute), 0
+        )
+        self.assertEqual(self.calls, 1)
+
+        CareWig.objects.create(client="Awa")
+        cached_dashboard("overview", params, ("tasks",), self._compute)
+        self.assertEqual(self.calls, 1)
+
+        Task.objects.create(title="Nouvelle")
+        self.assertEqual(
+            cached_dashboard("overview", params, ("tasks",), self._compute), 1
+        )
+        self.assertEqual(self.calls, 2)
+
+        stats = get_cache_stats()["vues"]["overview"]
+        self.assertEqual(stats, {"hits": 2, "misses": 2})
+
+    def test_filters_are_part_of_the_key(self):
+        cached_dashboard("overview", {"service_ids": [1]}, ("tasks",), self._compute)
+        cached_dashboard("overview", {"service_ids": [2]}, ("tasks",), self._compute)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_stats_endpoint_is_admin_only(self):
+        manager = User.objects.create_user(
+            username="manager", password="Test12345!", role=User.Role.MANAGER
+        )
+        admin = User.objects.create_user(
+            username="admin", password="Test12345!", role=User.Role.ADMIN
+        )
+
+        self.client.force_authenticate(user=manager)
+        self.assertEqual(self.client.get("/reporting/dashboard/cache").status_code, 403)
+
+        self.client.force_authenticate(user=admin)
+        self.client.get("/reporting/dashboard/rendement")
+        self.client.get("/reporting/dashboard/rendement")
+        response = self.client.get("/reporting/dashboard/cache")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["vues"]["rendement"], {"hits": 1, "misses": 1})
+        self.assertIn("tasks", response.data["versions"])
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from content.models import ContentItem, ContentMetric
+from operations.models import Activity, ActivityLine, Service, ServiceCategory
+from reporting.models import ActivityKpiRollup, KpiRollupDay
+from reporting.rollups import ensure_kpi_rollups, get_overview_kpis
+from tasks.models import Task
+
+
+class KpiRollupTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.past = self.today - timedelta(days=3)
+        self.category = ServiceCategory.objects.create(name="Tresses test")
+        self.braids = Service.objects.create(name="Tresses", category=self.category)
+        self.nails = Service.objects.create(name="Ongles")
+
+        self.past_paid = self._activity(
+            Activity.Status.PAID, "100.00", "120.00", [(self.braids, 2, "50.00")]
+        )
+        self.past_open = self._activity(
+            Activity.Status.IN_PROGRESS,
+            "80.00",
+            None,
+            [(self.braids, 1, "40.00"), (self.nails, 1, "40.00")],
+        )
+        Activity.objects.filter(pk__in=[self.past_paid.pk, self.past_open.pk]).update(
+            start_at=timezone.now() - timedelta(days=3)
+        )
+        self._activity(
+            Activity.Status.PAID, "30.00", "30.00", [(self.nails, 1, "30.00")]
+        )
+
+        task = Task.objects.create(title="Ancienne", status=Task.Status.DONE)
+        Task.objects.filter(pk=task.pk).update(
+            created_at=timezone.now() - timedelta(days=3),
+            updated_at=timezone.now() - timedelta(days=3),
+        )
+        Task.objects.create(title="Du jour")
+
+        item = ContentItem.objects.create(
+            title="Post", status=ContentItem.Status.PUBLISHED
+        )
+        metric = ContentMetric.objects.create(
+            content_item=item, likes=10, comments=0, shares=0, saves=0, reach=100
+        )
+        ContentItem.objects.filter(pk=item.pk).update(
+            created_at=timezone.now() - timedelta(days=3)
+        )
+        ContentMetric.objects.filter(pk=metric.pk).update(
+            created_at=timezone.now() - timedelta(days=3)
+        )
+
+    def _activity(self, status, expected, final, lines):
+        activity = Activity.objects.create(
+            type=Activity.Type.SERVICE,
+            status=status,
+            expected_amount=Decimal(expected),
+            final_amount=Decimal(final) if final else None,
+        )
+        for service, quantity, unit_price in lines:
+            ActivityLine.objects.create(
+                activity=activity,
+                service=service,
+                quantity=quantity,
+                unit_price=Decimal(unit_price),
+            )
+        return activity
+
+    def test_rebuild_command_stores_closed_days_only(self):
+        call_command("rebuild_kpi_rollups", since=str(self.past))
+
+        self.assertEqual(KpiRollupDay.objects.count(), 3)
+        self.assertFalse(KpiRollupDay.objects.filter(day=self.today).exists())
+        total = ActivityKpiRollup.objects.get(
+            day=self.past,
+            scope=ActivityKpiRollup.Scope.TOTAL,
+            status=Activity.Status.PAID,
+        )
+        self.assertEqual(total.activities_count, 1)
+        self.assertEqual(total.final_amount, Decimal("120.00"))
+        category = ActivityKpiRollup.objects.get(
+            day=self.past,
+            scope=ActivityKpiRollup.Scope.CATEGORY,
+            status=Activity.Status.IN_PROGRESS,
+        )
+        self.assertEqual(category.activities_count, 1)
+        self.assertEqual(category.expected_amount, Decimal("80.00"))
+
+    def test_overview_combines_rollups_and_today(self):
+        start = self.today - timedelta(days=6)
+        kpis = get_overview_kpis(start, self.today)
+
+        self.assertEqual(kpis["activities_total"], 3)
+        self.assertEqual(kpis["activities_paid"], 2)
+        self.assertEqual(kpis["revenue_expected"], Decimal("210.00"))
+        self.assertEqual(kpis["revenue_final"], Decimal("150.00"))
+        self.assertEqual(kpis["tasks_total"], 2)
+        self.assertEqual(kpis["tasks_done"], 1)
+        self.assertEqual(kpis["content_total"], 1)
+        self.assertEqual(kpis["content_published"], 1)
+        self.assertEqual(kpis["content_score_avg"], 10.0)
+        self.assertEqual(
+            [(item["name"], item["revenue"]) for item in kpis["prestations"]],
+            [("Tresses", Decimal("100.00")), ("Ongles", Decimal("30.00"))],
+        )
+
+        sector = get_overview_kpis(
+            start,
+            self.today,
+            service_ids=[self.braids.id],
+            category_id=self.category.id,
+        )
+        self.assertEqual(sector["activities_total"], 2)
+        self.assertEqual(sector["revenue_final"], Decimal("120.00"))
+
+    def test_write_on_closed_day_invalidates_rollup(self):
+        ensure_kpi_rollups(self.past, self.today)
+        self.assertTrue(KpiRollupDay.objects.filter(day=self.past).exists())
+
+        self.past_open.refresh_from_db()
+        self.past_open.set_status(Activity.Status.DONE)
+
+        self.assertFalse(KpiRollupDay.objects.filter(day=self.past).exists())
+        kpis = get_overview_kpis(self.past, self.past)
+        self.assertEqual(kpis["activities_total"], 2)
+        self.assertTrue(KpiRollupDay.objects.filter(day=self.past).exists())
+        self.assertTrue(
+            ActivityKpiRollup.objects.filter(
+                day=self.past,
+                scope=ActivityKpiRollup.Scope.TOTAL,
+                status=Activity.Status.DONE,
+            ).exists()
+        )
+
+    def test_dashboard_view_renders_from_rollups(self):
+        user = User.objects.create_user(
+            username="owner", password="Test12345!", role=User.Role.OWNER
+        )
+        self.client.force_login(user)
+
+        response = self.client.get("/dashboard/", {"days": 7})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["activities_total"], 3)
+        self.assertEqual(response.context["tasks_completion_rate"], 50.0)
+        self.assertEqual(response.context["content_score_avg"], 10.0)
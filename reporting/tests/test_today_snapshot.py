@@ -0,0 +1,70 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from content.models import ContentItem
+from operations.models import Activity, ActivityLine, Service, ServiceCategory
+from reporting.snapshots import build_today_snapshot
+from tasks.models import Task
+from wigs.models import CareWig
+
+
+class TodaySnapshotTests(APITestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        category = ServiceCategory.objects.create(name="Onglerie test")
+        nails = Service.objects.create(name="Pose ongles", category=category)
+        care = Service.objects.create(name="Soin")
+        for status, service, price in [
+            (Activity.Status.IN_PROGRESS, nails, "20.00"),
+            (Activity.Status.TO_COLLECT, nails, "30.00"),
+            (Activity.Status.PAID, care, "50.00"),
+        ]:
+            activity = Activity.objects.create(
+                type=Activity.Type.SERVICE,
+                status=status,
+                expected_amount=Decimal(price),
+            )
+            ActivityLine.objects.create(
+                activity=activity, service=service, unit_price=Decimal(price)
+            )
+        Task.objects.create(title="Du jour", due_date=self.today)
+        Task.objects.create(title="En retard", due_date=self.today - timedelta(days=2))
+        ContentItem.objects.create(title="Post", status=ContentItem.Status.TO_VALIDATE)
+        CareWig.objects.create(client="Awa", status=CareWig.Status.READY)
+
+    def test_snapshot_uses_one_query_per_table(self):
+        with self.assertNumQueries(6):
+            snapshot = build_today_snapshot(self.today)
+
+        self.assertEqual(snapshot.activities_today, 3)
+        self.assertEqual(snapshot.expected_revenue, Decimal("100.00"))
+        self.assertEqual(snapshot.activities_summary["to_collect"], 1)
+        self.assertEqual(snapshot.tasks_due, 1)
+        self.assertEqual(snapshot.tasks_summary["overdue"], 1)
+        self.assertEqual(snapshot.content_summary["to_validate"], 1)
+        self.assertEqual(snapshot.care_wigs_summary["ready"], 1)
+        self.assertEqual(snapshot.prestations_today[0].name, "Pose ongles")
+        self.assertEqual(snapshot.prestations_today[0].avg_ticket, 25.0)
+        self.assertEqual(
+            [item.name for item in snapshot.prestations_categories],
+            ["Onglerie test", "Autres"],
+        )
+
+    def test_json_endpoint_requires_authentication(self):
+        response = self.client.get("/reporting/dashboard/aujourdhui")
+        self.assertIn(response.status_code, {401, 403})
+
+        user = User.objects.create_user(
+            username="staff", password="Test12345!", role=User.Role.STAFF
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/reporting/dashboard/aujourdhui")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["activities_today"], 3)
+        self.assertEqual(response.data["expected_revenue"], "100.00")
+        self.assertEqual(len(response.data["prestations_schedule"]), 3)
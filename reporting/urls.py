@@ -1,7 +1,17 @@
 from django.urls import path
 
-from reporting.views import dashboard_rendement
+from reporting.views import (
+    dashboard_cache_stats,
+    dashboard_rendement,
+    dashboard_today_snapshot,
+)
 
 urlpatterns = [
     path("dashboard/rendement", dashboard_rendement, name="dashboard-rendement"),
+    path(
+        "dashboard/aujourdhui",
+        dashboard_today_snapshot,
+        name="dashboard-aujourdhui",
+    ),
+    path("dashboard/cache", dashboard_cache_stats, name="dashboard-cache"),
 ]
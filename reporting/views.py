@@ -5,10 +5,13 @@ from django.db.models import Avg, Count, F, FloatField, Value
 from django.db.models.functions import Cast, TruncDate
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from content.models import ContentApproval, ContentItem, ContentMetric
+from reporting.cache import cached_dashboard, get_cache_stats
 from reporting.permissions import OwnerAdminPermission
+from reporting.snapshots import build_today_snapshot
 from tasks.models import Task
 
 
@@ -16,6 +19,16 @@ from tasks.models import Task
 @permission_classes([OwnerAdminPermission])
 def dashboard_rendement(request):
     today = timezone.localdate()
+    data = cached_dashboard(
+        "rendement",
+        {"today": today},
+        ("tasks", "content"),
+        lambda: _compute_rendement(today),
+    )
+    return Response(data)
+
+
+def _compute_rendement(today):
     since_date = today - timedelta(days=6)
 
     done_tasks = Task.objects.filter(
@@ -60,18 +73,35 @@ def dashboard_rendement(request):
     )
     average_score = round(float(average_score), 2)
 
-    return Response(
-        {
-            "taches": {
-                "terminees": done_tasks.count(),
-                "en_retard": late_tasks.count(),
-            },
-            "contenus_par_plateforme": platform_summary,
-            "taux_validation": {
-                "approuves": approved,
-                "soumis": submitted,
-                "taux": approval_rate,
-            },
-            "score_moyen_contenu": average_score,
-        }
+    return {
+        "taches": {
+            "terminees": done_tasks.count(),
+            "en_retard": late_tasks.count(),
+        },
+        "contenus_par_plateforme": platform_summary,
+        "taux_validation": {
+            "approuves": approved,
+            "soumis": submitted,
+            "taux": approval_rate,
+        },
+        "score_moyen_contenu": average_score,
+    }
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def dashboard_today_snapshot(request):
+    today = timezone.localdate()
+    snapshot = cached_dashboard(
+        "today",
+        {"day": today},
+        ("activities", "tasks", "content", "care_wigs", "stock"),
+        lambda: build_today_snapshot(today),
     )
+    return Response(snapshot.as_dict())
+
+
+@api_view(["GET"])
+@permission_classes([OwnerAdminPermission])
+def dashboard_cache_stats(request):
+    return Response(get_cache_stats())
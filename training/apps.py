@@ -5,3 +5,6 @@ class TrainingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "training"
     verbose_name = "Formation"
+
+    def ready(self):
+        from training import signals  # noqa: F401
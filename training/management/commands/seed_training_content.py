@@ -95,7 +95,7 @@ class Command(BaseCommand):
                     if updates:
                         for field, value in updates.items():
                             setattr(week, field, value)
-                        week.save(update_fields=list(updates.keys()))
+                        week.save(update_fields=[*updates, "updated_at"])
 
                 lessons_data = week_data.get("lessons", [])
                 for index, lesson_data in enumerate(lessons_data, start=1):
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-17 18:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("training", "0016_trainingquestion_is_active"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="trainingenrollment",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Mis à jour le"),
+        ),
+        migrations.AddField(
+            model_name="trainingevaluation",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Mis à jour le"),
+        ),
+        migrations.AddField(
+            model_name="traininglessonchecklistitem",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Mis à jour le"),
+        ),
+        migrations.AddField(
+            model_name="trainingprogress",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Mis à jour le"),
+        ),
+        migrations.AddField(
+            model_name="trainingweek",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Mis à jour le"),
+        ),
+    ]
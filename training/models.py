@@ -58,6 +58,7 @@ class TrainingWeek(models.Model):
     title = models.CharField(max_length=200, verbose_name="Titre")
     objective = models.TextField(verbose_name="Objectif")
     focus = models.TextField(blank=True, verbose_name="Axes de travail")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Mis à jour le")
 
     class Meta:
         verbose_name = "Semaine"
@@ -266,6 +267,7 @@ class TrainingLessonChecklistItem(models.Model):
     order = models.PositiveIntegerField(default=0, verbose_name="Ordre")
     is_required = models.BooleanField(default=True, verbose_name="Obligatoire")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Mis à jour le")
 
     class Meta:
         verbose_name = "Checklist module"
@@ -475,6 +477,7 @@ class TrainingEnrollment(models.Model):
     completed_at = models.DateTimeField(
         null=True, blank=True, verbose_name="Terminée le"
     )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Mis à jour le")
 
     class Meta:
         verbose_name = "Inscription"
@@ -499,7 +502,7 @@ class TrainingEnrollment(models.Model):
         if total_lessons and completed >= total_lessons:
             self.status = self.Status.COMPLETED
             self.completed_at = self.completed_at or timezone.now()
-            self.save(update_fields=["status", "completed_at"])
+            self.save(update_fields=["status", "completed_at", "updated_at"])
 
 
 class TrainingProgress(models.Model):
@@ -524,6 +527,7 @@ class TrainingProgress(models.Model):
     quiz_passed = models.BooleanField(default=False, verbose_name="Quiz validé")
     submission_done = models.BooleanField(default=False, verbose_name="Soumission faite")
     notes = models.TextField(blank=True, verbose_name="Notes")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Mis à jour le")
 
     class Meta:
         verbose_name = "Progression"
@@ -563,6 +567,7 @@ class TrainingEvaluation(models.Model):
     score = models.PositiveIntegerField(verbose_name="Score")
     comments = models.TextField(blank=True, verbose_name="Commentaires")
     evaluated_at = models.DateTimeField(auto_now_add=True, verbose_name="Évalué le")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Mis à jour le")
 
     class Meta:
         verbose_name = "Évaluation"
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from jobs.queue import enqueue
+from jobs.views import accepted_response
+
+CACHE_DIR = "training_pdfs"
+
+
+def stamp(queryset) -> tuple:
+    """Nombre de lignes et dernière modification, en une requête agrégée.
+
+    Le compte détecte les suppressions, le ``Max(updated_at)`` les créations
+    et les modifications.
+    """
+    values = queryset.aggregate(count=Count("pk"), last=Max("updated_at"))
+    last = values["last"]
+    return values["count"], last.isoformat() if last else ""
+
+
+def fingerprint(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:32]
+
+
+def cache_path(prefix: str, key: str) -> Path:
+    return Path(settings.MEDIA_ROOT) / CACHE_DIR / f"{prefix}-{key}.pdf"
+
+
+def store(path: Path, content: bytes) -> None:
+    """Écrit le fichier de façon atomique puis purge les versions périmées."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as tmp:
+            tmp.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    prefix = path.name.rsplit("-", 1)[0]
+    for stale in path.parent.glob(f"{prefix}-*.pdf"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def cached_pdf_response(
+    request,
+    prefix: str,
+    key: str,
+    filename: str,
+    render: Callable[[], bytes],
+    job: Optional[tuple[Callable, dict]] = None,
+):
+    """Sert le PDF identifié par ``key``, en ne le générant qu'en cas d'absence.
+
+    ``key`` est l'empreinte des données affichées : elle sert de nom de fichier
+    et d'ETag, si bien qu'un ``If-None-Match`` à jour reçoit un 304 sans lecture
+    disque ni rendu. Quand la file de tâches est active, ``job`` (fonction et
+    paramètres) délègue le rendu manquant au worker et la vue répond 202.
+    """
+    etag = f'"{key}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified["ETag"] = etag
+        return not_modified
+
+    path = cache_path(prefix, key)
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        if job is not None and settings.JOB_QUEUE_ENABLED:
+            func, payload = job
+            queued = enqueue(
+                func,
+                {**payload, "prefix": prefix, "key": key},
+                user=request.user,
+                dedupe_key=f"{CACHE_DIR}:{prefix}-{key}",
+            )
+            return accepted_response(queued)
+        content = render()
+        store(path, content)
+        handle = BytesIO(content)
+
+    response = FileResponse(handle, content_type="application/pdf", filename=filename)
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
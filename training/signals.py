@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from floxy.answer_keys import invalidate_answer_key
+from training.models import TrainingChoice, TrainingQuestion, TrainingQuiz
+
+
+@receiver(post_save, sender=TrainingQuiz)
+@receiver(post_delete, sender=TrainingQuiz)
+def invalidate_quiz_answer_key(sender, instance, **kwargs):
+    invalidate_answer_key(TrainingQuiz._meta.label_lower, instance.pk)
+
+
+@receiver(post_save, sender=TrainingQuestion)
+@receiver(post_delete, sender=TrainingQuestion)
+def invalidate_question_answer_key(sender, instance, **kwargs):
+    invalidate_answer_key(TrainingQuiz._meta.label_lower, instance.quiz_id)
+
+
+@receiver(post_save, sender=TrainingChoice)
+@receiver(post_delete, sender=TrainingChoice)
+def invalidate_choice_answer_key(sender, instance, **kwargs):
+    quiz_id = (
+        TrainingQuestion.objects.filter(pk=instance.question_id)
+        .values_list("quiz_id", flat=True)
+        .first()
+    )
+    invalidate_answer_key(TrainingQuiz._meta.label_lower, quiz_id)
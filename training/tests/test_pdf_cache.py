@@ -0,0 +1,126 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from jobs.models import Job
+from jobs.queue import claim_jobs, run_job
+from training import pdf_cache, views
+from training.models import (
+    TrainingEnrollment,
+    TrainingEvaluation,
+    TrainingLesson,
+    TrainingProgram,
+    TrainingWeek,
+)
+
+
+class TrainingPdfCacheTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = get_user_model().objects.create_user(
+            username="manager", password="pass", role="MANAGER"
+        )
+        self.client.force_login(self.user)
+        self.program = TrainingProgram.objects.create(title="Programme", slug="prog")
+        self.week = TrainingWeek.objects.create(
+            program=self.program, week_number=1, title="S1", objective="Obj"
+        )
+        self.lesson = TrainingLesson.objects.create(
+            week=self.week, title="Module 1", order=1
+        )
+        self.enrollment = TrainingEnrollment.objects.create(
+            user=self.user, program=self.program
+        )
+
+    def _cached_files(self):
+        return sorted(
+            path.name
+            for path in (Path(self.media_root) / pdf_cache.CACHE_DIR).glob("*.pdf")
+        )
+
+    def test_program_pdf_is_rendered_once(self):
+        url = reverse("training_program_pdf", args=[self.program.pk])
+        with mock.patch.object(
+            views, "_render_program_pdf", wraps=views._render_program_pdf
+        ) as render:
+            first = self.client.get(url)
+            second = self.client.get(url)
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first["Content-Type"], "application/pdf")
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertTrue(b"".join(second.streaming_content).startswith(b"%PDF"))
+        self.assertEqual(len(self._cached_files()), 1)
+
+    def test_if_none_match_returns_not_modified(self):
+        url = reverse("training_program_pdf", args=[self.program.pk])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_lesson_change_invalidates_program_pdf(self):
+        url = reverse("training_program_pdf", args=[self.program.pk])
+        etag = self.client.get(url)["ETag"]
+
+        self.lesson.title = "Module renommé"
+        self.lesson.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        # L'ancienne version est purgée à l'écriture de la nouvelle.
+        self.assertEqual(len(self._cached_files()), 1)
+
+    def test_evaluation_invalidates_progress_pdf(self):
+        url = reverse("training_progress_pdf", args=[self.enrollment.pk])
+        etag = self.client.get(url)["ETag"]
+
+        evaluation = TrainingEvaluation.objects.create(
+            enrollment=self.enrollment, score=80
+        )
+        after_create = self.client.get(url)["ETag"]
+        evaluation.score = 50
+        evaluation.save()
+        after_update = self.client.get(url)["ETag"]
+
+        self.assertEqual(len({etag, after_create, after_update}), 3)
+
+    def test_report_pdf_keeps_role_check(self):
+        other = get_user_model().objects.create_user(
+            username="staff", password="pass", role="STAFF"
+        )
+        self.client.force_login(other)
+
+        response = self.client.get(reverse("training_report_pdf"))
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self._cached_files(), [])
+
+    def test_queued_render_returns_job_then_serves_file(self):
+        url = reverse("training_program_pdf", args=[self.program.pk])
+
+        with override_settings(JOB_QUEUE_ENABLED=True):
+            queued = self.client.get(url)
+            self.assertEqual(queued.status_code, 202)
+            self.assertEqual(self._cached_files(), [])
+
+            claim_jobs("worker", 1)
+            job = run_job(queued.json()["id"])
+            response = self.client.get(url)
+
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
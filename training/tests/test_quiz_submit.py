@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from training.models import (
+    TrainingAnswer,
+    TrainingChoice,
+    TrainingEnrollment,
+    TrainingLesson,
+    TrainingProgram,
+    TrainingProgress,
+    TrainingQuestion,
+    TrainingQuiz,
+    TrainingQuizAttempt,
+    TrainingWeek,
+)
+
+
+class TrainingQuizSubmitTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="manager", password="pass", role="MANAGER"
+        )
+        self.client.force_login(self.user)
+        program = TrainingProgram.objects.create(title="Programme", slug="prog")
+        week = TrainingWeek.objects.create(
+            program=program, week_number=1, title="S1", objective="Obj"
+        )
+        self.lesson = TrainingLesson.objects.create(
+            week=week, title="Module 1", order=1
+        )
+        self.enrollment = TrainingEnrollment.objects.create(
+            user=self.user, program=program
+        )
+        quiz = TrainingQuiz.objects.create(lesson=self.lesson)
+        self.mcq = TrainingQuestion.objects.create(
+            quiz=quiz, question_text="Prix ?", points=2, order=1
+        )
+        self.right = TrainingChoice.objects.create(
+            question=self.mcq, choice_text="1000", is_correct=True
+        )
+        self.wrong = TrainingChoice.objects.create(
+            question=self.mcq, choice_text="2000", is_correct=False
+        )
+        self.open = TrainingQuestion.objects.create(
+            quiz=quiz,
+            question_text="Commentaire",
+            question_type=TrainingQuestion.QuestionType.OPEN,
+            order=2,
+        )
+        self.url = reverse("training_quiz_submit", args=[self.lesson.pk])
+
+    def _submit(self, choice):
+        self.client.post(
+            self.url,
+            {f"question_{self.mcq.pk}": choice.pk, f"question_{self.open.pk}": "RAS"},
+        )
+        return TrainingQuizAttempt.objects.latest("pk")
+
+    def test_submit_grades_and_updates_progress(self):
+        attempt = self._submit(self.right)
+
+        self.assertEqual(attempt.score_percent, 100)
+        self.assertTrue(attempt.passed)
+        answers = {answer.question_id: answer for answer in attempt.answers.all()}
+        self.assertTrue(answers[self.mcq.pk].is_correct)
+        self.assertIsNone(answers[self.open.pk].is_correct)
+        self.assertEqual(answers[self.open.pk].answer_text, "RAS")
+        progress = TrainingProgress.objects.get(
+            enrollment=self.enrollment, lesson=self.lesson
+        )
+        self.assertTrue(progress.quiz_passed)
+
+    def test_choice_change_invalidates_answer_key(self):
+        self.assertEqual(self._submit(self.wrong).score_percent, 0)
+
+        self.wrong.is_correct = True
+        self.wrong.save()
+
+        self.assertEqual(self._submit(self.wrong).score_percent, 100)
+        self.assertEqual(TrainingAnswer.objects.count(), 4)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from floxy import answer_keys
 from training.models import (
     TrainingChecklistProgress,
     TrainingEnrollment,
     TrainingLesson,
     TrainingLessonChecklistItem,
     TrainingProgress,
+    TrainingQuestion,
 )
 
 
@@ -79,3 +81,27 @@ def lesson_completion_status(user, lesson: TrainingLesson) -> dict:
 
 def lesson_is_completable(user, lesson: TrainingLesson) -> bool:
     return lesson_completion_status(user, lesson)["is_eligible"]
+
+
+def compile_quiz_answer_key(quiz) -> answer_keys.AnswerKey:
+    questions = []
+    for question in quiz.questions.filter(is_active=True).prefetch_related("choices"):
+        choices = list(question.choices.all())
+        is_open = question.question_type == TrainingQuestion.QuestionType.OPEN
+        questions.append(
+            answer_keys.QuestionKey(
+                id=question.id,
+                points=question.points,
+                kind=answer_keys.OPEN if is_open else answer_keys.CHOICE,
+                choices={str(choice.id): choice.id for choice in choices},
+                correct_choices=frozenset(
+                    str(choice.id) for choice in choices if choice.is_correct
+                ),
+            )
+        )
+    return answer_keys.AnswerKey(tuple(questions))
+
+
+def quiz_answer_key(quiz) -> answer_keys.AnswerKey:
+    """Corrigé compilé du quiz, relu depuis le cache tant qu'il n'a pas changé."""
+    return answer_keys.cached_answer_key(quiz, compile_quiz_answer_key)
@@ -17,6 +17,8 @@ try:
     import markdown as md
 except ImportError:  # pragma: no cover - optional dependency
     md = None
+from floxy import answer_keys
+from training import pdf_cache
 from training.forms import TrainingActionPlanForm, TrainingEvaluationForm
 from training.models import (
     TrainingActionPlan,
@@ -27,7 +29,6 @@ from training.models import (
     TrainingLessonChecklistItem,
     TrainingProgram,
     TrainingProgress,
-    TrainingQuestion,
     TrainingQuiz,
     TrainingQuizAttempt,
     TrainingAnswer,
@@ -35,7 +36,7 @@ from training.models import (
     TrainingStudyMaterialProgress,
     TrainingConceptCard,
 )
-from training.utils import lesson_completion_status
+from training.utils import lesson_completion_status, quiz_answer_key
 
 
 @login_required
@@ -361,15 +362,45 @@ def training_reporting(request):
     )
 
 
+def _program_stamp(program) -> tuple:
+    lessons = TrainingLesson.objects.filter(week__program=program)
+    return (
+        program.pk,
+        program.updated_at.isoformat(),
+        pdf_cache.stamp(program.weeks.all()),
+        pdf_cache.stamp(lessons),
+        pdf_cache.stamp(TrainingLessonChecklistItem.objects.filter(lesson__in=lessons)),
+    )
+
+
 @login_required
 def training_report_pdf(request):
     if not _role_in(request.user, {"OWNER", "ADMIN", "MANAGER"}):
         return HttpResponseForbidden("Accès refusé")
 
-    program = TrainingProgram.objects.prefetch_related("weeks").first()
+    program = TrainingProgram.objects.first()
     if not program:
         return HttpResponse("Programme non configuré.", status=404)
 
+    key = pdf_cache.fingerprint(
+        "report",
+        _program_stamp(program),
+        pdf_cache.stamp(TrainingEnrollment.objects.filter(program=program)),
+        pdf_cache.stamp(TrainingProgress.objects.filter(enrollment__program=program)),
+        pdf_cache.stamp(TrainingEvaluation.objects.filter(enrollment__program=program)),
+        pdf_cache.stamp(TrainingActionPlan.objects.filter(enrollment__program=program)),
+    )
+    return pdf_cache.cached_pdf_response(
+        request,
+        f"report-{program.pk}",
+        key,
+        "reporting-formation.pdf",
+        lambda: _render_report_pdf(program),
+        job=(render_pdf_job, {"kind": "report", "object_id": program.pk}),
+    )
+
+
+def _render_report_pdf(program) -> bytes:
     enrollments_qs = TrainingEnrollment.objects.filter(program=program).select_related(
         "user"
     )
@@ -502,22 +533,27 @@ def training_report_pdf(request):
 
     pdf.showPage()
     pdf.save()
-    buffer.seek(0)
-
-    response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = "inline; filename=reporting-formation.pdf"
-    return response
+    return buffer.getvalue()
 
 
 @login_required
 def training_program_pdf(request, program_id):
-    program = get_object_or_404(
-        TrainingProgram.objects.prefetch_related(
-            "weeks__lessons__resources", "weeks__lessons__checklist_items"
-        ),
-        pk=program_id,
+    program = get_object_or_404(TrainingProgram, pk=program_id)
+    return pdf_cache.cached_pdf_response(
+        request,
+        f"program-{program.pk}",
+        pdf_cache.fingerprint("program", _program_stamp(program)),
+        "plan-formation.pdf",
+        lambda: _render_program_pdf(program.pk),
+        job=(render_pdf_job, {"kind": "program", "object_id": program.pk}),
     )
 
+
+def _render_program_pdf(program_id) -> bytes:
+    program = TrainingProgram.objects.prefetch_related(
+        "weeks__lessons__checklist_items"
+    ).get(pk=program_id)
+
     buffer = BytesIO()
     pdf = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
@@ -573,11 +609,7 @@ def training_program_pdf(request, program_id):
 
     pdf.showPage()
     pdf.save()
-    buffer.seek(0)
-
-    response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = "inline; filename=plan-formation.pdf"
-    return response
+    return buffer.getvalue()
 
 
 @login_required
@@ -589,6 +621,30 @@ def training_progress_pdf(request, enrollment_id):
     if not _role_in(request.user, {"OWNER", "ADMIN", "MANAGER"}) and enrollment.user_id != request.user.id:
         return HttpResponseForbidden("Accès refusé")
 
+    key = pdf_cache.fingerprint(
+        "progress",
+        enrollment.pk,
+        enrollment.updated_at.isoformat(),
+        str(enrollment.user),
+        _program_stamp(enrollment.program),
+        pdf_cache.stamp(TrainingProgress.objects.filter(enrollment=enrollment)),
+        pdf_cache.stamp(
+            TrainingChecklistProgress.objects.filter(enrollment=enrollment)
+        ),
+        pdf_cache.stamp(TrainingEvaluation.objects.filter(enrollment=enrollment)),
+        pdf_cache.stamp(TrainingActionPlan.objects.filter(enrollment=enrollment)),
+    )
+    return pdf_cache.cached_pdf_response(
+        request,
+        f"progress-{enrollment.pk}",
+        key,
+        "progression-formation.pdf",
+        lambda: _render_progress_pdf(enrollment),
+        job=(render_pdf_job, {"kind": "progress", "object_id": enrollment.pk}),
+    )
+
+
+def _render_progress_pdf(enrollment) -> bytes:
     program = TrainingProgram.objects.prefetch_related(
         "weeks__lessons__checklist_items"
     ).get(pk=enrollment.program_id)
@@ -678,11 +734,22 @@ def training_progress_pdf(request, enrollment_id):
 
     pdf.showPage()
     pdf.save()
-    buffer.seek(0)
+    return buffer.getvalue()
+
 
-    response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = "inline; filename=progression-formation.pdf"
-    return response
+def render_pdf_job(kind: str, object_id: int, prefix: str, key: str) -> dict:
+    """Point d'entrée du worker : génère un PDF et le dépose dans le cache."""
+    if kind == "program":
+        content = _render_program_pdf(object_id)
+    elif kind == "progress":
+        content = _render_progress_pdf(
+            TrainingEnrollment.objects.select_related("user", "program").get(pk=object_id)
+        )
+    else:
+        content = _render_report_pdf(TrainingProgram.objects.get(pk=object_id))
+    path = pdf_cache.cache_path(prefix, key)
+    pdf_cache.store(path, content)
+    return {"file": path.name, "size": len(content)}
 
 
 @login_required
@@ -834,14 +901,14 @@ def training_submit_quiz(request, lesson_id):
     if not _role_in(request.user, {"OWNER", "ADMIN", "MANAGER"}):
         return HttpResponseForbidden("Accès refusé")
 
-    quiz = (
-        TrainingQuiz.objects.filter(lesson=lesson)
-        .prefetch_related("questions__choices")
-        .first()
-    )
+    quiz = TrainingQuiz.objects.filter(lesson=lesson).first()
     if not quiz:
         messages.error(request, "Aucun quiz disponible pour ce module.")
         return redirect("training_lesson", lesson_id=lesson_id)
+    enrollment = TrainingEnrollment.objects.filter(
+        program_id=lesson.week.program_id, user=request.user
+    ).first()
+    answer_key = quiz_answer_key(quiz)
 
     with transaction.atomic():
         attempt = TrainingQuizAttempt.objects.create(
@@ -849,39 +916,37 @@ def training_submit_quiz(request, lesson_id):
         )
         total_points = 0
         earned_points = 0
+        answers = []
 
-        for question in quiz.questions.filter(is_active=True):
+        for question in answer_key.questions:
             field_name = f"question_{question.id}"
             raw_value = request.POST.get(field_name, "").strip()
-            selected_choice = None
+            selected_choice_id = None
             answer_text = ""
             is_correct = None
             points_awarded = 0
 
-            if question.question_type == TrainingQuestion.QuestionType.OPEN:
+            if question.kind == answer_keys.OPEN:
                 answer_text = raw_value
             else:
                 total_points += question.points
-                if raw_value:
-                    selected_choice = question.choices.filter(id=raw_value).first()
-                    if selected_choice:
-                        is_correct = selected_choice.is_correct
-                        if is_correct:
-                            points_awarded = question.points
-                    else:
-                        is_correct = False
-                else:
-                    is_correct = False
+                selected_choice_id = question.choice_id(raw_value)
+                is_correct = question.is_correct_choice(selected_choice_id)
+                if is_correct:
+                    points_awarded = question.points
 
             earned_points += points_awarded
-            TrainingAnswer.objects.create(
-                attempt=attempt,
-                question=question,
-                selected_choice=selected_choice,
-                answer_text=answer_text,
-                is_correct=is_correct,
-                points_awarded=points_awarded,
+            answers.append(
+                TrainingAnswer(
+                    attempt=attempt,
+                    question_id=question.id,
+                    selected_choice_id=selected_choice_id,
+                    answer_text=answer_text,
+                    is_correct=is_correct,
+                    points_awarded=points_awarded,
+                )
             )
+        TrainingAnswer.objects.bulk_create(answers)
 
         score_percent = (
             round((earned_points / total_points) * 100) if total_points else 0
@@ -904,7 +969,7 @@ def training_submit_quiz(request, lesson_id):
                 progress.quiz_best_score = score_percent
             if passed:
                 progress.quiz_passed = True
-            progress.save(update_fields=["quiz_best_score", "quiz_passed"])
+            progress.save(update_fields=["quiz_best_score", "quiz_passed", "updated_at"])
 
     messages.success(request, f"Quiz soumis. Score: {score_percent}%.")
     return redirect("training_lesson", lesson_id=lesson_id)
@@ -985,7 +1050,7 @@ def training_complete_lesson(request, lesson_id):
     )
     progress.completed = True
     progress.completed_at = timezone.now()
-    progress.save(update_fields=["completed", "completed_at"])
+    progress.save(update_fields=["completed", "completed_at", "updated_at"])
     enrollment.refresh_status()
     messages.success(request, "Module validé.")
     return redirect("training_program", program_id=lesson.week.program_id)
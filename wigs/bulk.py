@@ -0,0 +1,17 @@
+from django.db import transaction
+
+from reporting.cache import bump_domain_version
+from wigs.models import CareWig, allocate_codes
+
+
+def bulk_create_with_codes(model, prefix: str, rows: list[dict]) -> list:
+    """Crée un lot d'objets avec des codes réservés en une seule écriture."""
+    with transaction.atomic():
+        # Réservés dans la même transaction : un échec ne laisse pas de trou.
+        codes = allocate_codes(prefix, len(rows))
+        objects = [model(code=code, **row) for code, row in zip(codes, rows)]
+        model.objects.bulk_create(objects, batch_size=500)
+    if model is CareWig:
+        # bulk_create ne déclenche pas les signaux du cache des dashboards.
+        bump_domain_version("care_wigs")
+    return objects
@@ -0,0 +1,57 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wigs.bulk import bulk_create_with_codes
+from wigs.models import WigProduct
+from wigs.serializers import WigProductSerializer
+
+
+class Command(BaseCommand):
+    help = "Importe une liste fournisseur de perruques (colonnes : name, price, notes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Chemin du fichier CSV.")
+        parser.add_argument(
+            "--delimiter",
+            dest="delimiter",
+            default=",",
+            help="Séparateur de colonnes (virgule par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as handle:
+                rows = list(csv.DictReader(handle, delimiter=options["delimiter"]))
+        except OSError as exc:
+            raise CommandError(f"Lecture impossible : {exc}") from exc
+
+        rows = [
+            {
+                key: value
+                for key, value in row.items()
+                if key and value not in ("", None)
+            }
+            for row in rows
+        ]
+        serializer = WigProductSerializer(data=rows, many=True)
+        if not serializer.is_valid():
+            messages = [
+                f"Ligne {index + 1} : {errors}"
+                for index, errors in enumerate(serializer.errors)
+                if errors
+            ]
+            raise CommandError("\n".join(messages))
+
+        products = bulk_create_with_codes(
+            WigProduct, "WIG", list(serializer.validated_data)
+        )
+        if products:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Perruques importées : {len(products)} "
+                    f"({products[0].code} à {products[-1].code})"
+                )
+            )
+        else:
+            self.stdout.write("Aucune perruque à importer.")
@@ -1,5 +1,9 @@
+import threading
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import F
 from django.utils import timezone
 
 
@@ -93,15 +97,83 @@ class CareWig(models.Model):
         super().save(*args, **kwargs)
 
 
-def generate_wig_code(prefix: str) -> str:
-    if prefix not in {"WIG", "CARE"}:
-        raise ValidationError("Préfixe de code invalide.")
-    period = timezone.now().strftime("%y%m")
-    sequence_key = f"{prefix}-{period}"
+CODE_PREFIXES = {"WIG", "CARE"}
+
+
+def _reserve_sequence(key: str, count: int) -> int:
+    """Avance la séquence de ``count`` et retourne la première valeur réservée.
+
+    Un seul ``UPDATE`` relatif remplace le verrou lu-puis-écrit : le compteur
+    persisté reste la borne haute des valeurs distribuées.
+    """
     with transaction.atomic():
-        sequence, _ = Sequence.objects.select_for_update().get_or_create(
-            key=sequence_key, defaults={"value": 0}
+        updated = Sequence.objects.filter(key=key).update(
+            value=F("value") + count, updated_at=timezone.now()
         )
-        sequence.value += 1
-        sequence.save(update_fields=["value", "updated_at"])
-        return f"{prefix}-{period}-{sequence.value:04d}"
+        if not updated:
+            try:
+                with transaction.atomic():
+                    Sequence.objects.create(key=key, value=count)
+                return 1
+            except IntegrityError:
+                Sequence.objects.filter(key=key).update(
+                    value=F("value") + count, updated_at=timezone.now()
+                )
+        high_water = Sequence.objects.filter(key=key).values_list("value", flat=True)
+        return high_water.get() - count + 1
+
+
+class CodeAllocator:
+    """Distribue les codes depuis des blocs réservés en mémoire par processus.
+
+    Avec ``WIG_CODE_BLOCK_SIZE`` à 1 (défaut) chaque code est réservé à la
+    demande et la numérotation reste continue ; une taille supérieure réduit
+    les écritures au prix de trous si un processus s'arrête avec un bloc
+    entamé. Dans une transaction en cours, aucun bloc n'est mis en cache car
+    un retour arrière annulerait la réservation.
+    """
+
+    def __init__(self):
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    def next_value(self, key: str) -> int:
+        block_size = max(settings.WIG_CODE_BLOCK_SIZE, 1)
+        if block_size == 1 or connection.in_atomic_block:
+            return _reserve_sequence(key, 1)
+        with self._lock:
+            next_value, end = self._blocks.get(key, (1, 0))
+            if next_value > end:
+                next_value = _reserve_sequence(key, block_size)
+                end = next_value + block_size - 1
+            self._blocks[key] = (next_value + 1, end)
+            return next_value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+
+
+code_allocator = CodeAllocator()
+
+
+def _sequence_key(prefix: str) -> tuple[str, str]:
+    if prefix not in CODE_PREFIXES:
+        raise ValidationError("Préfixe de code invalide.")
+    period = timezone.now().strftime("%y%m")
+    return f"{prefix}-{period}", period
+
+
+def generate_wig_code(prefix: str) -> str:
+    sequence_key, period = _sequence_key(prefix)
+    value = code_allocator.next_value(sequence_key)
+    return f"{prefix}-{period}-{value:04d}"
+
+
+def allocate_codes(prefix: str, count: int) -> list[str]:
+    """Réserve ``count`` codes consécutifs en une seule écriture."""
+    if count <= 0:
+        return []
+    sequence_key, period = _sequence_key(prefix)
+    first = _reserve_sequence(sequence_key, count)
+    return [f"{prefix}-{period}-{value:04d}" for value in range(first, first + count)]
@@ -1,7 +1,21 @@
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
 from django.db import transaction
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
 
-from wigs.models import CareWig, Sequence, WigProduct
+from accounts.models import User
+from wigs.models import (
+    CareWig,
+    CodeAllocator,
+    Sequence,
+    WigProduct,
+    allocate_codes,
+    code_allocator,
+    generate_wig_code,
+)
 
 
 class WigCodeTests(TestCase):
@@ -33,3 +47,69 @@ class WigCodeTests(TestCase):
         sequence = Sequence.objects.get(key=first.code.rsplit("-", 1)[0])
         self.assertEqual(sequence.value, 2)
         self.assertNotEqual(first.code, second.code)
+
+
+class CodeAllocationTests(TestCase):
+    def test_allocate_codes_reserves_a_contiguous_range(self):
+        WigProduct.objects.create(name="Perruque A")
+
+        with self.assertNumQueries(4):
+            codes = allocate_codes("WIG", 3)
+
+        self.assertEqual([code[-4:] for code in codes], ["0002", "0003", "0004"])
+        self.assertEqual(WigProduct.objects.create(name="B").code[-4:], "0005")
+
+    def test_bulk_endpoint_creates_care_wigs(self):
+        user = User.objects.create_user(username="accueil", password="Test12345!")
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.post(
+            "/api/wigs/care/bulk/",
+            {"items": [{"client": f"Cliente {idx}"} for idx in range(5)]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        codes = [row["code"] for row in response.data]
+        self.assertEqual(len(set(codes)), 5)
+        self.assertEqual(CareWig.objects.count(), 5)
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write("name,price\nLisse 18 pouces,85000\nBouclée,92000\n")
+
+        call_command("import_wig_products", handle.name, stdout=StringIO())
+
+        self.assertEqual(WigProduct.objects.count(), 2)
+
+
+@override_settings(WIG_CODE_BLOCK_SIZE=10)
+class CodeBlockTests(TransactionTestCase):
+    def setUp(self):
+        code_allocator.reset()
+
+    def tearDown(self):
+        code_allocator.reset()
+
+    def test_block_is_reserved_once_per_process(self):
+        codes = [generate_wig_code("CARE") for _ in range(3)]
+
+        self.assertEqual([code[-4:] for code in codes], ["0001", "0002", "0003"])
+        sequence = Sequence.objects.get(key=codes[0].rsplit("-", 1)[0])
+        self.assertEqual(sequence.value, 10)
+
+    @override_settings(WIG_CODE_BLOCK_SIZE=3)
+    def test_two_allocators_hand_out_disjoint_increasing_codes(self):
+        first, second = CodeAllocator(), CodeAllocator()
+        values = {first: [], second: []}
+        for _ in range(5):
+            for allocator in (first, second):
+                values[allocator].append(allocator.next_value("CARE-TEST"))
+
+        for drawn in values.values():
+            self.assertEqual(drawn, sorted(set(drawn)))
+        self.assertEqual(len(set(values[first]) | set(values[second])), 10)
+        self.assertEqual(values[first], [1, 2, 3, 7, 8])
+        self.assertEqual(values[second], [4, 5, 6, 10, 11])
+        self.assertEqual(Sequence.objects.get(key="CARE-TEST").value, 12)
@@ -16,3 +16,33 @@ class CareWigLabelTests(APITestCase):
         care_wig.refresh_from_db()
         self.assertIsNotNone(care_wig.label_printed_at)
         self.assertLessEqual(care_wig.label_printed_at, timezone.now())
+
+    def test_batch_labels_on_a4_sheets(self):
+        care_wigs = [
+            CareWig.objects.create(client=f"Cliente {idx}") for idx in range(12)
+        ]
+        CareWig.objects.filter(pk=care_wigs[0].pk).update(
+            label_printed_at=timezone.now()
+        )
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/wigs/care-wigs/labels.pdf?unprinted=1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response.content.count(b"/Type /Page\n"), 2)
+        self.assertFalse(CareWig.objects.filter(label_printed_at__isnull=True).exists())
+
+    def test_batch_labels_by_ids(self):
+        first = CareWig.objects.create(client="Awa Koné")
+        CareWig.objects.create(client="Autre")
+
+        response = self.client.get(f"/wigs/care-wigs/labels.pdf?ids={first.pk}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            CareWig.objects.filter(label_printed_at__isnull=False).count(), 1
+        )
+        self.assertEqual(
+            self.client.get("/wigs/care-wigs/labels.pdf?ids=abc").status_code, 404
+        )
@@ -1,18 +1,21 @@
 from datetime import date
 from io import BytesIO
 
-import qrcode
 from django.conf import settings
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
-from rest_framework import viewsets
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.response import Response
 
+from floxy.pdf import draw_qr_code, load_image
+from wigs.bulk import bulk_create_with_codes
 from wigs.models import CareWig, WigProduct
 from wigs.serializers import CareWigSerializer, WigProductSerializer
 
@@ -56,23 +59,25 @@ def apply_filters(queryset, params, search_fields):
     return queryset
 
 
+LABEL_WIDTH = 80 * mm
+LABEL_HEIGHT = 50 * mm
+MAX_LABELS_PER_BATCH = 200
+
+
 def draw_logo(pdf, x: float, y: float, size: float) -> None:
     logo_path = getattr(settings, "FLOXY_LOGO_PATH", "")
-    if logo_path:
-        try:
-            logo_reader = ImageReader(logo_path)
-            pdf.drawImage(
-                logo_reader,
-                x,
-                y,
-                width=size,
-                height=size,
-                preserveAspectRatio=True,
-                mask="auto",
-            )
-            return
-        except Exception:
-            pass
+    logo_reader = load_image(logo_path) if logo_path else None
+    if logo_reader is not None:
+        pdf.drawImage(
+            logo_reader,
+            x,
+            y,
+            width=size,
+            height=size,
+            preserveAspectRatio=True,
+            mask="auto",
+        )
+        return
 
     pdf.setLineWidth(1)
     pdf.circle(x + size / 2, y + size / 2, size / 2, stroke=1, fill=0)
@@ -88,9 +93,8 @@ def get_client_initials(client: str) -> str:
     return initials
 
 
-def care_wig_label(request, pk: int):
-    care_wig = get_object_or_404(CareWig, pk=pk)
-    printed_at = timezone.localtime(timezone.now())
+def draw_care_label(pdf, care_wig: CareWig, x: float, y: float, printed_at) -> None:
+    """Dessine une étiquette 80×50 mm dont le coin inférieur gauche est (x, y)."""
     promised = (
         care_wig.promised_date.strftime("%d/%m/%Y")
         if care_wig.promised_date
@@ -98,77 +102,162 @@ def care_wig_label(request, pk: int):
     )
     initials = get_client_initials(care_wig.client)
 
-    buffer = BytesIO()
-    label_width = 80 * mm
-    label_height = 50 * mm
-    pdf = canvas.Canvas(buffer, pagesize=(label_width, label_height))
-
     margin = 3 * mm
     logo_size = 10 * mm
-    logo_y = label_height - margin - logo_size
-    draw_logo(pdf, margin, logo_y, logo_size)
+    logo_y = y + LABEL_HEIGHT - margin - logo_size
+    draw_logo(pdf, x + margin, logo_y, logo_size)
 
     pdf.setFont("Helvetica-Bold", 9)
     pdf.drawString(
-        margin + logo_size + 2 * mm,
-        label_height - margin - 2 * mm,
+        x + margin + logo_size + 2 * mm,
+        y + LABEL_HEIGHT - margin - 2 * mm,
         "Étiquette entretien",
     )
 
     pdf.setFont("Helvetica", 8)
     current_y = logo_y - 4 * mm
-    pdf.drawString(margin, current_y, f"Code : {care_wig.code}")
+    pdf.drawString(x + margin, current_y, f"Code : {care_wig.code}")
     current_y -= 4 * mm
-    pdf.drawString(margin, current_y, f"Initiales cliente : {initials}")
+    pdf.drawString(x + margin, current_y, f"Initiales cliente : {initials}")
     current_y -= 4 * mm
-    pdf.drawString(margin, current_y, f"Date promise : {promised}")
+    pdf.drawString(x + margin, current_y, f"Date promise : {promised}")
     current_y -= 4 * mm
     pdf.drawString(
-        margin, current_y, f"Imprimée le : {printed_at.strftime('%d/%m/%Y %H:%M')}"
+        x + margin,
+        current_y,
+        f"Imprimée le : {printed_at.strftime('%d/%m/%Y %H:%M')}",
     )
 
-    qr_data = f"{care_wig.code}|/wigs/care-wigs/{care_wig.pk}/"
-    qr = qrcode.QRCode(box_size=2, border=1)
-    qr.add_data(qr_data)
-    qr.make(fit=True)
-    qr_image = qr.make_image(fill_color="black", back_color="white")
-    qr_buffer = BytesIO()
-    qr_image.save(qr_buffer, format="PNG")
-    qr_buffer.seek(0)
-    qr_reader = ImageReader(qr_buffer)
     qr_size = 18 * mm
-    pdf.drawImage(
-        qr_reader,
-        label_width - margin - qr_size,
-        margin,
-        width=qr_size,
-        height=qr_size,
+    draw_qr_code(
+        pdf,
+        f"{care_wig.code}|/wigs/care-wigs/{care_wig.pk}/",
+        x + LABEL_WIDTH - margin - qr_size,
+        y + margin,
+        qr_size,
     )
 
+
+def render_label_sheets(care_wigs, printed_at) -> bytes:
+    """Dispose les étiquettes en grille sur des pages A4."""
+    page_width, page_height = A4
+    columns = int(page_width // LABEL_WIDTH)
+    rows = int(page_height // LABEL_HEIGHT)
+    gap_x = (page_width - columns * LABEL_WIDTH) / (columns + 1)
+    gap_y = (page_height - rows * LABEL_HEIGHT) / (rows + 1)
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    per_page = columns * rows
+    for index, care_wig in enumerate(care_wigs):
+        if index and index % per_page == 0:
+            pdf.showPage()
+        slot = index % per_page
+        column, row = slot % columns, slot // columns
+        x = gap_x + column * (LABEL_WIDTH + gap_x)
+        y = page_height - (row + 1) * (LABEL_HEIGHT + gap_y)
+        pdf.setStrokeGray(0.8)
+        pdf.setLineWidth(0.3)
+        pdf.rect(x, y, LABEL_WIDTH, LABEL_HEIGHT, stroke=1, fill=0)
+        pdf.setStrokeGray(0)
+        draw_care_label(pdf, care_wig, x, y, printed_at)
     pdf.showPage()
     pdf.save()
+    return buffer.getvalue()
+
+
+def care_wig_label(request, pk: int):
+    care_wig = get_object_or_404(CareWig, pk=pk)
+    printed_at = timezone.localtime(timezone.now())
 
-    care_wig.label_printed_at = printed_at
-    care_wig.save(update_fields=["label_printed_at"])
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(LABEL_WIDTH, LABEL_HEIGHT))
+    draw_care_label(pdf, care_wig, 0, 0, printed_at)
+    pdf.showPage()
+    pdf.save()
+
+    CareWig.objects.filter(pk=care_wig.pk).update(label_printed_at=printed_at)
 
-    buffer.seek(0)
     response = HttpResponse(buffer.getvalue(), content_type="application/pdf")
     response["Content-Disposition"] = f"inline; filename=etiquette-{care_wig.code}.pdf"
     return response
 
 
-class WigProductViewSet(viewsets.ModelViewSet):
+def care_wig_labels(request):
+    """Planche A4 d'étiquettes : ``ids=1,2,3`` ou les entrées du jour (``date``)."""
+    ids = request.GET.get("ids")
+    care_wigs = CareWig.objects.order_by("created_at", "pk")
+    if ids:
+        try:
+            wanted = [int(value) for value in ids.split(",") if value.strip()]
+        except ValueError as exc:
+            raise Http404("Identifiants invalides.") from exc
+        care_wigs = care_wigs.filter(pk__in=wanted)
+    else:
+        value = request.GET.get("date")
+        try:
+            day = date.fromisoformat(value) if value else timezone.localdate()
+        except ValueError as exc:
+            raise Http404("Date invalide.") from exc
+        care_wigs = care_wigs.filter(created_at__date=day)
+    if request.GET.get("unprinted"):
+        care_wigs = care_wigs.filter(label_printed_at__isnull=True)
+
+    care_wigs = list(
+        care_wigs.only("pk", "code", "client", "promised_date")[:MAX_LABELS_PER_BATCH]
+    )
+    if not care_wigs:
+        raise Http404("Aucune étiquette à imprimer.")
+
+    printed_at = timezone.localtime(timezone.now())
+    content = render_label_sheets(care_wigs, printed_at)
+    CareWig.objects.filter(pk__in=[care_wig.pk for care_wig in care_wigs]).update(
+        label_printed_at=printed_at
+    )
+
+    response = HttpResponse(content, content_type="application/pdf")
+    response["Content-Disposition"] = (
+        f"inline; filename=etiquettes-{printed_at:%Y%m%d-%H%M}.pdf"
+    )
+    return response
+
+
+class BulkCreateMixin:
+    code_prefix = ""
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        items = request.data.get("items") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            raise DRFValidationError({"items": "Une liste non vide est attendue."})
+        serializer = self.get_serializer(data=items, many=True)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except serializers.ValidationError as exc:
+            raise DRFValidationError({"items": exc.detail}) from exc
+        objects = bulk_create_with_codes(
+            self.get_queryset().model, self.code_prefix, serializer.validated_data
+        )
+        return Response(
+            self.get_serializer(objects, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class WigProductViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     queryset = WigProduct.objects.all()
     serializer_class = WigProductSerializer
+    code_prefix = "WIG"
 
     def get_queryset(self):
         queryset = super().get_queryset()
         return apply_filters(queryset, self.request.query_params, ["name", "code"])
 
 
-class CareWigViewSet(viewsets.ModelViewSet):
+class CareWigViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     queryset = CareWig.objects.all()
     serializer_class = CareWigSerializer
+    code_prefix = "CARE"
 
     def get_queryset(self):
         queryset = super().get_queryset()